@@ -1,23 +1,37 @@
+import time
+_T0 = time.perf_counter()
+
 import sys
 import os
+import importlib
+import multiprocessing
 import subprocess
 import tkinter as tk
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 
-from pages.home_page        import HomePage
-from pages.storage_page     import StoragePage
-from pages.network_page     import NetworkPage
-from pages.system_info_page import SystemInfoPage
-from pages.help_page        import HelpPage
+from pages.home_page import HomePage
+from toolkit.timing  import Timeline
+
+# Tool pages are imported and built the first time they are shown, so
+# their dependencies (matplotlib, wmi, psutil) stay off the startup path.
+PAGES = {
+    "Storage":     ("pages.storage_page",     "StoragePage"),
+    "Network":     ("pages.network_page",     "NetworkPage"),
+    "System Info": ("pages.system_info_page", "SystemInfoPage"),
+    "Help":        ("pages.help_page",        "HelpPage"),
+}
 
 class PowerToolkitApp(tb.Window):
-    def __init__(self):
+    def __init__(self, timeline=None, timing=False):
+        self.timeline = timeline or Timeline(_T0)
+        self.timing = timing
         super().__init__(
             title="Windows Power Toolkit",
             themename="flatly",
             minsize=(1000, 700)
         )
+        self.timeline.mark("window created")
         self._build_ui()
 
     def _build_ui(self):
@@ -31,20 +45,13 @@ class PowerToolkitApp(tb.Window):
         content = tb.Frame(container)
         content.pack(side=RIGHT, fill=BOTH, expand=YES)
 
-        # instantiate pages
+        # only Home is built up front; see PAGES
+        self.content = content
+        self.current = None
         self.pages = {}
         home = HomePage(content, help_callback=lambda: self.show_page("Help"))
         home.place(relx=0, rely=0, relwidth=1, relheight=1)
         self.pages["Home"] = home
-        for PageClass, name in [
-            (StoragePage,    "Storage"),
-            (NetworkPage,    "Network"),
-            (SystemInfoPage, "System Info"),
-            (HelpPage,       "Help"),
-        ]:
-            p = PageClass(content)
-            p.place(relx=0, rely=0, relwidth=1, relheight=1)
-            self.pages[name] = p
 
         # Introduction box
         intro_frame = tk.Frame(sidebar, bd=1, relief="solid")
@@ -121,11 +128,41 @@ class PowerToolkitApp(tb.Window):
         # show Home on launch
         self.show_page("Home")
 
+    def _page(self, name):
+        page = self.pages.get(name)
+        if page is None:
+            module, cls = PAGES[name]
+            start = time.perf_counter()
+            self.config(cursor="watch")
+            self.update_idletasks()
+            try:
+                page = getattr(importlib.import_module(module), cls)(self.content)
+            finally:
+                self.config(cursor="")
+            page.place(relx=0, rely=0, relwidth=1, relheight=1)
+            self.pages[name] = page
+            if self.timing:
+                print(f"{name} page built in {(time.perf_counter() - start) * 1000:.1f} ms",
+                      file=sys.stderr)
+        return page
+
     def show_page(self, name):
-        for p in self.pages.values():
-            p.lower()
-        self.pages[name].lift()
+        page = self._page(name)
+        if self.current is not None and self.current is not page:
+            self.current.lower()
+        page.lift()
+        self.current = page
+
+    def _first_idle(self):
+        self.timeline.mark("first idle")
+        if self.timing:
+            print(self.timeline.report(), file=sys.stderr)
 
 if __name__ == "__main__":
-    app = PowerToolkitApp()
+    multiprocessing.freeze_support()  # process-pool workers in the frozen EXE
+    timeline = Timeline(_T0)
+    timeline.mark("imports")
+    app = PowerToolkitApp(timeline, timing="--timing" in sys.argv)
+    timeline.mark("home page shown")
+    app.after_idle(app._first_idle)
     app.mainloop()
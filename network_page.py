@@ -3,102 +3,61 @@
 Comprehensive network utilities GUI:
   • Network Info  – Interface details
   • My Host       – Local hostname/IP
-  • Ping          – ICMP echo requests
-  • Port Scan     – TCP port range scan
-  • Subnet Scan   – Live host scanning in subnet
-  • Reverse DNS   – PTR record lookup
+  • Ping          – ICMP/TCP ping of many targets with RTT statistics and a live plot
+  • Port Scan     – Concurrent TCP scan of many hosts, with a host×port matrix
+  • Subnet Scan   – Parallel ICMP/TCP sweep for live hosts
+  • Reverse DNS   – PTR lookups in bulk, e.g. for a sweep's live hosts
   • Public IP     – External IP fetch
-  • Domain → IP   – DNS resolution
+  • Domain → IP   – All IPv4/IPv6 addresses of many names at once
   • Flood Test    – Stress test via UDP/TCP
   • Traceroute    – Hop-by-hop path
 
 Each tab includes a step-by-step mini tutorial, labeled inputs,
 determinate progress where appropriate, countdowns, and input validation.
 """
-import subprocess
-import socket
-import ipaddress
-import time
-import threading
 import tkinter as tk
-import requests
-import psutil
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 from tkinter import messagebox
 
-# --- Helpers ---
-def ping(host, count=4, timeout_ms=1000):
-    try:
-        return subprocess.check_output(
-            f"ping -n {count} -w {timeout_ms} {host}", shell=True, text=True
-        )
-    except Exception as e:
-        return f"Ping error: {e}"
-
-def port_scan(host, start, end, timeout=0.2):
-    open_ports = []
-    for port in range(start, end+1):
-        with socket.socket() as s:
-            s.settimeout(timeout)
-            if s.connect_ex((host, port)) == 0:
-                open_ports.append(str(port))
-    return "\n".join(open_ports) or "No open ports."
-
-def reverse_dns(ip):
-    try:
-        return socket.gethostbyaddr(ip)[0]
-    except Exception as e:
-        return f"Reverse DNS error: {e}"
+from pages.results_view import ResultsView
+from pages.task_window import TaskWindow, run_in_background
+from toolkit import icmp, latency, net, portscan, sweep, sysinfo
+from toolkit.histogram import PERCENTILES
+from toolkit.resolver import default_resolver
+from toolkit.tasks import TaskExecutor
+
+# matplotlib is imported when the first ping plot is drawn
+
 
+def _figure(master, **kw):
+    """Tk canvas holding a new matplotlib Figure (no pyplot state)."""
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    from matplotlib.figure import Figure
+    return FigureCanvasTkAgg(Figure(**kw), master=master)
+
+# --- Helpers ---
 def get_public_ip():
     try:
-        return requests.get("https://api.ipify.org", timeout=4).text
-    except:
+        return net.public_ip()
+    except OSError:
         return "Error retrieving public IP."
 
-def domain_to_ip(domain):
-    domain = domain.replace("http://","")
-    domain = domain.replace("https://","")
-    domain = domain.rstrip("/")
-    try:
-        return socket.gethostbyname(domain)
-    except Exception as e:
-        return f"Domain lookup error: {e}"
-
 def flood_test(host, port, protocol, size, duration, progress_callback=None):
-    end = time.time() + duration
-    count = 0
     try:
-        while time.time() < end:
-            if protocol == "TCP":
-                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                    s.connect((host, port))
-                    s.send(b"A" * size)
-            else:
-                with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
-                    s.sendto(b"A" * size, (host, port))
-            count += 1
-            if progress_callback:
-                progress_callback(count)
+        count = net.flood(host, port, protocol, size, duration, progress_callback)
         return f"Sent {count} packets to {host}:{port} via {protocol}"
-    except Exception as e:
+    except (OSError, ValueError) as e:
         return f"Flood error: {e}"
 
 def get_host_info():
-    name = socket.gethostname()
-    try:
-        ip = socket.gethostbyname(name)
-    except:
-        ip = "Unavailable"
-    return f"Hostname: {name}\nLocal IP: {ip}"
+    info = net.host_info()
+    return f"Hostname: {info['hostname']}\nLocal IP: {info['ip']}"
 
 def traceroute(host):
     try:
-        return subprocess.check_output(
-            f"tracert {host}", shell=True, text=True
-        )
-    except Exception as e:
+        return net.traceroute(host)
+    except (OSError, ValueError) as e:
         return f"Traceroute error: {e}"
 
 
@@ -128,26 +87,26 @@ class NetworkPage(tb.Frame):
             justify=LEFT,
             anchor='w'
         ).pack(fill=X, padx=15, pady=5)
-        # build interface rows and keep references
+        # interface rows are added by _show_network as interfaces appear;
+        # the counters are read on a worker of their own, so the tool tabs
+        # below never delay them
+        self.net_tab = net_tab
         self.network_rows = {}
-        for iface in psutil.net_if_addrs():
-            grp = tb.Labelframe(net_tab, text=iface, bootstyle="secondary")
-            grp.pack(fill=X, padx=10, pady=5)
-            addr_lbl = self._add_row(grp, "Addresses")
-            stat_lbl = self._add_row(grp, "Stats (speed/mtu)")
-            io_lbl = self._add_row(grp, "I/O (KB sent/recv)")
-            self.network_rows[iface] = (addr_lbl, stat_lbl, io_lbl)
-        self.after(1000, self._update_network)
+        self.monitor = TaskExecutor(max_workers=1)
+        self._update_network()
+        # the tool tabs wait on the network, not the disk, so they get a pool
+        # of their own: a continuous ping must not hold a disk-scan slot
+        self.tasks = TaskExecutor(max_workers=8)
 
         # Tool tabs
         tabs = [
             ("My Host", self._host_tab, get_host_info, 1),
-            ("Ping", self._ping_tab, ping, 3),
-            ("Port Scan", self._port_tab, port_scan, 5),
-            ("Subnet Scan", self._subnet_tab, None, 60),
-            ("Reverse DNS", self._rev_tab, reverse_dns, 1),
+            ("Ping", self._ping_tab, None, 0),
+            ("Port Scan", self._port_tab, None, 0),
+            ("Subnet Scan", self._subnet_tab, None, 0),
+            ("Reverse DNS", self._rev_tab, None, 0),
             ("Public IP", self._pub_tab, get_public_ip, 1),
-            ("Domain→IP", self._dom_tab, domain_to_ip, 1),
+            ("Domain→IP", self._dom_tab, None, 0),
             ("Flood Test", self._flood_tab, flood_test, 5),
             ("Traceroute", self._tracert_tab, traceroute, 10),
         ]
@@ -165,16 +124,26 @@ class NetworkPage(tb.Frame):
         return lbl
 
     def _update_network(self):
-        stats = psutil.net_if_stats()
-        addrs = psutil.net_if_addrs()
-        io = psutil.net_io_counters(pernic=True)
-        for iface, (addr_lbl, stat_lbl, io_lbl) in self.network_rows.items():
-            ips = [f"{a.address}/{a.netmask}" for a in addrs.get(iface, []) if a.family==socket.AF_INET]
-            addr_lbl.config(text=', '.join(ips) or 'N/A')
-            st = stats.get(iface)
-            stat_lbl.config(text=f"{st.speed}Mb/{st.mtu}" if st else 'N/A')
-            cnt = io.get(iface)
-            io_lbl.config(text=f"{cnt.bytes_sent//1024}/{cnt.bytes_recv//1024}" if cnt else '0/0')
+        run_in_background(self, self._interfaces_worker, on_done=self._show_network,
+                          on_error=lambda _e: self.after(1000, self._update_network),
+                          executor=self.monitor)
+
+    def _interfaces_worker(self, task):
+        return sysinfo.interfaces()
+
+    def _show_network(self, nics):
+        for nic in nics:
+            if nic.name not in self.network_rows:
+                grp = tb.Labelframe(self.net_tab, text=nic.name, bootstyle="secondary")
+                grp.pack(fill=X, padx=10, pady=5)
+                addr_lbl = self._add_row(grp, "Addresses")
+                stat_lbl = self._add_row(grp, "Stats (speed/mtu)")
+                io_lbl = self._add_row(grp, "I/O (KB sent/recv)")
+                self.network_rows[nic.name] = (addr_lbl, stat_lbl, io_lbl)
+            addr_lbl, stat_lbl, io_lbl = self.network_rows[nic.name]
+            addr_lbl.config(text=', '.join(nic.addresses) or 'N/A')
+            stat_lbl.config(text=f"{nic.speed_mb}Mb/{nic.mtu}" if nic.speed_mb is not None else 'N/A')
+            io_lbl.config(text=f"{nic.bytes_sent//1024}/{nic.bytes_recv//1024}")
         self.after(1000, self._update_network)
 
     def _with_loader(self, action, widget, est):
@@ -189,11 +158,13 @@ class NetworkPage(tb.Frame):
             lbl.config(text=f"Time left: {t}s")
             dlg.after(1000, lambda: tick(t-1))
         tick(est)
-        def run():
-            res = action()
+        def show(res):
             dlg.destroy()
             widget.config(state="normal"); widget.delete("1.0","end"); widget.insert("1.0", res); widget.config(state="disabled")
-        threading.Thread(target=run, daemon=True).start()
+        # action runs on a network worker, never a disk-scan slot; only show()
+        # touches the widgets
+        run_in_background(self, lambda task: action(), on_done=show,
+                          on_error=lambda e: show(f"Error: {e}"), executor=self.tasks)
 
     def _host_tab(self, tab, func, est):
         tut = tb.Labelframe(tab, text="How to Use", bootstyle=INFO)
@@ -207,65 +178,328 @@ class NetworkPage(tb.Frame):
     def _ping_tab(self, tab, func, est):
         tut = tb.Labelframe(tab, text="How to Use", bootstyle=INFO)
         tut.pack(fill=X, padx=10, pady=5)
-        tk.Label(tut, text="1) Enter host\n2) Click 'Ping'\n3) See results below", justify=LEFT, anchor='w').pack(fill=X, padx=15)
+        tk.Label(tut, text="1) Enter one or more targets (e.g. gw1, 10.0.0.1); host:port pings with a TCP connect\n"
+                           "2) Set the count, or tick 'Continuous' to monitor until you click Cancel\n"
+                           "3) Statistics update every round; the plot shows the latest samples (gaps = lost)",
+                 justify=LEFT, anchor='w').pack(fill=X, padx=15)
         frm = tb.Frame(tab); frm.pack(anchor=W, padx=10, pady=5)
-        tb.Label(frm, text="Host:").pack(side=LEFT)
-        ent = tb.Entry(frm, width=30); ent.pack(side=LEFT, padx=(5,0))
+        tb.Label(frm, text="Targets:").pack(side=LEFT)
+        ent = tb.Entry(frm, width=36); ent.pack(side=LEFT, padx=(5,10))
+        tb.Label(frm, text="Count:").pack(side=LEFT)
+        self.ping_count = tk.IntVar(value=4)
+        tb.Spinbox(frm, from_=1, to=100000, textvariable=self.ping_count, width=6).pack(side=LEFT, padx=(5,10))
+        tb.Label(frm, text="Interval (s):").pack(side=LEFT)
+        self.ping_interval = tk.DoubleVar(value=latency.DEFAULT_INTERVAL)
+        tb.Entry(frm, textvariable=self.ping_interval, width=5).pack(side=LEFT, padx=(5,10))
+        tb.Label(frm, text="Timeout (s):").pack(side=LEFT)
+        self.ping_timeout = tk.DoubleVar(value=latency.DEFAULT_TIMEOUT)
+        tb.Entry(frm, textvariable=self.ping_timeout, width=5).pack(side=LEFT, padx=(5,10))
+        self.ping_continuous = tk.BooleanVar(value=False)
+        tb.Checkbutton(frm, text="Continuous", variable=self.ping_continuous).pack(side=LEFT, padx=5)
         tb.Button(frm, text="Ping", bootstyle=PRIMARY,
-                  command=lambda: self._with_loader(lambda: func(ent.get()), self.out_ping, est)
+                  command=lambda: self._start_ping(ent.get())
                  ).pack(side=LEFT, padx=5)
-        self.out_ping = tb.Text(tab, height=10, state='disabled'); self.out_ping.pack(fill=BOTH, expand=YES, padx=10, pady=5)
+        cols = ("target", "sent", "loss %", "last", "min", "avg", "max", "stddev", "jitter") + \
+            tuple(f"p{p:g}" for p in PERCENTILES)
+        self.ping_tv = ResultsView(tab, cols, numeric=cols[1:])
+        self.ping_tv.pack(fill=BOTH, expand=YES, padx=10, pady=5)
+        self.ping_tab = tab
+        self.ping_canvas = None
+        self.ping_series = None  # latest plot data from the ping worker, drawn by _poll_ping_chart
+
+    def _start_ping(self, text):
+        specs = text.replace(",", " ").split()
+        try:
+            if not specs:
+                raise ValueError("no targets given")
+            for spec in specs:
+                latency.parse_target(spec)
+            count = 0 if self.ping_continuous.get() else self.ping_count.get()
+            interval, timeout = self.ping_interval.get(), self.ping_timeout.get()
+            if interval <= 0 or timeout <= 0:
+                raise ValueError("interval and timeout must be positive")
+        except (ValueError, tk.TclError) as e:
+            return messagebox.showerror("Ping", str(e))
+        task = TaskWindow("Ping", self, executor=self.tasks).start(
+            self._ping_worker, (specs, count, interval, timeout))
+        self._poll_ping_chart(task)
+
+    def _ping_worker(self, specs, count, interval, timeout, task):
+        targets, failed = latency.resolve_targets(specs)
+        if not targets:
+            raise OSError("; ".join(f"{spec}: {error}" for spec, error in failed))
+        stats = {t.name: latency.PingStats() for t in targets}
+        task.progress.begin(f"Pinging {len(targets)} targets …", total_items=count * len(targets), unit="probes")
+        rounds = latency.monitor(targets, interval, timeout, count)
+        try:
+            for samples in rounds:
+                for s in samples:
+                    stats[s.target].add(s)
+                self._show_ping(stats, {s.target: s.rtt_ms for s in samples})
+                task.progress.advance(len(samples))
+        finally:
+            rounds.close()
+        lost = sum(st.sent - st.received for st in stats.values())
+        note = f" · not resolved: {', '.join(spec for spec, _e in failed)}" if failed else ""
+        task.status(f"{sum(st.sent for st in stats.values())} probes to {len(targets)} targets, {lost} lost{note}")
+
+    def _show_ping(self, stats, last):
+        tv = self.ping_tv
+        tv.clear()
+        for name, st in stats.items():
+            vals = (st.sent, st.loss_pct, last[name], st.min, st.mean, st.max, st.stddev, st.jitter) + \
+                tuple(st.percentile(p) for p in PERCENTILES)
+            row = (name, st.sent, f"{st.loss_pct:.0f}") + tuple(
+                "lost" if v is None else f"{v:.2f}" if st.received else "" for v in vals[2:])
+            tv.append(row, tuple(-1.0 if v is None else v for v in vals))
+        self.ping_series = {name: list(st.recent) for name, st in stats.items()}
+
+    def _poll_ping_chart(self, task):
+        # the worker only publishes ping_series; the chart is drawn here, on the Tk thread
+        done = task.finished  # read first, so the last round is still drawn
+        series, self.ping_series = self.ping_series, None
+        if series is not None:
+            self._draw_ping_chart(series)
+        if not done:
+            self.after(200, lambda: self._poll_ping_chart(task))
+
+    def _draw_ping_chart(self, series):
+        if self.ping_canvas is None:
+            self.ping_canvas = _figure(self.ping_tab, figsize=(9, 2.6))
+            self.ping_ax = self.ping_canvas.figure.subplots()
+            self.ping_canvas.get_tk_widget().pack(fill=X, padx=10, pady=(0, 6))
+        ax = self.ping_ax
+        ax.clear()
+        now = max((pts[-1][0] for pts in series.values() if pts), default=0.0)
+        for name, pts in series.items():
+            # None (lost) becomes NaN, which matplotlib draws as a gap
+            ax.plot([t - now for t, _r in pts], [float("nan") if r is None else r for _t, r in pts],
+                    marker=".", markersize=3, linewidth=1, label=name)
+        ax.set_xlabel("seconds")
+        ax.set_ylabel("RTT (ms)")
+        if len(series) <= 12:
+            ax.legend(fontsize="x-small", loc="upper left")
+        self.ping_canvas.figure.tight_layout()
+        self.ping_canvas.draw_idle()
 
     def _port_tab(self, tab, func, est):
         tut = tb.Labelframe(tab, text="How to Use", bootstyle=INFO)
         tut.pack(fill=X, padx=10, pady=5)
-        tk.Label(tut, text="1) Enter host and port range (e.g. 20-80)\n2) Click 'Scan'\n3) Open ports listed below", justify=LEFT, anchor='w').pack(fill=X, padx=15)
+        tk.Label(tut, text="1) Enter hosts or subnets (e.g. srv1, srv2, 10.0.0.0/24) and ports\n"
+                           "   (e.g. 22,80,8000-8080, 1-65535 or groups: " + ", ".join(net.SERVICES) + ")\n"
+                           "2) Parallel = connects in flight, Per host = to one host, Rate = new connects/s per host\n"
+                           "3) Click 'Scan' – open ports appear as they are found; 'Matrix' shows hosts × open ports",
+                 justify=LEFT, anchor='w').pack(fill=X, padx=15)
         frm = tb.Frame(tab); frm.pack(anchor=W, padx=10, pady=5)
-        tb.Label(frm, text="Host:").pack(side=LEFT)
-        he = tb.Entry(frm, width=18); he.pack(side=LEFT, padx=(5,10))
+        tb.Label(frm, text="Hosts:").pack(side=LEFT)
+        he = tb.Entry(frm, width=28); he.pack(side=LEFT, padx=(5,10))
         tb.Label(frm, text="Ports:").pack(side=LEFT)
-        pe = tb.Entry(frm, width=12); pe.pack(side=LEFT, padx=(5,0))
+        pe = tb.Entry(frm, width=16); pe.pack(side=LEFT, padx=(5,10))
+        pe.insert(0, "1-1024")
+        frm2 = tb.Frame(tab); frm2.pack(anchor=W, padx=10, pady=(0,5))
+        tb.Label(frm2, text="Parallel:").pack(side=LEFT)
+        self.port_conc = tk.IntVar(value=portscan.DEFAULT_CONCURRENCY)
+        tb.Spinbox(frm2, from_=1, to=4096, textvariable=self.port_conc, width=5).pack(side=LEFT, padx=(5,10))
+        tb.Label(frm2, text="Per host:").pack(side=LEFT)
+        self.port_per_host = tk.IntVar(value=portscan.DEFAULT_PER_HOST)
+        tb.Spinbox(frm2, from_=1, to=4096, textvariable=self.port_per_host, width=5).pack(side=LEFT, padx=(5,10))
+        tb.Label(frm2, text="Rate:").pack(side=LEFT)
+        self.port_rate = tk.DoubleVar(value=0)
+        tb.Entry(frm2, textvariable=self.port_rate, width=6).pack(side=LEFT, padx=(5,10))
+        tb.Label(frm2, text="Timeout (s):").pack(side=LEFT)
+        self.port_timeout = tk.DoubleVar(value=portscan.DEFAULT_TIMEOUT)
+        tb.Entry(frm2, textvariable=self.port_timeout, width=5).pack(side=LEFT, padx=(5,10))
+        self.port_all = tk.BooleanVar(value=False)
+        tb.Checkbutton(frm2, text="Show closed", variable=self.port_all).pack(side=LEFT, padx=5)
         tb.Button(frm, text="Scan", bootstyle=PRIMARY,
-                  command=lambda: self._with_loader(
-                      lambda: func(he.get(), *(map(int, pe.get().split('-')))),
-                      self.out_port, est)
+                  command=lambda: self._start_port_scan(he.get(), pe.get())
                  ).pack(side=LEFT, padx=5)
-        self.out_port = tb.Text(tab, height=10, state='disabled'); self.out_port.pack(fill=BOTH, expand=YES, padx=10, pady=5)
+        tb.Button(frm, text="Matrix", bootstyle=SECONDARY, command=self._show_port_matrix).pack(side=LEFT, padx=5)
+        self.port_matrix = portscan.PortMatrix()
+        self.port_tv = ResultsView(tab, ("host", "port", "state", "rtt ms"), numeric=("port", "rtt ms"))
+        self.port_tv.pack(fill=BOTH, expand=YES, padx=10, pady=5)
+
+    def _start_port_scan(self, hosts, spec):
+        try:
+            hosts, ports = net.parse_hosts(hosts), net.parse_ports(spec)
+            limits = (self.port_conc.get(), self.port_per_host.get(), self.port_rate.get(), self.port_timeout.get())
+        except (ValueError, tk.TclError) as e:
+            return messagebox.showerror("Port Scan", str(e))
+        TaskWindow("Port Scan", self, executor=self.tasks).start(
+            self._port_worker, (hosts, ports, limits, self.port_all.get()))
+
+    def _port_worker(self, hosts, ports, limits, show_all, task):
+        tv = self.port_tv
+        tv.clear()
+        self.port_matrix = matrix = portscan.PortMatrix()
+        task.progress.begin(f"Scanning {len(hosts)} hosts …", total_items=len(hosts) * len(ports), unit="probes")
+        found = 0
+        results = portscan.scan_many(hosts, ports, *limits)
+        try:
+            for r in results:
+                matrix.add(r)
+                if r.port == 0:
+                    tv.append((r.host, "", "error", r.detail), (0, 0.0))
+                    task.progress.advance(len(ports))
+                    continue
+                if r.state == "open":
+                    found += 1
+                if r.state == "open" or show_all:
+                    rtt = f"{r.rtt_ms:.1f}" if r.rtt_ms is not None else ""
+                    tv.append((r.host, r.port, r.state, rtt), (r.port, r.rtt_ms or 0.0))
+                task.progress.advance()
+        finally:
+            results.close()
+        task.status(f"{found} open ports on {len(matrix.hosts())} of {len(hosts)} hosts")
+
+    def _show_port_matrix(self):
+        matrix = self.port_matrix
+        ports, hosts = matrix.open_ports(), matrix.hosts()
+        if not hosts:
+            return messagebox.showinfo("Port Matrix", "No open ports found yet.")
+        win = tk.Toplevel(self)
+        win.title(f"Port Matrix – {len(hosts)} hosts × {len(ports)} ports")
+        cols = ["host"] + [str(p) for p in ports]
+        tv = tb.Treeview(win, columns=cols, show="headings")
+        for c in cols:
+            tv.heading(c, text=c)
+            tv.column(c, width=140 if c == "host" else 56, anchor=W if c == "host" else CENTER, stretch=False)
+        marks = {"open": "●", "closed": "·", "filtered": "?", "error": "!"}
+        for host in hosts:
+            tv.insert("", END, values=[host] + [marks.get(st, "") for st in matrix.row(host, ports)])
+        xsb = tb.Scrollbar(win, orient=HORIZONTAL, command=tv.xview)
+        ysb = tb.Scrollbar(win, orient=VERTICAL, command=tv.yview)
+        tv.configure(xscrollcommand=xsb.set, yscrollcommand=ysb.set)
+        tb.Label(win, text="● open   · closed   ? filtered (no answer)   ! error").pack(side=BOTTOM, anchor=W, padx=8, pady=4)
+        xsb.pack(side=BOTTOM, fill=X)
+        ysb.pack(side=RIGHT, fill=Y)
+        tv.pack(fill=BOTH, expand=YES)
 
     def _subnet_tab(self, tab, func, est):
         tut = tb.Labelframe(tab, text="How to Use", bootstyle=INFO)
         tut.pack(fill=X, padx=10, pady=5)
-        tk.Label(tut, text="1) Enter CIDR (e.g. 192.168.1.0/24)\n2) Click 'Scan'\n3) Live hosts listed below", justify=LEFT, anchor='w').pack(fill=X, padx=15)
+        tk.Label(tut, text="1) Enter CIDR or hosts (e.g. 192.168.1.0/24)\n"
+                           "2) Ports: a host that accepts or refuses a connect is up, even if it drops pings\n"
+                           "3) Click 'Scan' – live hosts appear as they answer", justify=LEFT, anchor='w').pack(fill=X, padx=15)
         frm = tb.Frame(tab); frm.pack(anchor=W, padx=10, pady=5)
         tb.Label(frm, text="CIDR:").pack(side=LEFT)
-        ce = tb.Entry(frm, width=24); ce.pack(side=LEFT, padx=(5,0))
+        ce = tb.Entry(frm, width=24); ce.pack(side=LEFT, padx=(5,10))
+        tb.Label(frm, text="Ports:").pack(side=LEFT)
+        pe = tb.Entry(frm, width=20); pe.pack(side=LEFT, padx=(5,10))
+        pe.insert(0, ",".join(map(str, sweep.SWEEP_PORTS)))
+        tb.Label(frm, text="Timeout (s):").pack(side=LEFT)
+        self.sweep_timeout = tk.DoubleVar(value=sweep.DEFAULT_TIMEOUT)
+        tb.Entry(frm, textvariable=self.sweep_timeout, width=5).pack(side=LEFT, padx=(5,10))
+        self.sweep_icmp = tk.BooleanVar(value=True)
+        tb.Checkbutton(frm, text="ICMP", variable=self.sweep_icmp).pack(side=LEFT, padx=5)
         tb.Button(frm, text="Scan", bootstyle=PRIMARY,
-                  command=lambda: threading.Thread(target=self._scan_subnet, args=(ce.get(), est), daemon=True).start()
+                  command=lambda: self._start_sweep(ce.get(), pe.get())
                  ).pack(side=LEFT, padx=5)
-        self.out_sub = tb.Text(tab, height=10, state='disabled'); self.out_sub.pack(fill=BOTH, expand=YES, padx=10, pady=5)
+        self.sweep_tv = ResultsView(tab, ("address", "via", "rtt ms"), numeric=("rtt ms",))
+        self.sweep_tv.pack(fill=BOTH, expand=YES, padx=10, pady=5)
+        self.sweep_live = []  # addresses found by the last scan, for the Reverse DNS tab
 
-    def _scan_subnet(self, cidr, est):
-        self.out_sub.config(state='normal'); self.out_sub.delete('1.0','end')
+    def _start_sweep(self, hosts, spec):
         try:
-            hosts = list(ipaddress.ip_network(cidr, strict=False).hosts())
-        except:
-            messagebox.showerror("Invalid CIDR","Enter a valid subnet."); return
-        for ip in hosts:
-            if subprocess.call(f"ping -n 1 -w 200 {ip}", shell=True) == 0:
-                self.out_sub.insert('end', f"{ip}\n"); self.out_sub.see('end')
-        self.out_sub.config(state='disabled')
+            hosts = net.parse_hosts(hosts)
+            ports = net.parse_ports(spec) if spec.strip() else []
+            timeout = self.sweep_timeout.get()
+        except (ValueError, tk.TclError) as e:
+            return messagebox.showerror("Subnet Scan", str(e))
+        if not ports and not self.sweep_icmp.get():
+            return messagebox.showerror("Subnet Scan", "Enable ICMP or give at least one port.")
+        TaskWindow("Subnet Scan", self, executor=self.tasks).start(
+            self._sweep_worker, (hosts, ports, timeout, self.sweep_icmp.get()))
+
+    def _sweep_worker(self, hosts, ports, timeout, use_icmp, task):
+        tv = self.sweep_tv
+        tv.clear()
+        pinger, note = None, "ICMP off"
+        if use_icmp:
+            try:
+                pinger = icmp.open_pinger()
+                note = f"ICMP via {pinger.backend}"
+            except icmp.IcmpUnavailable as e:
+                if not ports:
+                    raise
+                note = f"{e}; TCP only"
+        self.sweep_live = live = []
+        results = sweep.sweep(hosts, ports, pinger, timeout=timeout, progress=task.progress)
+        try:
+            for h in results:
+                live.append(h.host)
+                rtt = f"{h.rtt_ms:.1f}" if h.rtt_ms is not None else ""
+                tv.append((h.host, h.via, rtt), (h.rtt_ms or 0.0,))
+        finally:
+            results.close()
+            if pinger is not None:
+                pinger.close()
+        task.status(f"{len(live)} of {len(hosts)} hosts up · {note}")
 
     def _rev_tab(self, tab, func, est):
         tut = tb.Labelframe(tab, text="How to Use", bootstyle=INFO)
         tut.pack(fill=X, padx=10, pady=5)
-        tk.Label(tut, text="1) Enter IP\n2) Click 'Lookup'\n3) Hostname below", justify=LEFT, anchor='w').pack(fill=X, padx=15)
+        tk.Label(tut, text="1) Enter addresses or subnets (e.g. 10.0.0.5, 10.0.1.0/24),\n"
+                           "   or take the live hosts of the last Subnet Scan\n"
+                           "2) Click 'Lookup' – names appear as the lookups finish, many at a time",
+                 justify=LEFT, anchor='w').pack(fill=X, padx=15)
         frm = tb.Frame(tab); frm.pack(anchor=W, padx=10, pady=5)
         tb.Label(frm, text="IP:").pack(side=LEFT)
-        ie = tb.Entry(frm, width=24); ie.pack(side=LEFT, padx=(5,0))
+        ie = tb.Entry(frm, width=36); ie.pack(side=LEFT, padx=(5,0))
         tb.Button(frm, text="Lookup", bootstyle=PRIMARY,
-                  command=lambda: self._with_loader(lambda: func(ie.get()), self.out_rev, est)
+                  command=lambda: self._start_lookup("ptr", ie.get())
+                 ).pack(side=LEFT, padx=5)
+        tb.Button(frm, text="Live Hosts from Subnet Scan", bootstyle=SECONDARY,
+                  command=lambda: self._lookup_live_hosts(ie)
                  ).pack(side=LEFT, padx=5)
-        self.out_rev = tb.Text(tab, height=6, state='disabled'); self.out_rev.pack(fill=BOTH, expand=YES, padx=10, pady=5)
+        self.rev_tv = ResultsView(tab, ("address", "name", "aliases", "cached"))
+        self.rev_tv.pack(fill=BOTH, expand=YES, padx=10, pady=5)
+
+    def _lookup_live_hosts(self, entry):
+        if not self.sweep_live:
+            return messagebox.showinfo("Reverse DNS", "Run a Subnet Scan first.")
+        entry.delete(0, END)
+        entry.insert(0, ", ".join(self.sweep_live))
+        self._start_lookup("ptr", entry.get())
+
+    def _start_lookup(self, kind, text):
+        title = "Reverse DNS" if kind == "ptr" else "Domain→IP"
+        try:
+            if kind == "ptr":
+                queries = net.parse_hosts(text)
+            else:
+                queries = list(dict.fromkeys(net.clean_host(n) for n in text.replace(",", " ").split()))
+                if not queries:
+                    raise ValueError("no names given")
+        except ValueError as e:
+            return messagebox.showerror(title, str(e))
+        TaskWindow(title, self, executor=self.tasks).start(self._lookup_worker, (kind, queries))
+
+    def _lookup_worker(self, kind, queries, task):
+        resolver = default_resolver()
+        if kind == "ptr":
+            tv, results = self.rev_tv, resolver.reverse_many(queries)
+        else:
+            tv, results = self.dom_tv, resolver.lookup_many(queries)
+        tv.clear()
+        task.progress.begin(f"Looking up {len(queries)} names …", total_items=len(queries), unit="names")
+        failed = cached = 0
+        try:
+            for res in results:
+                hit = "yes" if res.cached else ""
+                cached += res.cached
+                if res.error:
+                    failed += 1
+                    tv.append((res.query, "", res.error, hit))
+                elif kind == "ptr":
+                    tv.append((res.query, res.answers[0], ", ".join(res.answers[1:]), hit))
+                else:
+                    for addr in res.answers:
+                        tv.append((res.query, addr, "IPv6" if ":" in addr else "IPv4", hit))
+                task.progress.advance()
+        finally:
+            results.close()
+        task.status(f"{len(queries) - failed} of {len(queries)} resolved, {cached} from cache")
 
     def _pub_tab(self, tab, func, est):
         tut = tb.Labelframe(tab, text="How to Use", bootstyle=INFO)
@@ -279,14 +513,17 @@ class NetworkPage(tb.Frame):
     def _dom_tab(self, tab, func, est):
         tut = tb.Labelframe(tab, text="How to Use", bootstyle=INFO)
         tut.pack(fill=X, padx=10, pady=5)
-        tk.Label(tut, text="1) Enter domain or URL\n2) Click 'Resolve'\n3) IP below", justify=LEFT, anchor='w').pack(fill=X, padx=15)
+        tk.Label(tut, text="1) Enter one or more domains or URLs, separated by commas or spaces\n"
+                           "2) Click 'Resolve'\n3) Every IPv4 and IPv6 address is listed below",
+                 justify=LEFT, anchor='w').pack(fill=X, padx=15)
         frm = tb.Frame(tab); frm.pack(anchor=W, padx=10, pady=5)
         tb.Label(frm, text="Domain:").pack(side=LEFT)
-        de = tb.Entry(frm, width=30); de.pack(side=LEFT, padx=(5,0))
+        de = tb.Entry(frm, width=40); de.pack(side=LEFT, padx=(5,0))
         tb.Button(frm, text="Resolve", bootstyle=PRIMARY,
-                  command=lambda: self._with_loader(lambda: func(de.get()), self.out_dom, est)
+                  command=lambda: self._start_lookup("addr", de.get())
                  ).pack(side=LEFT, padx=5)
-        self.out_dom = tb.Text(tab, height=6, state='disabled'); self.out_dom.pack(fill=BOTH, expand=YES, padx=10, pady=5)
+        self.dom_tv = ResultsView(tab, ("name", "address", "family", "cached"))
+        self.dom_tv.pack(fill=BOTH, expand=YES, padx=10, pady=5)
 
     def _flood_tab(self, tab, func, est):
         tut = tb.Labelframe(tab, text="How to Use", bootstyle=INFO)
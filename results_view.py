@@ -0,0 +1,200 @@
+# pages/results_view.py
+"""
+Scrolling result list for scans that can return millions of rows.
+
+Workers call ``append``/``clear`` from any thread; rows land in a buffer
+that the UI thread drains every FLUSH_MS into a ``ResultTable``.
+Only the rows that fit on screen exist as Treeview items: scrolling
+rewrites the values of that small item pool instead of moving Tk items
+around. Sorting and filtering reorder the table's row ids, never the Tk
+widgets, and selection is tracked by row so it survives scrolling.
+
+Columns listed in ``numeric`` sort on the raw values workers pass with
+each row (``append(row, keys)``), not on the formatted text.
+"""
+from collections import deque
+
+import tkinter as tk
+import ttkbootstrap as tb
+from ttkbootstrap.constants import *
+
+from toolkit.table import ResultTable
+
+_CLEAR = object()
+_SHIFT, _CONTROL = 0x0001, 0x0004
+
+
+class ResultsView(tb.Frame):
+    FLUSH_MS = 100
+    MAX_BATCH = 100_000     # rows moved per flush, keeps each tick short
+
+    def __init__(self, master, columns, numeric=(), **kw):
+        super().__init__(master, **kw)
+        self.columns = tuple(columns)
+        self.model = ResultTable(self.columns, numeric)
+        self.selected = set()   # row ids in the model
+        self.top = 0            # position in view of the first shown row
+        self._pending = deque()
+        self._items = []        # Treeview item pool, one per visible line
+        self._visible = 10
+        self._on_open = None
+
+        self.tree = tb.Treeview(self, columns=self.columns, show="headings", selectmode="extended")
+        for c in self.columns:
+            self.tree.heading(c, text=c.title(), command=lambda c=c: self.sort(c))
+        self.vsb = tb.Scrollbar(self, orient=VERTICAL, command=self._on_scrollbar)
+        self.tree.pack(side=LEFT, fill=BOTH, expand=YES)
+        self.vsb.pack(side=RIGHT, fill=Y)
+
+        self.tree.bind("<Configure>", self._on_resize)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-3 * (e.delta // 120)))
+        self.tree.bind("<Button-4>", lambda _e: self.scroll(-3))
+        self.tree.bind("<Button-5>", lambda _e: self.scroll(3))
+        self.tree.bind("<Prior>", lambda _e: self.scroll(-self._visible))
+        self.tree.bind("<Next>", lambda _e: self.scroll(self._visible))
+        self.tree.bind("<Button-1>", self._on_click, add="+")
+        self.tree.bind("<<TreeviewSelect>>", self._sync_selection, add="+")
+        self.tree.bind("<Double-1>", self._on_double)
+        self.after(self.FLUSH_MS, self._flush)
+
+    # -------- thread-safe producer side
+
+    def append(self, row, keys=None) -> None:
+        """``keys`` are the raw values of the ``numeric`` columns, in that order."""
+        self._pending.append((tuple(row), keys))
+
+    def extend(self, rows) -> None:
+        self._pending.extend((tuple(r), None) for r in rows)
+
+    def clear(self) -> None:
+        self._pending.append(_CLEAR)
+
+    # -------- UI-thread API
+
+    def bind_open(self, callback) -> None:
+        """``callback(row)`` on double-click."""
+        self._on_open = callback
+
+    def bind_select(self, callback) -> None:
+        self.tree.bind("<<TreeviewSelect>>", lambda _e: callback(self), add="+")
+
+    @property
+    def rows(self):
+        return self.model.rows
+
+    @property
+    def view(self):
+        return self.model.view
+
+    def shown_rows(self):
+        """Rows in the current sort order that pass the filter."""
+        rows = self.rows
+        return (rows[i] for i in self.view)
+
+    def selected_rows(self):
+        return [self.rows[i] for i in sorted(self.selected)]
+
+    def select_all(self) -> None:
+        self.selected = set(self.view)
+        self._render()
+
+    def remove_selected(self) -> None:
+        self.model.remove(self.selected)
+        self.selected = set()
+        self._render()
+
+    def sort(self, col, reverse=None) -> None:
+        if reverse is None:
+            reverse = self.model.sort_spec == (self.columns.index(col), False)
+        self.model.sort(col, reverse)
+        self._render()
+
+    def set_filter(self, col, text) -> None:
+        self.model.set_filter(col, text)
+        self._render()
+
+    def scroll(self, lines) -> None:
+        self.top += lines
+        self._render()
+
+    def _flush(self) -> None:
+        if not self.winfo_exists():
+            return
+        if self._pending:
+            batch = []
+            for _ in range(min(len(self._pending), self.MAX_BATCH)):
+                item = self._pending.popleft()
+                if item is _CLEAR:
+                    batch = []
+                    self.model.clear()
+                    self.selected, self.top = set(), 0
+                else:
+                    batch.append(item)
+            self.model.extend(batch)
+            self._render()
+        self.after(self.FLUSH_MS, self._flush)
+
+    # -------- view
+
+    def _render(self) -> None:
+        n = len(self.view)
+        self.top = max(0, min(self.top, n - self._visible))
+        needed = min(self._visible, n - self.top)
+        while len(self._items) < needed:
+            self._items.append(self.tree.insert("", "end"))
+        while len(self._items) > needed:
+            self.tree.delete(self._items.pop())
+        sel = []
+        for k, iid in enumerate(self._items):
+            ri = self.view[self.top + k]
+            self.tree.item(iid, values=self.rows[ri])
+            if ri in self.selected:
+                sel.append(iid)
+        self.tree.selection_set(sel)
+        if n:
+            self.vsb.set(self.top / n, (self.top + needed) / n)
+        else:
+            self.vsb.set(0, 1)
+
+    def _row_of(self, iid):
+        try:
+            return self.view[self.top + self._items.index(iid)]
+        except (ValueError, IndexError):
+            return None
+
+    def _on_resize(self, event) -> None:
+        try:
+            rowheight = int(tb.Style().lookup("Treeview", "rowheight") or 20)
+        except (tk.TclError, ValueError):
+            rowheight = 20
+        # one line is taken by the headings
+        self._visible = max(1, event.height // rowheight - 1)
+        self._render()
+
+    def _on_scrollbar(self, *args) -> None:
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.view))
+        elif args[0] == "scroll":
+            step = self._visible if args[2] == "pages" else 1
+            self.top += int(args[1]) * step
+        self._render()
+
+    def _on_click(self, event) -> None:
+        if not event.state & (_SHIFT | _CONTROL):
+            self.selected.clear()
+
+    def _sync_selection(self, _event=None) -> None:
+        cur = set(self.tree.selection())
+        for iid in self._items:
+            ri = self._row_of(iid)
+            if ri is None:
+                continue
+            if iid in cur:
+                self.selected.add(ri)
+            else:
+                self.selected.discard(ri)
+
+    def _on_double(self, event) -> None:
+        ri = self._row_of(self.tree.identify_row(event.y))
+        if ri is not None and self._on_open is not None:
+            self._on_open(self.rows[ri])
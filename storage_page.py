@@ -1,15 +1,13 @@
 # pages/storage_page.py
 
 import os
-import hashlib
+import re
 import tempfile
 import datetime
+import time
 import subprocess
-import threading
-import ctypes
 import textwrap
-import shutil
-import glob
+from contextlib import nullcontext
 
 try:
     from send2trash import send2trash
@@ -21,49 +19,68 @@ import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 from tkinter import messagebox, filedialog
 
-import psutil
-import wmi
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
-class TaskWindow(tk.Toplevel):
-    def __init__(self, title: str, parent: tk.Misc) -> None:
-        super().__init__(parent)
-        self.title(title)
-        self.geometry("400x110")
-        self.resizable(False, False)
-        self.progress = tb.Progressbar(self, mode="indeterminate")
-        self.progress.pack(fill=X, padx=20, pady=(18, 5))
-        self.status = tb.Label(self, text="Starting …")
-        self.status.pack(fill=X, padx=20)
-
-    def start(self, fn, args: tuple = ()) -> None:
-        self.progress.start()
-        threading.Thread(target=self._run, args=(fn, args), daemon=True).start()
-
-    def _run(self, fn, args):
-        try:
-            fn(*args, status_cb=self._update_status)
-            self._finish()
-        except Exception as exc:
-            self._finish_error(exc)
-
-    def _safe(self, call, *a, **kw):
-        try:
-            call(*a, **kw)
-        except tk.TclError:
-            pass
-
-    def _update_status(self, msg: str) -> None:
-        self.after(0, lambda m=msg: self._safe(self.status.config, text=m))
+from pages.results_view import ResultsView
+from pages.task_window import TaskWindow, run_in_background
+from toolkit import bench, manifest
+from toolkit.cleanup import browser_cache_paths, delete_paths, temp_entries, windows_cache_paths
+from toolkit.drives import list_drives
+from toolkit.duindex import DiskUsageIndex, empty_dirs
+from toolkit.dupes import find_duplicates
+from toolkit.export import FILE_TYPES, format_for, open_sink
+from toolkit.fastio import READ_MODES
+from toolkit.hashcache import HashCache
+from toolkit.hashing import ALGORITHMS, DEFAULT_WORKERS, FAST_ALGO, hash_files
+from toolkit.nameindex import MODES as NAME_MODES, NameIndex
+from toolkit.procpool import DEFAULT_PROCESSES
+from toolkit.walker import Walker
+
+# psutil, wmi and matplotlib are imported where they are used, so opening the
+# page does not pay for them; see Main.PAGES.
+
+
+def _figure(master, **kw):
+    """Tk canvas holding a new matplotlib Figure (no pyplot state)."""
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    from matplotlib.figure import Figure
+    return FigureCanvasTkAgg(Figure(**kw), master=master)
+
+
+class _ResultOut:
+    """A worker's results: into the table, streamed to an export file, or both."""
+
+    def __init__(self, view, export, fields):
+        path, show = export
+        self.view = view
+        self.path = path
+        self.show = show or not path
+        self.sink = open_sink(path, fields) if path else None
+
+    def add(self, record, row, keys=None):
+        """``record`` None adds only the table row (several rows for one record)."""
+        if self.sink is not None and record is not None:
+            self.sink.write(record)
+        if self.show:
+            self.view.append(row, keys)
+
+    def summary(self):
+        return f" | {self.sink.count} rows written to {self.path}" if self.sink is not None else ""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        if self.sink is not None:
+            self.sink.close()
+
+
+def _on_first_show(widget, fn):
+    """Run ``fn`` once, the first time ``widget`` (e.g. a notebook tab) is mapped."""
+    def once(_e):
+        if not getattr(widget, "_shown", False):
+            widget._shown = True
+            fn()
+    widget.bind("<Map>", once, add="+")
 
-    def _finish(self) -> None:
-        self.after(0, lambda: self._safe(self.progress.stop))
-        self.after(0, lambda: self._safe(self.status.config, text="Done"))
-
-    def _finish_error(self, err: Exception) -> None:
-        self.after(0, lambda: self._safe(self.progress.stop))
-        self.after(0, lambda: self._safe(self.status.config, text=f"Error: {err}"))
 
 class StoragePage(tb.Frame):
     def __init__(self, master: tk.Misc):
@@ -79,6 +96,10 @@ class StoragePage(tb.Frame):
 
         self.active_tree: tb.Treeview | None = None
         self.unit_var = tk.StringVar(value="MB")
+        self.hash_cache_var = tk.BooleanVar(value=True)
+        self.proc_pool_var = tk.BooleanVar(value=False)
+        self.du_trees = {}  # mount -> toolkit.du.DirNode from the last chart scan
+        self.name_indexes = {}  # search root -> toolkit.nameindex.NameIndex
 
         self._build_header()
         self._build_tabs()
@@ -96,6 +117,14 @@ class StoragePage(tb.Frame):
         )
         cb.pack(side=LEFT)
         cb.bind("<<ComboboxSelected>>", lambda _e: self._refresh_overview())
+        tb.Checkbutton(
+            ctl, text=f"Scan on all cores ({DEFAULT_PROCESSES} processes)",
+            variable=self.proc_pool_var,
+        ).pack(side=LEFT, padx=(20, 0))
+
+    def _processes(self):
+        """Process count for the CPU-heavy workers; 0 keeps them on threads."""
+        return DEFAULT_PROCESSES if self.proc_pool_var.get() else 0
 
     def _build_tabs(self):
         nb = tb.Notebook(self)
@@ -109,13 +138,20 @@ class StoragePage(tb.Frame):
         self._build_robocopy_danger(nb)
 
     def _select_all(self):
-        if self.active_tree:
+        if isinstance(self.active_tree, ResultsView):
+            self.active_tree.select_all()
+        elif self.active_tree:
             self.active_tree.selection_set(self.active_tree.get_children())
 
+    def _selected_values(self, tv):
+        if isinstance(tv, ResultsView):
+            return tv.selected_rows()
+        return [tv.item(i)["values"] for i in tv.selection()]
+
     def _copy_selected(self):
         if not self.active_tree:
             return
-        paths = [self.active_tree.item(i)["values"][0] for i in self.active_tree.selection()]
+        paths = [str(v[0]) for v in self._selected_values(self.active_tree)]
         if paths:
             self.clipboard_clear()
             self.clipboard_append("\n".join(paths))
@@ -124,31 +160,12 @@ class StoragePage(tb.Frame):
     def _on_tree_select(self, tv):
         self.active_tree = tv
 
-    def _make_tree_sortable(self, tv):
-        for col in tv["columns"]:
-            tv.heading(col, command=lambda c=col, t=tv: self._sort_treeview(t, c, False))
-
-    def _sort_treeview(self, tv, col, reverse):
-        data = [(tv.set(k, col), k) for k in tv.get_children("")]
-        try:
-            data = [(float(v), k) for v, k in data]
-        except ValueError:
-            pass
-        data.sort(reverse=reverse)
-        for idx, (_, k) in enumerate(data):
-            tv.move(k, "", idx)
-        tv.heading(col, command=lambda: self._sort_treeview(tv, col, not reverse))
-
-    def _apply_filter(self, tv, col, pat):
-        for iid in tv.get_children():
-            tv.reattach(iid, "", "end")
-        p = pat.lower()
-        if not p:
-            return
-        for iid in tv.get_children():
-            val = tv.set(iid, col).lower()
-            if p not in val:
-                tv.detach(iid)
+    def _results_view(self, parent, cols, open_col=0, numeric=()):
+        view = ResultsView(parent, cols, numeric=numeric)
+        view.pack(fill=BOTH, expand=YES, padx=12, pady=6)
+        view.bind_select(self._on_tree_select)
+        view.bind_open(lambda row: os.startfile(row[open_col]))
+        return view
 
     # ------------------ Overview Tab ------------------
     def _build_overview(self, nb):
@@ -163,76 +180,71 @@ class StoragePage(tb.Frame):
                 "1) Shows all mounted drives with total/used/free, type, FS & cluster\n"
                 "2) Pie chart shows used vs free\n"
                 "3) Click Refresh to update\n"
-                "4) Sort by clicking headers"
+                "4) Sort by clicking headers\n"
+                "5) Chart only rescans folders changed since the last chart; tick Full rescan to redo all"
             ),
             justify=LEFT, anchor="w"
         ).pack(fill=X, padx=15, pady=5)
 
-        chart_box = tb.Labelframe(tab, text="Drive Usage Chart")
-        chart_box.pack(fill=X, padx=12, pady=(0, 6))
-        fig, ax = plt.subplots(figsize=(4, 1.5))
-        self.ov_ax = ax
-        self.ov_canvas = FigureCanvasTkAgg(fig, master=chart_box)
-        self.ov_canvas.get_tk_widget().pack()
+        self.ov_chart_box = tb.Labelframe(tab, text="Drive Usage Chart")
+        self.ov_chart_box.pack(fill=X, padx=12, pady=(0, 6))
+        self.ov_canvas = None  # created with the first data
+        self.ov_drives = None
 
         cols = ("device", "mount", "total", "used", "free", "type", "fs", "cluster")
-        tv = tb.Treeview(tab, columns=cols, show="headings", selectmode="extended")
-        for c in cols:
-            tv.heading(c, text=c.title())
-        tv.pack(fill=BOTH, expand=YES, padx=12, pady=6)
-        tv.bind("<<TreeviewSelect>>", lambda _e, v=tv: self._on_tree_select(v))
-        self.ov_tv = tv
-        self._make_tree_sortable(tv)
+        self.ov_tv = self._results_view(tab, cols, open_col=1, numeric=("total", "used", "free", "cluster"))
 
         btns = tb.Frame(tab)
         btns.pack(fill=X, padx=12, pady=(0, 6))
         tb.Button(btns, text="Refresh", bootstyle=PRIMARY, command=self._ov_refresh).pack(side=LEFT)
         tb.Button(btns, text="Chart",   bootstyle=INFO,    command=self._start_chart).pack(side=LEFT, padx=6)
+        self.chart_full_var = tk.BooleanVar(value=False)
+        tb.Checkbutton(btns, text="Full rescan", variable=self.chart_full_var).pack(side=LEFT, padx=6)
 
         self._ov_refresh()
 
     def _ov_refresh(self):
-        self.ov_tv.delete(*self.ov_tv.get_children())
-        dev_map = {}
-        try:
-            cw = wmi.WMI()
-            for d in cw.Win32_DiskDrive():
-                model = (d.Model or "").lower()
-                dtype = "SSD" if ("ssd" in model or "nvme" in model) else "HDD"
-                for part in d.associators("Win32_DiskDriveToDiskPartition"):
-                    for ld in part.associators("Win32_LogicalDiskToPartition"):
-                        dev_map[ld.DeviceID] = dtype
-        except Exception:
-            pass
+        """Query the drives in the background; the table and chart fill in when done."""
+        run_in_background(self, self._ov_worker, on_done=self._ov_show)
+
+    def _ov_worker(self, task):
+        return list_drives(check=task.check)
+
+    def _ov_show(self, drives):
+        self.ov_drives = drives
+        letters = [d.letter for d in drives]
+        for cb in (self.mount_vol, self.fmt_vol, self.robocopy_src, self.robocopy_dst):
+            cb.config(values=letters)
+        for cb in (self.mount_vol, self.fmt_vol):
+            if letters and not cb.get():
+                cb.current(0)
 
         unit = self.unit_var.get()
         factor = {"KB":1024, "MB":1024**2, "GB":1024**3, "TB":1024**4, "PB":1024**5}[unit]
 
+        self.ov_tv.clear()
         total_used = total_free = 0
-        for part in psutil.disk_partitions(all=False):
-            try:
-                usage = psutil.disk_usage(part.mountpoint)
-            except PermissionError:
-                continue
-            dev = part.device.rstrip("\\")
-            dtype = dev_map.get(dev, "HDD")
-            fs, cluster = self._get_fs_cluster(part.mountpoint)
-            total_used += usage.used
-            total_free += usage.free
-            self.ov_tv.insert(
-                "", "end",
-                values=(
-                    part.device,
-                    part.mountpoint,
-                    f"{usage.total / factor:.1f} {unit}",
-                    f"{usage.used / factor:.1f} {unit}",
-                    f"{usage.free / factor:.1f} {unit}",
-                    dtype,
-                    fs,
-                    f"{cluster / factor:.1f} {unit}"
-                )
+        for d in drives:
+            total_used += d.used
+            total_free += d.free
+            self.ov_tv.append(
+                (
+                    d.device,
+                    d.mount,
+                    f"{d.total / factor:.1f} {unit}",
+                    f"{d.used / factor:.1f} {unit}",
+                    f"{d.free / factor:.1f} {unit}",
+                    d.kind,
+                    d.fs,
+                    f"{d.cluster / factor:.1f} {unit}"
+                ),
+                (d.total, d.used, d.free, d.cluster),
             )
 
+        if self.ov_canvas is None:
+            self.ov_canvas = _figure(self.ov_chart_box, figsize=(4, 1.5))
+            self.ov_ax = self.ov_canvas.figure.add_subplot()
+            self.ov_canvas.get_tk_widget().pack()
         self.ov_ax.clear()
         try:
             self.ov_ax.pie(
@@ -243,53 +255,52 @@ class StoragePage(tb.Frame):
             )
         except Exception:
             pass
-        self.ov_canvas.draw()
-
-    def _get_fs_cluster(self, mount: str):
-        buf1 = ctypes.create_unicode_buffer(256)
-        buf2 = ctypes.create_unicode_buffer(256)
-        vs = ctypes.c_uint()
-        mc = ctypes.c_uint()
-        fl = ctypes.c_uint()
-        ctypes.windll.kernel32.GetVolumeInformationW(
-            ctypes.c_wchar_p(mount), buf1, 256,
-            ctypes.byref(vs), ctypes.byref(mc),
-            ctypes.byref(fl), buf2, 256
-        )
-        fs = buf2.value or "?"
-        spc = ctypes.c_uint()
-        bps = ctypes.c_uint()
-        ctypes.windll.kernel32.GetDiskFreeSpaceW(
-            ctypes.c_wchar_p(mount),
-            ctypes.byref(spc), ctypes.byref(bps),
-            ctypes.byref(ctypes.c_uint()), ctypes.byref(ctypes.c_uint())
-        )
-        return fs, spc.value * bps.value
+        self.ov_canvas.draw_idle()
 
     def _start_chart(self):
-        sel = self.ov_tv.selection()
+        sel = self.ov_tv.selected_rows()
         if not sel:
             return messagebox.showwarning("Chart", "Select a drive")
-        mount = self.ov_tv.item(sel[0])["values"][1]
-        TaskWindow("Building Chart", self).start(self._chart_worker, (mount,))
-
-    def _chart_worker(self, mount, status_cb):
-        status_cb("Scanning folders …")
-        data = {}
-        for name in os.listdir(mount):
-            path = os.path.join(mount, name)
-            if not os.path.isdir(path):
-                continue
-            size = 0
-            for r, _, files in os.walk(path):
-                for f in files:
-                    try:
-                        size += os.path.getsize(os.path.join(r, f))
-                    except Exception:
-                        pass
-            data[name] = size
+        mount = sel[0][1]
+        TaskWindow("Building Chart", self).start(
+            self._chart_worker, (mount, self.chart_full_var.get(), self._processes()))
+
+    def _chart_worker(self, mount, full, processes, task):
+        task.progress.begin("Scanning folders …", unit="folders")
+        view = {}
+        self.after(0, lambda: self._open_breakdown(view))
+
+        def progress(totals, scanned):
+            task.progress.update(items=scanned)
+            self.after(0, lambda t=totals: self._draw_breakdown(view, t))
+
+        with DiskUsageIndex() as index:
+            res = index.update(mount, full=full, progress_cb=progress, processes=processes)
+        tree = res.tree
+        self.du_trees[mount] = tree
+        data = {c.name: c.total_size for c in tree.children.values()}
+        self.after(0, lambda: self._draw_breakdown(view, data))
+        task.status(
+            f"{tree.total_files} files – {res.dirs_scanned} folders scanned, "
+            f"{res.dirs_reused} unchanged, {len(res.errors)} unreadable"
+        )
 
+    def _open_breakdown(self, view):
+        win = tk.Toplevel(self)
+        win.title("Folder Breakdown")
+        lf = tb.Labelframe(win, text="(<1%) folders:")
+        lf.pack(fill=X, padx=12, pady=6)
+        small = tb.Label(lf, text="", wraplength=800, justify=LEFT)
+        small.pack(fill=X, padx=12)
+        canv = _figure(win)
+        ax = canv.figure.add_subplot()
+        canv.get_tk_widget().pack(fill=BOTH, expand=YES)
+        view.update(win=win, ax=ax, canvas=canv, small=small)
+
+    def _draw_breakdown(self, view, data):
         total = sum(data.values())
+        if not total or not view.get("win") or not view["win"].winfo_exists():
+            return
         thresh = total * 0.01
         big = {k: v for k, v in data.items() if v >= thresh}
         small = [k for k, v in data.items() if v < thresh]
@@ -299,22 +310,10 @@ class StoragePage(tb.Frame):
         labels = [k for k, _ in top] + (["Other"] if other else [])
         sizes = [v for _, v in top] + ([other] if other else [])
 
-        status_cb("Rendering chart …")
-        fig, ax = plt.subplots()
-        ax.pie(sizes, labels=labels, autopct="%1.1f%%")
-
-        def show():
-            win = tk.Toplevel(self)
-            win.title("Folder Breakdown")
-            if small:
-                lf = tb.Labelframe(win, text="(<1%) folders:")
-                lf.pack(fill=X, padx=12, pady=6)
-                tb.Label(lf, text=", ".join(small),
-                         wraplength=800, justify=LEFT).pack(fill=X, padx=12)
-            canv = FigureCanvasTkAgg(fig, master=win)
-            canv.draw()
-            canv.get_tk_widget().pack(fill=BOTH, expand=YES)
-        self.after(0, show)
+        view["ax"].clear()
+        view["ax"].pie(sizes, labels=labels, autopct="%1.1f%%")
+        view["canvas"].draw_idle()
+        view["small"].config(text=", ".join(small))
 
     # ------------------ Speed Test Tab ------------------
     def _build_speed(self, nb):
@@ -326,9 +325,9 @@ class StoragePage(tb.Frame):
         tk.Label(
             tut,
             text=(
-                "1) Choose a local folder\n"
-                "2) Click Run Test to measure write/read speeds\n"
-                "3) Progress bar indicates completion"
+                "1) Choose a local folder on the drive to test\n"
+                "2) Pick file size, block size (or the 4K–8M sweep), pattern, operation and queue depth\n"
+                "3) Click Run Test – each test reports MB/s, IOPS and latency percentiles, charted below"
             ),
             justify=LEFT, anchor="w"
         ).pack(fill=X, padx=15, pady=5)
@@ -341,11 +340,43 @@ class StoragePage(tb.Frame):
         tb.Button(frm, text="Choose …", bootstyle=SECONDARY,
                   command=self._choose_speed_folder).pack(side=LEFT, padx=5)
 
-        self.speed_bar = tb.Progressbar(tab, mode="determinate", length=400)
-        self.speed_bar.pack(padx=5, pady=10)
-        tb.Button(tab, text="Run Test", bootstyle=PRIMARY,
-                  command=self._run_speed_test).pack(pady=5)
-        tb.Label(tab, text="Tip: use a local (non-USB) folder").pack()
+        opts = tb.Frame(tab)
+        opts.pack(fill=X, padx=12, pady=6)
+        self.speed_size = tk.StringVar(value="1024")
+        self.speed_block = tk.StringVar(value="1M")
+        self.speed_pattern = tk.StringVar(value="both")
+        self.speed_op = tk.StringVar(value="both")
+        self.speed_qd = tk.IntVar(value=1)
+        self.speed_secs = tk.StringVar(value="5")
+        self.speed_read_mode = tk.StringVar(value="readinto")
+        for label, var, values, width in (
+            ("File (MB):", self.speed_size, ["256", "1024", "4096", "16384"], 7),
+            ("Block:", self.speed_block, [bench.size_label(b) for b in bench.SWEEP] + ["sweep"], 6),
+            ("Pattern:", self.speed_pattern, list(bench.PATTERNS) + ["both"], 6),
+            ("Op:", self.speed_op, list(bench.OPS) + ["both"], 6),
+            ("Seconds/test:", self.speed_secs, ["1", "5", "10", "30"], 4),
+            ("Read via:", self.speed_read_mode, list(READ_MODES), 9),
+        ):
+            tb.Label(opts, text=label).pack(side=LEFT, padx=(8, 2))
+            tb.Combobox(opts, textvariable=var, values=values, width=width).pack(side=LEFT)
+        tb.Label(opts, text="Queue depth:").pack(side=LEFT, padx=(8, 2))
+        tb.Spinbox(opts, from_=1, to=64, textvariable=self.speed_qd, width=4).pack(side=LEFT)
+
+        flags = tb.Frame(tab)
+        flags.pack(fill=X, padx=12)
+        self.speed_direct = tk.BooleanVar(value=True)
+        self.speed_fsync = tk.BooleanVar(value=False)
+        tb.Checkbutton(flags, text="Bypass OS cache", variable=self.speed_direct).pack(side=LEFT, padx=5)
+        tb.Checkbutton(flags, text="Flush after every write", variable=self.speed_fsync).pack(side=LEFT, padx=5)
+        tb.Button(flags, text="Run Test", bootstyle=PRIMARY,
+                  command=self._run_speed_test).pack(side=LEFT, padx=10)
+        tb.Label(flags, text="Tip: use a local (non-USB) folder").pack(side=LEFT)
+
+        cols = ("test", "MB/s", "IOPS", "avg ms", "p50 ms", "p90 ms", "p99 ms", "p99.9 ms", "max ms", "cache")
+        self.speed_tv = self._results_view(tab, cols, numeric=cols[1:9])
+
+        self.speed_tab = tab
+        self.speed_canvas = None  # created with the first result
 
     def _choose_speed_folder(self):
         d = filedialog.askdirectory()
@@ -355,40 +386,69 @@ class StoragePage(tb.Frame):
 
     def _run_speed_test(self):
         folder = getattr(self, "speed_dir", tempfile.gettempdir())
-        fname = os.path.join(folder, "speedtest.tmp")
-        total, chunk = 50 * 1024**2, 1 * 1024**2
-        self.speed_bar["maximum"] = total
-        self.speed_bar["value"] = 0
-
+        blocks = {bench.size_label(b): b for b in bench.SWEEP}
+        block, pattern, op = self.speed_block.get(), self.speed_pattern.get(), self.speed_op.get()
         try:
-            st = datetime.datetime.now()
-            with open(fname, "wb") as f:
-                w = 0
-                while w < total:
-                    f.write(b"\0" * chunk)
-                    w += chunk
-                    self.speed_bar["value"] = w
-                    self.speed_bar.update()
-            wtime = (datetime.datetime.now() - st).total_seconds()
-        except PermissionError:
-            return messagebox.showerror("Speed", "No write permission")
-
-        st2 = datetime.datetime.now()
-        with open(fname, "rb") as f:
-            while f.read(chunk):
-                pass
-        rtime = (datetime.datetime.now() - st2).total_seconds()
+            size = int(float(self.speed_size.get()) * bench.MB)
+            secs = float(self.speed_secs.get())
+            qd = int(self.speed_qd.get())
+            specs = bench.sweep(
+                block_sizes=bench.SWEEP if block == "sweep" else (blocks[block],),
+                patterns=bench.PATTERNS if pattern == "both" else (pattern,),
+                ops=bench.OPS if op == "both" else (op,),
+                workers=qd,
+                fsync=self.speed_fsync.get(),
+                max_seconds=secs,
+                read_mode=self.speed_read_mode.get(),
+            )
+            if self.speed_read_mode.get() not in READ_MODES:
+                raise ValueError(self.speed_read_mode.get())
+        except (KeyError, ValueError, tk.TclError) as exc:
+            return messagebox.showwarning("Speed", f"Invalid setting: {exc}")
+        if qd < 1 or size < max(s.block_size for s in specs) * qd:
+            return messagebox.showwarning("Speed", "File is too small for that block size and queue depth")
+        TaskWindow("Speed Test", self).start(self._speed_worker, (folder, size, specs, self.speed_direct.get()))
+
+    def _speed_worker(self, folder, size, specs, direct, task):
+        tv = self.speed_tv
+        tv.clear()
+        done = []
+
+        def show(r):
+            vals = (r.mb_s, r.iops, r.mean_ms, *r.percentiles())
+            row = (r.spec.name,) + tuple(f"{v:,.1f}" if k < 2 else f"{v:.3f}" for k, v in enumerate(vals))
+            tv.append(row + ("bypassed" if r.direct else "used",), vals)
+            done.append(r)
+            self.after(0, lambda rs=list(done): self._draw_speed_chart(rs))
 
         try:
-            os.remove(fname)
-        except Exception:
-            pass
-
-        mb = total / 1024**2
-        messagebox.showinfo(
-            "Results",
-            f"Write: {mb / max(wtime,0.001):.1f} MB/s\nRead : {mb / max(rtime,0.001):.1f} MB/s"
-        )
+            results = bench.run_suite(folder, size, specs, direct=direct, progress=task.progress, result_cb=show)
+        except PermissionError:
+            raise RuntimeError("No write permission") from None
+        task.status(f"{len(results)} tests on {folder}")
+
+    def _draw_speed_chart(self, results):
+        names = [r.spec.name for r in results]
+        x = range(len(results))
+        if self.speed_canvas is None:
+            self.speed_canvas = _figure(self.speed_tab, figsize=(9, 2.8))
+            self.speed_tput_ax, self.speed_lat_ax = self.speed_canvas.figure.subplots(1, 2)
+            self.speed_canvas.get_tk_widget().pack(fill=X, padx=12, pady=(0, 6))
+        tput, lat = self.speed_tput_ax, self.speed_lat_ax
+        tput.clear()
+        tput.bar(x, [r.mb_s for r in results])
+        tput.set_ylabel("MB/s")
+        lat.clear()
+        for k, label in enumerate(["p50", "p90", "p99", "p99.9", "max"]):
+            lat.plot(x, [r.percentiles()[k] for r in results], marker="o", label=label)
+        lat.set_yscale("log")
+        lat.set_ylabel("latency (ms)")
+        lat.legend(fontsize="x-small")
+        for ax in (tput, lat):
+            ax.set_xticks(list(x))
+            ax.set_xticklabels(names, rotation=30, ha="right", fontsize="x-small")
+        self.speed_canvas.figure.tight_layout()
+        self.speed_canvas.draw_idle()
 
     # ------------------ Unmount/Eject/ISO Tab ------------------
     def _build_mount(self, nb):
@@ -410,10 +470,7 @@ class StoragePage(tb.Frame):
         frm = tb.Frame(tab)
         frm.pack(fill=X, padx=12, pady=6)
         tb.Label(frm, text="Drive:").pack(side=LEFT, padx=5)
-        vals = [p.device.rstrip("\\") for p in psutil.disk_partitions(all=False)]
-        self.mount_vol = tb.Combobox(frm, values=vals, width=10)
-        if vals:
-            self.mount_vol.current(0)
+        self.mount_vol = tb.Combobox(frm, width=10)  # filled by _ov_show
         self.mount_vol.pack(side=LEFT, padx=5)
         tb.Button(frm, text="Unmount", bootstyle=WARNING,
                   command=self._dismount).pack(side=LEFT, padx=5)
@@ -442,6 +499,7 @@ class StoragePage(tb.Frame):
             return
         if messagebox.askyesno("Unmount", f"Unmount {d}?"):
             try:
+                import wmi
                 for vol in wmi.WMI().Win32_Volume(DriveLetter=f"{d}:"):
                     vol.Dismount(True, False)
                 messagebox.showinfo("Unmount", f"{d} unmounted")
@@ -453,6 +511,7 @@ class StoragePage(tb.Frame):
         if not d:
             return
         if messagebox.askyesno("Eject", f"Eject {d}?"):
+            import wmi
             ok = False
             cw = wmi.WMI()
             for vol in cw.Win32_Volume(DriveLetter=f"{d}:"):
@@ -518,10 +577,7 @@ class StoragePage(tb.Frame):
 
         frm = tb.Frame(tab); frm.pack(fill=X, padx=12, pady=6)
         tb.Label(frm, text="Drive:").pack(side=LEFT, padx=5)
-        vals = [p.device.rstrip("\\") for p in psutil.disk_partitions(all=False)]
-        self.fmt_vol = tb.Combobox(frm, values=vals, width=10)
-        if vals:
-            self.fmt_vol.current(0)
+        self.fmt_vol = tb.Combobox(frm, width=10)  # filled by _ov_show
         self.fmt_vol.pack(side=LEFT, padx=5)
         tb.Label(frm, text="FS:").pack(side=LEFT, padx=5)
         self.fmt_fs = tb.Combobox(frm, values=["NTFS","FAT32","exFAT"], width=8)
@@ -547,7 +603,10 @@ class StoragePage(tb.Frame):
             messagebox.showerror("Format", f"Failed: {exc}")
 
     def _refresh_overview(self):
-        self._ov_refresh()
+        if self.ov_drives is None:
+            self._ov_refresh()
+        else:
+            self._ov_show(self.ov_drives)  # unit change only
 
     # ------------------ Cleanup Tab ------------------
     def _build_cleanup(self, nb):
@@ -592,31 +651,29 @@ class StoragePage(tb.Frame):
         btns = tb.Frame(f); btns.pack()
         tb.Button(btns, text="List Files", bootstyle=PRIMARY, command=lambda: self._refresh_temp_tree(tree)).pack(side=LEFT, padx=6)
         tb.Button(btns, text="Delete All", bootstyle=DANGER, command=lambda: self._delete_temp(tree)).pack(side=LEFT, padx=6)
-        self._refresh_temp_tree(tree)
+        _on_first_show(f, lambda: self._refresh_temp_tree(tree))
 
     def _refresh_temp_tree(self, tree):
-        tree.delete(*tree.get_children())
-        tempdir = tempfile.gettempdir()
-        for name in os.listdir(tempdir):
-            tree.insert("", "end", values=(os.path.join(tempdir, name),))
+        def fill(paths):
+            tree.delete(*tree.get_children())
+            for path in paths:
+                tree.insert("", "end", values=(path,))
+        run_in_background(self, self._list_temp_worker, on_done=fill)
+
+    def _list_temp_worker(self, task):
+        return temp_entries()
 
     def _delete_temp(self, tree):
         tempdir = tempfile.gettempdir()
         if not messagebox.askyesno("Delete Temp", f"Delete everything in {tempdir}?"):
             return
-        count = 0
-        for name in os.listdir(tempdir):
-            path = os.path.join(tempdir, name)
-            try:
-                if os.path.isdir(path):
-                    shutil.rmtree(path, ignore_errors=True)
-                else:
-                    os.remove(path)
-                count += 1
-            except Exception:
-                pass
-        messagebox.showinfo("Temp Files", f"Deleted {count} items.")
-        self._refresh_temp_tree(tree)
+        TaskWindow("Delete Temp", self).start(self._delete_worker, (temp_entries(),),
+                                             on_done=lambda _res: self._refresh_temp_tree(tree))
+
+    def _delete_worker(self, paths, task):
+        res = delete_paths(paths, progress=task.progress)
+        task.status(f"Deleted {res.removed} items" + (f", {len(res.failed)} failed" if res.failed else ""))
+        return res
 
     def _build_recycle_tab(self, cleanup_nb):
         f = tb.Frame(cleanup_nb); cleanup_nb.add(f, text="Recycle Bin")
@@ -636,7 +693,7 @@ class StoragePage(tb.Frame):
         btns = tb.Frame(f); btns.pack()
         tb.Button(btns, text="List Files", bootstyle=PRIMARY, command=lambda: self._refresh_recycle_tree(tree)).pack(side=LEFT, padx=6)
         tb.Button(btns, text="Empty Bin", bootstyle=DANGER, command=lambda: self._delete_recycle(tree)).pack(side=LEFT, padx=6)
-        self._refresh_recycle_tree(tree)
+        _on_first_show(f, lambda: self._refresh_recycle_tree(tree))
 
     def _refresh_recycle_tree(self, tree):
         tree.delete(*tree.get_children())
@@ -679,37 +736,22 @@ class StoragePage(tb.Frame):
         btns = tb.Frame(f); btns.pack()
         tb.Button(btns, text="List Cache", bootstyle=PRIMARY, command=lambda: self._refresh_browser_tree(tree)).pack(side=LEFT, padx=6)
         tb.Button(btns, text="Delete All", bootstyle=DANGER, command=lambda: self._delete_browser_cache(tree)).pack(side=LEFT, padx=6)
-        self._refresh_browser_tree(tree)
-
-    def _browser_cache_paths(self):
-        local = os.environ.get("LOCALAPPDATA", "")
-        appdata = os.environ.get("APPDATA", "")
-        paths = []
-        chrome = os.path.join(local,"Google","Chrome","User Data","Default","Cache")
-        if os.path.isdir(chrome): paths.append(chrome)
-        edge = os.path.join(local,"Microsoft","Edge","User Data","Default","Cache")
-        if os.path.isdir(edge): paths.append(edge)
-        for d in glob.glob(os.path.join(appdata,"Mozilla","Firefox","Profiles","*")):
-            c2 = os.path.join(d,"cache2")
-            if os.path.isdir(c2): paths.append(c2)
-        return paths
+        _on_first_show(f, lambda: self._refresh_browser_tree(tree))
 
     def _refresh_browser_tree(self, tree):
         tree.delete(*tree.get_children())
-        for p in self._browser_cache_paths():
+        for p in browser_cache_paths():
             tree.insert("", "end", values=(p,))
 
     def _delete_browser_cache(self, tree):
-        paths = self._browser_cache_paths()
+        paths = browser_cache_paths()
         if not paths:
             messagebox.showinfo("Browser Cache","No cache found.")
             return
         if not messagebox.askyesno("Browser Cache","Delete all?"):
             return
-        for p in paths:
-            shutil.rmtree(p, ignore_errors=True)
-        messagebox.showinfo("Browser Cache","Deleted cache.")
-        self._refresh_browser_tree(tree)
+        TaskWindow("Delete Browser Cache", self).start(self._delete_worker, (paths,),
+                                                     on_done=lambda _res: self._refresh_browser_tree(tree))
 
     def _build_win_cache_tab(self, cleanup_nb):
         f = tb.Frame(cleanup_nb); cleanup_nb.add(f, text="Windows Cache")
@@ -729,38 +771,22 @@ class StoragePage(tb.Frame):
         btns = tb.Frame(f); btns.pack()
         tb.Button(btns, text="List Cache", bootstyle=PRIMARY, command=lambda: self._refresh_win_cache_tree(tree)).pack(side=LEFT, padx=6)
         tb.Button(btns, text="Delete All", bootstyle=DANGER, command=lambda: self._delete_win_cache(tree)).pack(side=LEFT, padx=6)
-        self._refresh_win_cache_tree(tree)
-
-    def _win_cache_paths(self):
-        local = os.environ.get("LOCALAPPDATA","")
-        appdata = os.environ.get("APPDATA","")
-        windir = os.environ.get("WINDIR","C:\\Windows")
-        paths = [
-            os.path.join(local,"Microsoft","Windows","INetCache"),
-            os.path.join(local,"Microsoft","Windows","WebCache"),
-            os.path.join(local,"Microsoft","Windows","Explorer","IconCache"),
-            os.path.join(local,"Microsoft","Windows","Explorer","ThumbCache"),
-            os.path.join(windir,"Temp"),
-            os.path.join(local,"Temp")
-        ]
-        return [p for p in paths if os.path.exists(p)]
+        _on_first_show(f, lambda: self._refresh_win_cache_tree(tree))
 
     def _refresh_win_cache_tree(self, tree):
         tree.delete(*tree.get_children())
-        for p in self._win_cache_paths():
+        for p in windows_cache_paths():
             tree.insert("", "end", values=(p,))
 
     def _delete_win_cache(self, tree):
-        paths = self._win_cache_paths()
+        paths = windows_cache_paths()
         if not paths:
             messagebox.showinfo("Windows Cache","No cache found.")
             return
         if not messagebox.askyesno("Windows Cache","Delete all?"):
             return
-        for p in paths:
-            shutil.rmtree(p, ignore_errors=True)
-        messagebox.showinfo("Windows Cache","Deleted cache.")
-        self._refresh_win_cache_tree(tree)
+        TaskWindow("Delete Windows Cache", self).start(self._delete_worker, (paths,),
+                                                     on_done=lambda _res: self._refresh_win_cache_tree(tree))
 
     # ------------------ FILE MANAGER Tab ------------------
     def _build_filemgr(self, nb):
@@ -773,7 +799,7 @@ class StoragePage(tb.Frame):
             tut,
             text=(
                 "1) Pick a folder\n"
-                "2) Use Search, Duplicates, Empty Folders or Checksums\n"
+                "2) Use Search, Duplicates, Empty Folders, Checksums or Verify\n"
                 "3) Double-click to open"
             ),
             justify=LEFT, anchor="w"
@@ -785,6 +811,7 @@ class StoragePage(tb.Frame):
         self._build_duplicates_tab(fm)
         self._build_empty_folders_tab(fm)
         self._build_checksum_tab(fm)
+        self._build_verify_tab(fm)
 
         btn_frame = tb.Frame(tab)
         btn_frame.pack(fill=X, padx=12, pady=(0,6))
@@ -794,17 +821,63 @@ class StoragePage(tb.Frame):
             bootstyle=DANGER,
             command=self._delete_selected_filemgr
         ).pack(side=LEFT)
+        tb.Button(btn_frame, text="Save Table…", bootstyle=SECONDARY,
+                  command=self._save_table).pack(side=LEFT, padx=(6, 0))
+
+        # stream the next scans straight to a file as results arrive
+        tb.Label(btn_frame, text="Stream results to:").pack(side=LEFT, padx=(20, 4))
+        self.export_path = tk.StringVar()
+        tb.Entry(btn_frame, textvariable=self.export_path, width=36).pack(side=LEFT)
+        tb.Button(btn_frame, text="…", bootstyle=SECONDARY, width=2,
+                  command=self._pick_export).pack(side=LEFT, padx=2)
+        self.export_only = tk.BooleanVar(value=False)
+        tb.Checkbutton(btn_frame, text="File only (skip the table)",
+                       variable=self.export_only).pack(side=LEFT, padx=6)
+
+    def _pick_export(self):
+        path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=FILE_TYPES)
+        if path:
+            self.export_path.set(path)
+
+    def _export_target(self):
+        """``(path or None, show in table)`` for a worker, checked up front."""
+        path = self.export_path.get().strip()
+        if not path:
+            return None, True
+        format_for(path)  # ValueError for an unknown extension
+        return path, not self.export_only.get()
+
+    def _start_export_task(self, title, worker, args):
+        try:
+            export = self._export_target()
+        except ValueError as exc:
+            return messagebox.showwarning("Export", str(exc))
+        TaskWindow(title, self).start(worker, args + (export,))
+
+    def _save_table(self):
+        tv = self.active_tree
+        if not isinstance(tv, ResultsView):
+            return messagebox.showwarning("Save Table", "Click a result list first")
+        path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=FILE_TYPES)
+        if not path:
+            return
+        try:
+            with open_sink(path, tv.columns) as sink:
+                for row in tv.shown_rows():
+                    sink.write(dict(zip(tv.columns, row)))
+        except (OSError, ValueError, ImportError) as exc:
+            return messagebox.showerror("Save Table", str(exc))
+        messagebox.showinfo("Save Table", f"{sink.count} rows written to {path}")
 
     def _delete_selected_filemgr(self):
         tv = self.active_tree
         if not tv:
             return messagebox.showwarning("Delete","No item selected")
-        sel = tv.selection()
+        sel = self._selected_values(tv)
         if not sel:
             return messagebox.showwarning("Delete","No item selected")
         paths = []
-        for iid in sel:
-            vals = tv.item(iid).get("values", [])
+        for vals in sel:
             p = vals[0] if os.path.exists(vals[0]) else (vals[1] if len(vals)>1 and os.path.exists(vals[1]) else None)
             if p:
                 paths.append(p)
@@ -812,16 +885,12 @@ class StoragePage(tb.Frame):
             return messagebox.showwarning("Delete","No valid items")
         if not messagebox.askyesno("Delete", "Delete these?\n\n"+ "\n".join(paths)):
             return
-        for p in paths:
-            try:
-                if os.path.isdir(p):
-                    shutil.rmtree(p)
-                else:
-                    os.remove(p)
-            except Exception as e:
-                messagebox.showerror("Delete", f"Failed: {p}\n{e}")
-        for iid in sel:
-            tv.delete(iid)
+        for p, err in delete_paths(paths, strict=True).failed:
+            messagebox.showerror("Delete", f"Failed: {p}\n{err}")
+        if isinstance(tv, ResultsView):
+            tv.remove_selected()
+        else:
+            tv.delete(*tv.selection())
         messagebox.showinfo("Delete","Deleted selected items")
 
     # --- Search sub-tab
@@ -833,9 +902,9 @@ class StoragePage(tb.Frame):
         tk.Label(
             tut,
             text=(
-                "1) Click Folder…\n"
-                "2) Type to filter\n"
-                "3) Double-click to open"
+                "1) Click Folder… (the first search builds a name index, later ones reuse it)\n"
+                "2) Type a name, pick Mode/Type/filters and click Go; typing also filters the list\n"
+                "3) Click Reindex after big changes; double-click to open"
             ),
             justify=LEFT, anchor="w"
         ).pack(fill=X, padx=15, pady=5)
@@ -846,18 +915,30 @@ class StoragePage(tb.Frame):
         self.search_lbl.pack(side=LEFT, padx=5)
         self.search_pat = tk.Entry(sf)
         self.search_pat.pack(side=LEFT, fill=X, expand=YES, padx=5)
-        self.search_pat.bind("<KeyRelease>", lambda _e: self._apply_filter(self.search_tv, "path", self.search_pat.get()))
+        self.search_pat.bind("<KeyRelease>", lambda _e: self.search_tv.set_filter("path", self.search_pat.get()))
         tb.Button(sf, text="Go", bootstyle=PRIMARY, command=self._do_search).pack(side=LEFT, padx=5)
+        tb.Button(sf, text="Reindex", bootstyle=SECONDARY, command=lambda: self._do_search(rebuild=True)).pack(side=LEFT, padx=5)
+
+        of = tb.Frame(f); of.pack(fill=X, padx=12)
+        tb.Label(of, text="Mode:").pack(side=LEFT, padx=(5, 2))
+        self.search_mode = tb.Combobox(of, values=list(NAME_MODES), state="readonly", width=10)
+        self.search_mode.current(0)
+        self.search_mode.pack(side=LEFT)
+        tb.Label(of, text="Type:").pack(side=LEFT, padx=(10, 2))
+        self.search_kind = tb.Combobox(of, values=["any", "file", "dir"], state="readonly", width=6)
+        self.search_kind.current(0)
+        self.search_kind.pack(side=LEFT)
+        tb.Label(of, text="Min size (units):").pack(side=LEFT, padx=(10, 2))
+        self.search_min = tb.Entry(of, width=8)
+        self.search_min.pack(side=LEFT)
+        tb.Label(of, text="Modified in last (days):").pack(side=LEFT, padx=(10, 2))
+        self.search_days = tb.Entry(of, width=6)
+        self.search_days.pack(side=LEFT)
+        self.search_idx_lbl = tb.Label(of, text="")
+        self.search_idx_lbl.pack(side=LEFT, padx=10)
 
         cols = ("path","type","size","modified")
-        tv = tb.Treeview(f, columns=cols, show="headings", selectmode="extended")
-        for c in cols:
-            tv.heading(c, text=c.title())
-        tv.pack(fill=BOTH, expand=YES, padx=12, pady=6)
-        tv.bind("<<TreeviewSelect>>", lambda _e, v=tv: self._on_tree_select(v))
-        tv.bind("<Double-1>", lambda _e: os.startfile(tv.item(tv.selection()[0])["values"][0]) if tv.selection() else None)
-        self.search_tv = tv
-        self._make_tree_sortable(tv)
+        self.search_tv = self._results_view(f, cols, numeric=("size", "modified"))
 
     def _set_dir(self, attr, frame):
         d = filedialog.askdirectory()
@@ -866,30 +947,52 @@ class StoragePage(tb.Frame):
         setattr(self, attr, d)
         getattr(self, attr.replace("_dir","_lbl")).config(text=d)
 
-    def _do_search(self):
+    def _do_search(self, rebuild=False):
         root = getattr(self, "search_dir", None)
         if not root:
             return messagebox.showwarning("Search","Pick a folder first")
-        TaskWindow("Searching …", self).start(self._search_worker, (root,))
+        unit = self.unit_var.get()
+        factor = {"KB":1024,"MB":1024**2,"GB":1024**3,"TB":1024**4,"PB":1024**5}[unit]
+        pat, mode = self.search_pat.get().strip(), self.search_mode.get()
+        kind = self.search_kind.get()
+        try:
+            if mode == "regex":
+                re.compile(pat)
+            min_size = self.search_min.get().strip()
+            days = self.search_days.get().strip()
+            opts = dict(
+                mode=mode,
+                kind=None if kind == "any" else kind,
+                min_size=int(float(min_size) * factor) if min_size else None,
+                newer_than=time.time() - float(days) * 86400 if days else None,
+            )
+        except (re.error, ValueError) as exc:
+            return messagebox.showwarning("Search", f"Invalid filter: {exc}")
+        self._start_export_task("Searching …", self._search_worker, (root, pat, opts, factor, rebuild))
 
-    def _search_worker(self, root, status_cb):
+    def _search_worker(self, root, pat, opts, factor, rebuild, export, task):
         tv = self.search_tv
-        factor = {"KB":1024,"MB":1024**2,"GB":1024**3,"TB":1024**4,"PB":1024**5}[self.unit_var.get()]
-        self.after(0, lambda: tv.delete(*tv.get_children()))
-        for base, dirs, files in os.walk(root):
-            status_cb(f"Scanning {base} …")
-            for nm in dirs+files:
-                if self.search_pat.get().strip().lower() not in nm.lower():
-                    continue
-                p = os.path.join(base, nm)
-                try:
-                    sz = os.path.getsize(p)/factor
-                    m = datetime.datetime.fromtimestamp(os.path.getmtime(p)).strftime("%Y-%m-%d")
-                except Exception:
-                    sz, m = 0, ""
-                typ = "DIR" if os.path.isdir(p) else "FILE"
-                self.after(0, lambda r=(p, typ, f"{sz:.1f}", m): tv.insert("", "end", values=r))
-        status_cb("Done")
+        tv.clear()
+        idx = None if rebuild else (self.name_indexes.get(root) or NameIndex.load(root))
+        if idx is None:
+            idx = NameIndex.build(root, status_cb=task.status)
+            idx.save()
+        self.name_indexes[root] = idx
+        built = datetime.datetime.fromtimestamp(idx.built_at).strftime("%Y-%m-%d %H:%M")
+        self.after(0, lambda: self.search_idx_lbl.config(text=f"Index: {len(idx)} entries, built {built}"))
+
+        st = time.perf_counter()
+        n = 0
+        task.progress.begin("Searching …", unit="matches")
+        with _ResultOut(tv, export, ("path", "is_dir", "size", "mtime")) as out:
+            for hit in idx.query(pat, **opts):
+                m = datetime.datetime.fromtimestamp(hit.mtime).strftime("%Y-%m-%d") if hit.mtime else ""
+                r = (hit.path, "DIR" if hit.is_dir else "FILE", f"{hit.size/factor:.1f}", m)
+                out.add({"path": hit.path, "is_dir": hit.is_dir, "size": hit.size, "mtime": hit.mtime},
+                        r, (hit.size, hit.mtime))
+                n += 1
+                task.progress.advance()
+        task.status(f"{n} matches in {(time.perf_counter() - st) * 1000:.0f} ms{out.summary()}")
 
     # --- Duplicates sub-tab
     def _build_duplicates_tab(self, fm):
@@ -901,8 +1004,8 @@ class StoragePage(tb.Frame):
             tut,
             text=(
                 "1) Click Folder…\n"
-                "2) Click Scan\n"
-                "3) Double-click to open"
+                "2) Click Scan – files are compared by size, then sampled, then fully hashed\n"
+                "3) Rows with the same Set number are identical; double-click to open"
             ),
             justify=LEFT, anchor="w"
         ).pack(fill=X, padx=15, pady=5)
@@ -912,43 +1015,33 @@ class StoragePage(tb.Frame):
         self.dupes_lbl = tb.Label(sf, text="(none)")
         self.dupes_lbl.pack(side=LEFT, padx=5)
         tb.Button(sf, text="Scan", bootstyle=PRIMARY, command=self._do_duplicates).pack(side=LEFT, padx=5)
+        tb.Checkbutton(sf, text="Use hash cache", variable=self.hash_cache_var).pack(side=LEFT, padx=5)
 
-        cols = ("file","size","count")
-        tv = tb.Treeview(f, columns=cols, show="headings", selectmode="extended")
-        for c in cols:
-            tv.heading(c, text=c.title())
-        tv.pack(fill=BOTH, expand=YES, padx=12, pady=6)
-        tv.bind("<<TreeviewSelect>>", lambda _e, v=tv: self._on_tree_select(v))
-        tv.bind("<Double-1>", lambda _e: os.startfile(tv.item(tv.selection()[0])["values"][0]) if tv.selection() else None)
-        self.dupes_tv = tv
-        self._make_tree_sortable(tv)
+        cols = ("file","size","count","set")
+        self.dupes_tv = self._results_view(f, cols, numeric=("size", "count", "set"))
+        self.dupes_summary = tb.Label(f, text="")
+        self.dupes_summary.pack(fill=X, padx=12, pady=(0, 6))
 
     def _do_duplicates(self):
         root = getattr(self, "dupes_dir", None)
         if not root:
             return messagebox.showwarning("Duplicates","Pick a folder")
-        TaskWindow("Duplicates", self).start(self._dupe_worker, (root,))
-
-    def _dupe_worker(self, root, status_cb):
-        status_cb("Scanning sizes …")
-        sizes = {}
-        for base, _, files in os.walk(root):
-            for fn in files:
-                p = os.path.join(base, fn)
-                try:
-                    sz = os.path.getsize(p)
-                except Exception:
-                    continue
-                sizes.setdefault(sz, []).append(p)
+        self._start_export_task(
+            "Duplicates", self._dupe_worker, (root, self.hash_cache_var.get(), self._processes()))
+
+    def _dupe_worker(self, root, use_cache, processes, export, task):
+        with HashCache() if use_cache else nullcontext() as cache:
+            report = find_duplicates(root, cache=cache, progress=task.progress, processes=processes)
         tv = self.dupes_tv
-        self.after(0, lambda: tv.delete(*tv.get_children()))
-        status_cb("Filtering …")
-        for sz, grp in sizes.items():
-            if len(grp) < 2:
-                continue
-            for p in grp:
-                self.after(0, lambda r=(p, f"{sz/1024**2:.1f}", len(grp)): tv.insert("", "end", values=r))
-        status_cb("Done")
+        tv.clear()
+        with _ResultOut(tv, export, ("set", "path", "size", "count", "digest")) as out:
+            for n, grp in enumerate(report.groups, 1):
+                for p in grp.paths:
+                    out.add({"set": n, "path": p, "size": grp.size, "count": len(grp.paths), "digest": grp.digest},
+                            (p, f"{grp.size/1024**2:.1f}", len(grp.paths), n), (grp.size, len(grp.paths), n))
+        summary = report.summary() + out.summary()
+        self.after(0, lambda: self.dupes_summary.config(text=summary))
+        task.status(summary)
 
     # --- Empty Folders sub-tab
     def _build_empty_folders_tab(self, fm):
@@ -971,35 +1064,25 @@ class StoragePage(tb.Frame):
         tb.Button(sf, text="Scan", bootstyle=PRIMARY, command=self._do_empty_scan).pack(side=LEFT, padx=5)
 
         cols = ("folder","path")
-        tv = tb.Treeview(f, columns=cols, show="headings", selectmode="extended")
-        for c in cols:
-            tv.heading(c, text=c.title())
-        tv.pack(fill=BOTH, expand=YES, padx=12, pady=6)
-        tv
-        tv.bind("<<TreeviewSelect>>", lambda _e, v=tv: self._on_tree_select(v))
-        tv.bind("<Double-1>", lambda _e: os.startfile(tv.item(tv.selection()[0])["values"][1]) if tv.selection() else None)
-        self.empty_tv = tv
-        self._make_tree_sortable(tv)
+        self.empty_tv = self._results_view(f, cols, open_col=1)
 
     def _do_empty_scan(self):
         root = getattr(self, "empty_dir", None)
         if not root:
             return messagebox.showwarning("Empty Folders","Pick a folder")
-        TaskWindow("Empty Folders", self).start(self._empty_worker, (root,))
+        self._start_export_task("Empty Folders", self._empty_worker, (root, self._processes()))
 
-    def _empty_worker(self, root, status_cb):
+    def _empty_worker(self, root, processes, export, task):
         tv = self.empty_tv
-        self.after(0, lambda: tv.delete(*tv.get_children()))
-        status_cb("Walking …")
-        for base, dirs, _ in os.walk(root):
-            for d in dirs:
-                p = os.path.join(base, d)
-                try:
-                    if not os.listdir(p):
-                        self.after(0, lambda r=(d, p): tv.insert("", "end", values=r))
-                except Exception:
-                    pass
-        status_cb("Done")
+        tv.clear()
+        task.progress.begin("Walking …", unit="folders")
+        with DiskUsageIndex() as index:
+            res = index.update(root, progress_cb=lambda _t, scanned: task.progress.update(items=scanned),
+                               processes=processes)
+        with _ResultOut(tv, export, ("name", "path")) as out:
+            for node in empty_dirs(res.tree):
+                out.add({"name": node.name, "path": node.path}, (node.name, node.path))
+        task.status(f"Done – {res.dirs_reused} folders unchanged, {len(res.errors)} unreadable{out.summary()}")
 
     # --- Checksums sub-tab
     def _build_checksum_tab(self, fm):
@@ -1010,8 +1093,8 @@ class StoragePage(tb.Frame):
             tut,
             text=(
                 "1) Click Files… or Folder…\n"
-                "2) Click MD5 or SHA1\n"
-                "3) Double-click to open"
+                "2) Tick one or more algorithms (all are computed in one read), then click Hash\n"
+                "3) Save Manifest… writes the checksums to a .sha256 or .json file for Verify"
             ),
             justify=LEFT, anchor="w"
         ).pack(fill=X, padx=15, pady=5)
@@ -1021,57 +1104,200 @@ class StoragePage(tb.Frame):
         self.check_lbl = tb.Label(sf, text="(none)")
         self.check_lbl.pack(side=LEFT, padx=5)
 
-        cols = ("file","checksum")
-        tv = tb.Treeview(f, columns=cols, show="headings", selectmode="extended")
-        for c in cols:
-            tv.heading(c, text=c.title())
-        tv.pack(fill=BOTH, expand=YES, padx=12, pady=6)
-        tv.bind("<<TreeviewSelect>>", lambda _e, v=tv: self._on_tree_select(v))
-        tv.bind("<Double-1>", lambda _e: os.startfile(tv.item(tv.selection()[0])["values"][0]) if tv.selection() else None)
-        self.check_tv = tv
-        self._make_tree_sortable(tv)
+        cols = ("file","algorithm","checksum")
+        self.check_tv = self._results_view(f, cols)
+
+        algo_box = tb.Frame(f); algo_box.pack(pady=(4, 0))
+        self.check_algos = {}
+        for algo, text in (("md5", "MD5"), ("sha1", "SHA1"), ("sha256", "SHA-256"),
+                           ("blake2b", "BLAKE2b"), (FAST_ALGO, f"Fast ({FAST_ALGO})")):
+            if algo in ALGORITHMS:
+                self.check_algos[algo] = tk.BooleanVar(value=algo == "sha256")
+                tb.Checkbutton(algo_box, text=text, variable=self.check_algos[algo]).pack(side=LEFT, padx=6)
 
         btn_box = tb.Frame(f); btn_box.pack(pady=4)
-        tb.Button(btn_box, text="MD5",  bootstyle=PRIMARY, command=lambda: self._start_checksum("md5")).pack(side=LEFT, padx=6)
-        tb.Button(btn_box, text="SHA1", bootstyle=PRIMARY, command=lambda: self._start_checksum("sha1")).pack(side=LEFT, padx=6)
+        tb.Button(btn_box, text="Hash", bootstyle=PRIMARY, command=self._start_checksum).pack(side=LEFT, padx=6)
+        tb.Button(btn_box, text="Save Manifest…", bootstyle=SECONDARY,
+                  command=self._save_manifest).pack(side=LEFT, padx=6)
+        tb.Label(btn_box, text="Workers:").pack(side=LEFT, padx=(12, 4))
+        self.check_workers = tk.IntVar(value=DEFAULT_WORKERS)
+        tb.Spinbox(btn_box, from_=1, to=64, textvariable=self.check_workers, width=4).pack(side=LEFT)
+        tb.Label(btn_box, text="Read via:").pack(side=LEFT, padx=(12, 4))
+        self.check_read_mode = tk.StringVar(value="readinto")
+        tb.Combobox(btn_box, textvariable=self.check_read_mode, values=list(READ_MODES[:2]),
+                    width=9, state="readonly").pack(side=LEFT)
+        tb.Checkbutton(btn_box, text="Use hash cache", variable=self.hash_cache_var).pack(side=LEFT, padx=(12, 0))
 
     def _pick_checksum_files(self):
         fs = filedialog.askopenfilenames()
         if fs:
             self.check_files = list(fs)
+            self.check_root = None
             self.check_lbl.config(text=f"{len(fs)} files")
 
     def _pick_checksum_folder(self):
         d = filedialog.askdirectory()
         if not d:
             return
-        fl = []
-        for r, _, files in os.walk(d):
-            for f in files:
-                fl.append(os.path.join(r, f))
-        self.check_files = fl
-        self.check_lbl.config(text=f"{len(fl)} files")
-
-    def _start_checksum(self, mode):
+
+        def picked(files):
+            self.check_files = files
+            self.check_root = d
+            self.check_lbl.config(text=f"{len(files)} files")
+
+        TaskWindow("Listing Files", self).start(self._list_files_worker, (d,), on_done=picked)
+
+    def _list_files_worker(self, root, task):
+        task.progress.begin(f"Listing {root} …", unit="files")
+        files = []
+        for e in Walker().files(root):
+            files.append(e.path)
+            task.progress.advance()
+        task.status(f"{len(files)} files")
+        return files
+
+    def _checked_algos(self):
         if not getattr(self, "check_files", None):
-            return messagebox.showwarning("Checksum","Pick files or folder")
-        TaskWindow("Checksums", self).start(self._checksum_worker, (mode,))
+            messagebox.showwarning("Checksum","Pick files or folder")
+            return None
+        algos = tuple(a for a, var in self.check_algos.items() if var.get())
+        if not algos:
+            messagebox.showwarning("Checksum","Tick at least one algorithm")
+            return None
+        return algos
+
+    def _start_checksum(self):
+        algos = self._checked_algos()
+        if not algos:
+            return
+        self._start_export_task(
+            "Checksums", self._checksum_worker,
+            (list(self.check_files), algos, self.check_workers.get(), self.hash_cache_var.get(),
+             self.check_read_mode.get(), self._processes()),
+        )
 
-    def _checksum_worker(self, mode, status_cb):
+    def _checksum_worker(self, files, algos, workers, use_cache, read_mode, processes, export, task):
         tv = self.check_tv
-        self.after(0, lambda: tv.delete(*tv.get_children()))
-        for f in self.check_files:
-            h = hashlib.new(mode)
+        tv.clear()
+        done = nbytes = 0
+        st = time.perf_counter()
+        task.progress.begin(f"Hashing {len(files)} files …", total_items=len(files), unit="files")
+        fields = ("path",) + algos + ("size", "cached", "error")
+        with HashCache() if use_cache else nullcontext() as cache, _ResultOut(tv, export, fields) as out:
+            results = hash_files(files, algos, workers=workers, cache=cache, read_mode=read_mode,
+                                 processes=processes)
             try:
-                with open(f, "rb") as fp:
-                    for chunk in iter(lambda: fp.read(8192), b""):
-                        h.update(chunk)
-            except Exception:
-                res = (f, "ERROR")
-            else:
-                res = (f, h.hexdigest())
-            self.after(0, lambda r=res: tv.insert("", "end", values=r))
-        status_cb("Done")
+                for res in results:
+                    done += 1
+                    if not res.cached:
+                        nbytes += res.size
+                    record = {"path": res.path, "size": res.size, "cached": res.cached, "error": res.error}
+                    record.update(res.digests)
+                    if res.digest is None:
+                        out.add(record, (res.path, "", "ERROR"))
+                    for algo, digest in res.digests.items():
+                        out.add(record if algo == algos[0] else None, (res.path, algo, digest))
+                    task.progress.advance(1, 0 if res.cached else res.size)
+            finally:
+                results.close()  # stops the hashing threads on cancel
+            secs = max(time.perf_counter() - st, 0.001)
+            msg = f"{done} files, {nbytes / 1024**2:.1f} MB read – {nbytes / 1024**2 / secs:.1f} MB/s"
+            if cache is not None:
+                msg += f" | {cache.summary()}"
+        task.status(msg + out.summary())
+
+    def _save_manifest(self):
+        algos = self._checked_algos()
+        if not algos:
+            return
+        path = filedialog.asksaveasfilename(defaultextension=".sha256", filetypes=manifest.FILE_TYPES)
+        if not path:
+            return
+        files = list(self.check_files)
+        try:
+            root = self.check_root or os.path.commonpath([os.path.dirname(p) for p in files])
+            manifest.text_algo(path, algos)
+        except ValueError as exc:
+            return messagebox.showwarning("Save Manifest", str(exc))
+        TaskWindow("Manifest", self).start(
+            self._manifest_worker,
+            (root, files, algos, path, self.check_workers.get(), self.hash_cache_var.get(),
+             self.check_read_mode.get(), self._processes()),
+        )
+
+    def _manifest_worker(self, root, files, algos, path, workers, use_cache, read_mode, processes, task):
+        with HashCache() if use_cache else nullcontext() as cache:
+            m, errors = manifest.create(root, algos, files, workers=workers, processes=processes, cache=cache,
+                                        read_mode=read_mode, progress=task.progress, skip=(path,))
+        manifest.write(m, path)
+        task.status(f"{len(m.entries)} files written to {path}, {len(errors)} unreadable")
+
+    # --- Verify sub-tab
+    def _build_verify_tab(self, fm):
+        f = tb.Frame(fm); fm.add(f, text="Verify")
+        tut = tb.Labelframe(f, text="How to Use", bootstyle=INFO)
+        tut.pack(fill=X, padx=10, pady=5)
+        tk.Label(
+            tut,
+            text=(
+                "1) Click Manifest… (.sha256, .md5, .json) and the Folder… to check, e.g. a mirror or restore\n"
+                "2) Click Verify – sizes are compared first, then the files are re-read in parallel\n"
+                "3) Mismatched, missing, new and unreadable files are listed"
+            ),
+            justify=LEFT, anchor="w"
+        ).pack(fill=X, padx=15, pady=5)
+        sf = tb.Frame(f); sf.pack(fill=X, padx=12, pady=6)
+        tb.Button(sf, text="Manifest…", bootstyle=SECONDARY, command=self._pick_verify_manifest).pack(side=LEFT, padx=5)
+        self.verify_manifest_lbl = tb.Label(sf, text="(none)")
+        self.verify_manifest_lbl.pack(side=LEFT, padx=5)
+        tb.Button(sf, text="Folder…", bootstyle=SECONDARY, command=lambda: self._set_dir("verify_dir", sf)).pack(side=LEFT, padx=5)
+        self.verify_lbl = tb.Label(sf, text="(none)")
+        self.verify_lbl.pack(side=LEFT, padx=5)
+        self.verify_all = tk.BooleanVar(value=False)
+        tb.Checkbutton(sf, text="List matching files too", variable=self.verify_all).pack(side=LEFT, padx=10)
+        tb.Button(sf, text="Verify", bootstyle=PRIMARY, command=self._do_verify).pack(side=LEFT, padx=5)
+
+        cols = ("file","status","expected","found")
+        self.verify_tv = self._results_view(f, cols)
+
+    def _pick_verify_manifest(self):
+        path = filedialog.askopenfilename(filetypes=manifest.FILE_TYPES)
+        if path:
+            self.verify_manifest = path
+            self.verify_manifest_lbl.config(text=os.path.basename(path))
+
+    def _do_verify(self):
+        path = getattr(self, "verify_manifest", None)
+        if not path:
+            return messagebox.showwarning("Verify","Pick a manifest")
+        root = getattr(self, "verify_dir", None)
+        self._start_export_task(
+            "Verify", self._verify_worker,
+            (path, root, self.verify_all.get(), self.check_workers.get(), self.check_read_mode.get(),
+             self._processes()),
+        )
+
+    def _verify_worker(self, path, root, show_ok, workers, read_mode, processes, export, task):
+        tv = self.verify_tv
+        tv.clear()
+        m = manifest.read(path)
+        root = root or manifest.default_root(m, path)
+        report = manifest.VerifyReport()
+        items = manifest.verify(m, root, workers=workers, processes=processes, read_mode=read_mode,
+                                progress=task.progress, report=report, skip=(path,))
+        fields = ("status", "path", "expected", "actual", "detail")
+        with _ResultOut(tv, export, fields) as out:
+            try:
+                for item in items:
+                    if item.status == "ok" and not show_ok:
+                        continue
+                    full = os.path.join(root, item.path.replace("/", os.sep))
+                    out.add({"status": item.status, "path": full, "expected": item.expected,
+                             "actual": item.actual, "detail": item.detail},
+                            (full, item.status, item.expected or "", item.actual or item.detail))
+            finally:
+                items.close()
+        task.status(report.summary() + out.summary())
 
     # ------------------ ROBOCOPY Danger Tab ------------------
     def _build_robocopy_danger(self, nb):
@@ -1105,10 +1331,10 @@ class StoragePage(tb.Frame):
 
         frm = tb.Frame(tab); frm.pack(fill=X, padx=12, pady=6)
         tb.Label(frm, text="Source Drive:").pack(side=LEFT)
-        self.robocopy_src = tb.Combobox(frm, values=self._list_drive_letters(), width=10)
+        self.robocopy_src = tb.Combobox(frm, width=10)  # filled by _ov_show
         self.robocopy_src.pack(side=LEFT, padx=5)
         tb.Label(frm, text="Destination Drive:").pack(side=LEFT, padx=(10,0))
-        self.robocopy_dst = tb.Combobox(frm, values=self._list_drive_letters(), width=10)
+        self.robocopy_dst = tb.Combobox(frm, width=10)
         self.robocopy_dst.pack(side=LEFT, padx=5)
 
         phrase_box = tb.Frame(tab); phrase_box.pack(fill=X, padx=12, pady=(4,2))
@@ -1118,9 +1344,6 @@ class StoragePage(tb.Frame):
 
         tb.Button(tab, text="Start Robocopy", bootstyle=DANGER, command=self._verify_robocopy).pack(pady=10)
 
-    def _list_drive_letters(self):
-        return [p.device.rstrip("\\") for p in psutil.disk_partitions(all=False)]
-
     def _verify_robocopy(self):
         src, dst = self.robocopy_src.get(), self.robocopy_dst.get()
         if not src or not dst:
@@ -1139,10 +1362,16 @@ class StoragePage(tb.Frame):
                 return
         TaskWindow(f"Copy {src} → {dst}", self).start(self._drive_copy_worker, (src, dst))
 
-    def _drive_copy_worker(self, src, dst, status_cb):
-        status_cb("Starting robocopy …")
+    def _drive_copy_worker(self, src, dst, task):
+        task.status("Starting robocopy …")
         cmd = ["robocopy", f"{src}\\", f"{dst}\\", "/MIR", "/R:1", "/W:1"]
-        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-        for ln in proc.stdout.splitlines():
-            status_cb(ln.strip())
-        status_cb("Done – review log for errors.")
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        try:
+            for ln in proc.stdout:
+                if ln.strip():
+                    task.status(ln.strip())
+        finally:
+            if proc.poll() is None:
+                proc.terminate()
+            proc.wait()
+        task.status("Done – review log for errors.")
@@ -1,15 +1,19 @@
-import platform
-import psutil
-import socket
-import uuid
+import os
 import datetime
 import ttkbootstrap as tb
 from ttkbootstrap.constants import *
 
+from pages.task_window import run_in_background
+from toolkit import sysinfo
+from toolkit.tasks import TaskExecutor
+
+GB = 1024**3
+
 class SystemInfoPage(tb.Frame):
     """
     Live system info updating every second.
     Tabs: General, CPU, Memory, Disk, Network, Users.
+    Each update is a toolkit.sysinfo snapshot taken off the UI thread.
     """
     def __init__(self, master):
         super().__init__(master)
@@ -33,7 +37,8 @@ class SystemInfoPage(tb.Frame):
         self._build_network(self.tabs["Network"])
         self._build_users(self.tabs["Users"])
 
-        # Start live update
+        # Start live update; own worker so long scans elsewhere don't stall it
+        self.executor = TaskExecutor(max_workers=1)
         self._update_all()
 
     def _add_row(self, parent, title, colspan=1):
@@ -74,76 +79,76 @@ class SystemInfoPage(tb.Frame):
         self.disk_usage_lbl = self._add_row(parent, "Total/Used/Free (GB)")
 
     def _build_network(self, parent):
-        # List each iface in separate labeled frame
+        # one labeled frame per iface, added as interfaces appear
+        self.net_parent = parent
         self.net_frames = {}
-        for iface in psutil.net_if_addrs():
-            grp = tb.Labelframe(parent, text=iface)
+
+    def _net_rows(self, iface):
+        if iface not in self.net_frames:
+            grp = tb.Labelframe(self.net_parent, text=iface)
             grp.pack(fill=X, pady=4, padx=5)
             addr_lbl = self._add_row(grp, "Addresses")
             stats_lbl= self._add_row(grp, "Stats (speed/mtu)")
             io_lbl   = self._add_row(grp, "I/O (KB sent/recv)")
             self.net_frames[iface] = (addr_lbl, stats_lbl, io_lbl)
+        return self.net_frames[iface]
 
     def _build_users(self, parent):
         self.users_lbl = self._add_row(parent, "Logged In Users")
 
-    def _get_mac(self):
-        mac = uuid.getnode()
-        return ':'.join(f"{(mac>>ele)&0xff:02x}" for ele in range(40,-8,-8))
-
     def _update_all(self):
-        now = datetime.datetime.now()
+        run_in_background(self, self._snapshot_worker, on_done=self._show, on_error=self._retry,
+                          executor=self.executor)
+
+    def _snapshot_worker(self, task):
+        return sysinfo.snapshot()
+
+    def _retry(self, _exc):
+        self.after(1000, self._update_all)
+
+    def _show(self, info):
         # General
-        uname = platform.uname()
-        self.node_lbl.config(text=uname.node)
-        self.system_lbl.config(text=uname.system)
-        self.release_lbl.config(text=uname.release)
-        self.version_lbl.config(text=uname.version)
-        self.machine_lbl.config(text=uname.machine)
-        self.processor_lbl.config(text=uname.processor)
-        self.arch_lbl.config(text=' '.join(platform.architecture()))
-        self.python_lbl.config(text=platform.python_version())
-        self.mac_lbl.config(text=self._get_mac())
-        self.uuid_lbl.config(text=str(uuid.UUID(int=uuid.getnode())))
-        bt = datetime.datetime.fromtimestamp(psutil.boot_time())
-        self.boot_lbl.config(text=bt.strftime('%Y-%m-%d %H:%M:%S'))
-        up = now - bt
-        self.uptime_lbl.config(text=str(up).split('.')[0])
+        self.node_lbl.config(text=info["node"])
+        self.system_lbl.config(text=info["system"])
+        self.release_lbl.config(text=info["release"])
+        self.version_lbl.config(text=info["version"])
+        self.machine_lbl.config(text=info["machine"])
+        self.processor_lbl.config(text=info["processor"])
+        self.arch_lbl.config(text=info["architecture"])
+        self.python_lbl.config(text=info["python"])
+        self.mac_lbl.config(text=info["mac"])
+        self.uuid_lbl.config(text=info["uuid"])
+        if "boot_time" not in info:  # no psutil
+            return
+        self.boot_lbl.config(text=info["boot_time"].replace("T", " "))
+        self.uptime_lbl.config(text=str(datetime.timedelta(seconds=info["uptime_s"])))
         # CPU
-        phy = psutil.cpu_count(False); log = psutil.cpu_count(True)
-        self.cpu_phy_lbl.config(text=f"{phy}/{log}")
-        freq = psutil.cpu_freq()
-        if freq: fmt = f"{freq.min:.0f}/{freq.max:.0f}/{freq.current:.0f}"
+        self.cpu_phy_lbl.config(text=f"{info['cpu_physical']}/{info['cpu_logical']}")
+        freq = info.get("cpu_mhz")
+        if freq: fmt = f"{freq['min']:.0f}/{freq['max']:.0f}/{freq['current']:.0f}"
         else: fmt = "N/A"
         self.freq_lbl.config(text=fmt)
-        self.usage_lbl.config(text=f"{psutil.cpu_percent(None)}")
-        ct = psutil.cpu_times()
-        self.cpu_times_lbl.config(text=f"{ct.user:.1f}/{ct.system:.1f}/{ct.idle:.1f}")
-        self.ctx_lbl.config(text=f"{psutil.cpu_stats().ctx_switches}")
+        self.usage_lbl.config(text=f"{info['cpu_percent']}")
+        ct = info["cpu_times"]
+        self.cpu_times_lbl.config(text=f"{ct['user']:.1f}/{ct['system']:.1f}/{ct['idle']:.1f}")
+        self.ctx_lbl.config(text=f"{info['ctx_switches']}")
         # Memory
-        vm = psutil.virtual_memory()
-        self.ram_lbl.config(text=f"{vm.total//(1024**3)}GB/{vm.percent}")
-        sm = psutil.swap_memory()
-        self.swap_lbl.config(text=f"{sm.total//(1024**3)}GB/{sm.percent}")
-        # Disk
-        parts = psutil.disk_partitions()
-        mounts = ', '.join(p.mountpoint for p in parts)
-        self.disk_parts_lbl.config(text=mounts)
-        du = psutil.disk_usage('/')
-        self.disk_usage_lbl.config(text=f"{du.total//(1024**3)}/{du.used//(1024**3)}/{du.free//(1024**3)}")
+        self.ram_lbl.config(text=f"{info['ram']['total']//GB}GB/{info['ram']['percent']}")
+        self.swap_lbl.config(text=f"{info['swap']['total']//GB}GB/{info['swap']['percent']}")
+        # Disk: partitions, and usage of the system drive
+        disks = info["disks"]
+        self.disk_parts_lbl.config(text=', '.join(d["mount"] for d in disks))
+        root = os.path.abspath(os.sep)
+        du = next((d for d in disks if d["mount"] == root and "total" in d), None)
+        if du:
+            self.disk_usage_lbl.config(text=f"{du['total']//GB}/{du['used']//GB}/{du['free']//GB}")
         # Network
-        stats = psutil.net_if_stats(); addrs = psutil.net_if_addrs(); io = psutil.net_io_counters()
-        for iface, (addr_lbl, stats_lbl, io_lbl) in self.net_frames.items():
-            # addresses
-            ips = [f"{a.address}/{a.netmask}" for a in addrs.get(iface,[]) if a.family==socket.AF_INET]
-            addr_lbl.config(text=', '.join(ips) or 'N/A')
-            # stats
-            st = stats.get(iface)
-            if st: stats_lbl.config(text=f"{st.speed}Mb/ {st.mtu}")
-            # I/O totals
-            io_lbl.config(text=f"{io.bytes_sent//1024}/{io.bytes_recv//1024}")
+        for iface, nic in info["network"].items():
+            addr_lbl, stats_lbl, io_lbl = self._net_rows(iface)
+            addr_lbl.config(text=', '.join(nic["addresses"]) or 'N/A')
+            if nic["speed_mb"] is not None: stats_lbl.config(text=f"{nic['speed_mb']}Mb/ {nic['mtu']}")
+            io_lbl.config(text=f"{nic['bytes_sent']//1024}/{nic['bytes_recv']//1024}")
         # Users
-        users = psutil.users()
-        self.users_lbl.config(text=', '.join(u.name for u in users) or 'None')
+        self.users_lbl.config(text=', '.join(info["users"]) or 'None')
         # Refresh every second
         self.after(1000, self._update_all)
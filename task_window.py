@@ -0,0 +1,133 @@
+# pages/task_window.py
+"""
+Progress window for a background task.
+
+The worker runs on the shared ``toolkit.tasks`` executor; this window only
+polls the task every POLL_MS, so a worker that reports status thousands of
+times a second still costs a handful of Tk updates. The bar is
+indeterminate until the worker announces a total. Cancel asks the worker
+to stop at its next check; closing the window does the same. ``on_done``
+applies a finished task's result on the Tk thread.
+
+``run_in_background`` is the windowless variant for loads a page starts on
+its own, such as filling a list when it is first shown.
+"""
+import tkinter as tk
+import ttkbootstrap as tb
+from ttkbootstrap.constants import *
+
+from toolkit.tasks import CANCELLED, DONE, FAILED, QUEUED, default_executor
+
+_STEPS = 1000
+
+
+class TaskWindow(tk.Toplevel):
+    POLL_MS = 100
+
+    def __init__(self, title: str, parent: tk.Misc, executor=None) -> None:
+        super().__init__(parent)
+        self.title(title)
+        self.geometry("440x150")
+        self.resizable(False, False)
+        self.executor = executor or default_executor()
+        self.task = None
+        self.on_done = None
+        self.progress = tb.Progressbar(self, mode="indeterminate", maximum=_STEPS)
+        self.progress.pack(fill=X, padx=20, pady=(18, 5))
+        self.status = tb.Label(self, text="Starting …")
+        self.status.pack(fill=X, padx=20)
+        self.detail = tb.Label(self, text="", bootstyle=SECONDARY)
+        self.detail.pack(fill=X, padx=20)
+        self.button = tb.Button(self, text="Cancel", bootstyle=DANGER, command=self._on_button)
+        self.button.pack(side=RIGHT, padx=20, pady=8)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    def start(self, fn, args: tuple = (), on_done=None):
+        """Queue ``fn(*args, task=task)`` and return the task; ``on_done(result)`` runs if it succeeds."""
+        self.on_done = on_done
+        self.task = self.executor.submit(fn, args, name=self.title())
+        self.progress.start()
+        self._poll()
+        return self.task
+
+    def _set_determinate(self, determinate: bool) -> None:
+        mode = "determinate" if determinate else "indeterminate"
+        if str(self.progress.cget("mode")) != mode:
+            self.progress.stop()
+            self.progress.config(mode=mode, value=0)
+            if not determinate:
+                self.progress.start()
+
+    def _poll(self) -> None:
+        task = self.task
+        try:
+            if task.finished:
+                self._finish()
+                return
+            snap = task.progress.snapshot()
+            if task.state == QUEUED:
+                self.status.config(text="Waiting for another task to finish …")
+            else:
+                self.status.config(text=task.message or "Working …")
+            frac = snap.fraction
+            self._set_determinate(frac is not None)
+            if frac is not None:
+                self.progress.config(value=frac * _STEPS)
+            self.detail.config(text=snap.describe() if snap.items or snap.bytes else "")
+            self.after(self.POLL_MS, self._poll)
+        except tk.TclError:
+            pass  # window closed
+
+    def _finish(self) -> None:
+        task = self.task
+        self._set_determinate(True)
+        if task.state == DONE:
+            self.progress.config(value=_STEPS)
+            self.status.config(text=task.message or "Done")
+        elif task.state == CANCELLED:
+            self.status.config(text="Cancelled")
+        elif task.state == FAILED:
+            self.status.config(text=f"Error: {task.error}")
+        self.detail.config(text=f"Finished in {task.elapsed:.1f} s")
+        self.button.config(text="Close", bootstyle=SECONDARY, state=NORMAL)
+        if task.state == DONE and self.on_done is not None:
+            self.on_done(task.result)
+
+    def _on_button(self) -> None:
+        if self.task is None or self.task.finished:
+            self.destroy()
+            return
+        self.task.cancel()
+        self.button.config(text="Cancelling …", state=DISABLED)
+
+    def _on_close(self) -> None:
+        if self.task is not None:
+            self.task.cancel()
+        self.destroy()
+
+
+def run_in_background(widget: tk.Misc, fn, args: tuple = (), on_done=None, on_error=None, executor=None):
+    """
+    Queue ``fn(*args, task=task)`` without a window. ``on_done(result)`` or
+    ``on_error(exc)`` runs on the Tk thread once it finishes; the task is
+    cancelled if ``widget`` is destroyed first.
+    """
+    task = (executor or default_executor()).submit(fn, args, name=fn.__name__)
+
+    def poll():
+        try:
+            if not widget.winfo_exists():
+                task.cancel()
+                return
+        except tk.TclError:
+            task.cancel()
+            return
+        if not task.finished:
+            widget.after(TaskWindow.POLL_MS, poll)
+        elif task.state == DONE and on_done:
+            on_done(task.result)
+        elif task.state == FAILED and on_error:
+            on_error(task.error)
+
+    widget.after(TaskWindow.POLL_MS, poll)
+    return task
@@ -0,0 +1,17 @@
+# tests/test_cli.py
+import pytest
+
+from toolkit.cli import EXIT_FAILED, EXIT_USAGE, main
+
+
+def test_bad_argument_is_a_usage_error():
+    with pytest.raises(SystemExit) as exc:
+        main(["net", "ports", "127.0.0.1", "70000"])
+    assert exc.value.code == EXIT_USAGE
+
+
+def test_runtime_value_error_is_a_failure(tmp_path, capsys):
+    bad = tmp_path / "bad.sha256"
+    bad.write_text("garbage line\n")
+    assert main(["manifest", "verify", str(bad), str(tmp_path)]) == EXIT_FAILED
+    assert "not a checksum line" in capsys.readouterr().out
@@ -0,0 +1,54 @@
+# tests/test_duindex.py
+import os
+
+from toolkit.duindex import DiskUsageIndex, empty_dirs
+
+
+def _tree(tmp_path):
+    root = tmp_path / "root"
+    (root / "a" / "b").mkdir(parents=True)
+    (root / "c").mkdir()
+    (root / "a" / "f1").write_bytes(b"x" * 10)
+    (root / "a" / "b" / "f2").write_bytes(b"x" * 5)
+    (root / "top").write_bytes(b"x" * 3)
+    return root
+
+
+def _bump_mtime(path):
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def test_load_returns_the_saved_tree(tmp_path):
+    root = _tree(tmp_path)
+    with DiskUsageIndex(str(tmp_path / "du.sqlite")) as index:
+        assert index.load(str(root)) is None
+        scanned = index.update(str(root), workers=2).tree
+    with DiskUsageIndex(str(tmp_path / "du.sqlite")) as index:
+        loaded = index.load(str(root))
+    assert (loaded.total_size, loaded.total_files) == (18, 3)
+    assert sorted(loaded.children) == ["a", "c"]
+    assert loaded.find(str(root / "a" / "b")).total_size == 5
+    assert sorted(n.path for n in loaded.walk()) == sorted(n.path for n in scanned.walk())
+    assert [n.name for n in empty_dirs(loaded)] == ["c"]
+
+
+def test_unchanged_folders_are_reused(tmp_path):
+    root = _tree(tmp_path)
+    with DiskUsageIndex(str(tmp_path / "du.sqlite")) as index:
+        first = index.update(str(root), workers=2)
+        assert (first.dirs_scanned, first.dirs_reused) == (4, 0)
+
+        again = index.update(str(root), workers=2)
+        assert (again.dirs_scanned, again.dirs_reused) == (0, 4)
+        assert again.tree.total_size == 18
+
+        (root / "a" / "f3").write_bytes(b"x" * 100)
+        _bump_mtime(root / "a")
+        changed = index.update(str(root), workers=2)
+        assert (changed.dirs_scanned, changed.dirs_reused) == (1, 3)
+        assert changed.tree.find(str(root / "a")).total_size == 115
+
+        full = index.update(str(root), full=True, workers=2)
+        assert (full.dirs_scanned, full.dirs_reused) == (4, 0)
+        assert full.tree.total_size == 118
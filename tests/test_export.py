@@ -0,0 +1,17 @@
+# tests/test_export.py
+import pytest
+
+from toolkit.export import ParquetSink
+
+
+def test_parquet_column_empty_in_first_batch(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "out.parquet")
+    sink = ParquetSink(path, batch_rows=2)
+    for record in ({"size": 1, "owner": None}, {"size": 2, "owner": None},
+                   {"size": 3, "owner": "alice"}, {"size": 4, "owner": None}):
+        sink.write(record)
+    sink.close()
+    table = pq.read_table(path)
+    assert str(table.schema.field("owner").type) == "string"
+    assert table.to_pydict() == {"size": [1, 2, 3, 4], "owner": [None, None, "alice", None]}
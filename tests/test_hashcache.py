@@ -0,0 +1,63 @@
+# tests/test_hashcache.py
+import os
+
+from toolkit import hashcache
+from toolkit.hashcache import HashCache, signature
+
+
+def _sig(path):
+    return signature(os.stat(path))
+
+
+def test_hit_while_file_unchanged(tmp_path):
+    f = tmp_path / "a.bin"
+    f.write_bytes(b"hello")
+    with HashCache(str(tmp_path / "cache.sqlite")) as cache:
+        assert cache.get(str(f), "sha256", _sig(f)) is None
+        cache.put(str(f), "sha256", _sig(f), "d1")
+    with HashCache(str(tmp_path / "cache.sqlite")) as cache:
+        assert cache.get(str(f), "sha256", _sig(f)) == "d1"
+        assert (cache.hits, cache.misses) == (1, 0)
+
+
+def test_miss_after_rewrite(tmp_path):
+    f = tmp_path / "a.bin"
+    f.write_bytes(b"hello")
+    with HashCache(str(tmp_path / "cache.sqlite")) as cache:
+        cache.put(str(f), "sha256", _sig(f), "d1")
+        f.write_bytes(b"hello, world")
+        assert cache.get(str(f), "sha256", _sig(f)) is None
+        st = os.stat(f)
+        os.utime(f, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))  # same size, new mtime
+        cache.put(str(f), "sha256", _sig(f), "d2")
+        os.utime(f, ns=(st.st_atime_ns, st.st_mtime_ns + 2 * 10**9))
+        assert cache.get(str(f), "sha256", _sig(f)) is None
+
+
+def test_entries_are_per_path_and_algorithm(tmp_path):
+    with HashCache(str(tmp_path / "cache.sqlite")) as cache:
+        sig = (5, 1, 1)
+        cache.put("a", "sha256", sig, "a-sha")
+        cache.put("a", "md5", sig, "a-md5")
+        cache.put("b", "sha256", sig, "b-sha")
+        assert cache.get("a", "sha256", sig) == "a-sha"
+        assert cache.get("a", "md5", sig) == "a-md5"
+        assert cache.get("b", "sha256", sig) == "b-sha"
+        assert cache.get("b", "md5", sig) is None
+
+
+def test_least_recently_used_evicted_on_close(tmp_path, monkeypatch):
+    db = str(tmp_path / "cache.sqlite")
+    sig = (5, 1, 1)
+    monkeypatch.setattr(hashcache.time, "time", lambda: 100.0)
+    with HashCache(db) as cache:
+        cache.put("a", "sha256", sig, "da")
+        cache.put("b", "sha256", sig, "db")
+    monkeypatch.setattr(hashcache.time, "time", lambda: 200.0)
+    with HashCache(db, max_entries=2) as cache:
+        assert cache.get("a", "sha256", sig) == "da"  # a is used again, b is not
+        cache.put("c", "sha256", sig, "dc")
+    with HashCache(db) as cache:
+        assert cache.get("a", "sha256", sig) == "da"
+        assert cache.get("b", "sha256", sig) is None
+        assert cache.get("c", "sha256", sig) == "dc"
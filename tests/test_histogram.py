@@ -0,0 +1,57 @@
+# tests/test_histogram.py
+import random
+
+import pytest
+
+from toolkit.histogram import LatencyHistogram
+
+
+def test_buckets_tile_the_range():
+    h = LatencyHistogram()
+    prev_high = -1
+    for i in range(h.sub * 20):
+        low, high = h._bounds(i)
+        assert low == prev_high + 1
+        prev_high = high
+
+
+@pytest.mark.parametrize("value", [0, 1, 31, 63, 64, 65, 1000, 123_456, 10**9, 2**62 + 12345])
+def test_value_falls_in_its_bucket_within_precision(value):
+    h = LatencyHistogram()
+    low, high = h._bounds(h._index(value))
+    assert low <= value <= high
+    assert high - low + 1 <= max(1, low // h.sub)  # about 3 % at 5 bits
+
+
+def test_small_values_are_exact():
+    h = LatencyHistogram()
+    for v in range(1, 61):
+        h.record(v)
+    assert (h.percentile(50), h.percentile(90), h.percentile(100)) == (30, 54, 60)
+    assert (h.min, h.max, h.mean) == (1, 60, 30.5)
+
+
+def test_percentiles_within_bucket_precision():
+    rnd = random.Random(3)
+    values = sorted(rnd.randint(1_000, 5_000_000) for _ in range(20_000))
+    h = LatencyHistogram()
+    for v in values:
+        h.record(v)
+    for p in (50, 90, 99, 99.9):
+        exact = values[int(-(-len(values) * p // 100)) - 1]
+        got = h.percentile(p)
+        assert exact <= got <= exact * (1 + 2 / h.sub)
+    assert h.percentile(100) == values[-1]
+
+
+def test_merge_adds_counts():
+    a, b = LatencyHistogram(), LatencyHistogram()
+    for v in (5, 10, 15):
+        a.record(v)
+    for v in (1, 100):
+        b.record(v)
+    a.merge(b)
+    assert (a.count, a.min, a.max, a.total) == (5, 1, 100, 131)
+    assert [c for _low, _high, c in a.buckets()] == [1, 1, 1, 1, 1]
+    with pytest.raises(ValueError):
+        a.merge(LatencyHistogram(sub_bits=4))
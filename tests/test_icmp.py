@@ -0,0 +1,55 @@
+# tests/test_icmp.py
+import threading
+import time
+
+from toolkit.icmp import _ApiPinger
+
+
+def _pinger(workers, delay):
+    """An _ApiPinger whose echoes take ``delay`` and never reach the OS."""
+    pinger = object.__new__(_ApiPinger)
+    pinger.workers = workers
+    lock = threading.Lock()
+    pinger.in_flight = pinger.peak = 0
+
+    def ping(ip, timeout):
+        with lock:
+            pinger.in_flight += 1
+            pinger.peak = max(pinger.peak, pinger.in_flight)
+        time.sleep(delay)
+        with lock:
+            pinger.in_flight -= 1
+        return 1.0
+
+    pinger.ping = ping
+    return pinger
+
+
+def test_api_ping_many_bounds_echoes_in_flight():
+    pinger = _pinger(workers=4, delay=0.02)
+    ips = [f"10.0.0.{i}" for i in range(40)]
+    replies = list(pinger.ping_many(ips, rate=0))
+    assert sorted(ip for ip, _rtt in replies) == sorted(ips)
+    assert pinger.peak <= 4
+
+
+def test_api_ping_many_reads_addresses_lazily():
+    pinger = _pinger(workers=2, delay=0.01)
+    taken = []
+
+    def ips():
+        for i in range(20):
+            taken.append(i)
+            yield f"10.0.0.{i}"
+
+    replies = pinger.ping_many(ips(), rate=0)
+    next(replies)
+    assert len(taken) <= 3
+    replies.close()
+
+
+def test_api_ping_many_paced_by_rate():
+    pinger = _pinger(workers=64, delay=0.0)
+    start = time.perf_counter()
+    list(pinger.ping_many([f"10.0.0.{i}" for i in range(11)], rate=100))
+    assert time.perf_counter() - start >= 0.09
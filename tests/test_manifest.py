@@ -0,0 +1,82 @@
+# tests/test_manifest.py
+import hashlib
+import shutil
+import subprocess
+
+import pytest
+
+from toolkit import manifest
+from toolkit.manifest import Entry, Manifest
+
+
+def _tree(tmp_path):
+    root = tmp_path / "root"
+    (root / "sub").mkdir(parents=True)
+    (root / "a.txt").write_bytes(b"alpha")
+    (root / "sub" / "b.txt").write_bytes(b"bravo")
+    (root / "sub" / "c.txt").write_bytes(b"charlie")
+    (root / "d.txt").write_bytes(b"delta")
+    return root
+
+
+def _statuses(m, root):
+    return {item.path: item.status for item in manifest.verify(m, str(root), workers=2)}
+
+
+def test_text_manifest_is_sha256sum_format(tmp_path):
+    root = _tree(tmp_path)
+    m, errors = manifest.create(str(root), "sha256", workers=2)
+    assert not errors
+    path = tmp_path / "tree.sha256"
+    manifest.write(m, str(path))
+    expected = "".join(f"{hashlib.sha256((root / rel).read_bytes()).hexdigest()}  {rel}\n"
+                       for rel in ("a.txt", "d.txt", "sub/b.txt", "sub/c.txt"))
+    assert path.read_text(encoding="utf-8") == expected
+    if shutil.which("sha256sum"):
+        subprocess.run(["sha256sum", "--quiet", "-c", str(path)], cwd=root, check=True)
+    back = manifest.read(str(path))
+    assert back.algos == ("sha256",)
+    assert [(e.path, e.digests) for e in back.entries] == [(e.path, e.digests) for e in m.entries]
+
+
+def test_read_accepts_binary_marker_and_escaped_names(tmp_path):
+    path = tmp_path / "list.txt"
+    digest = "0" * 64
+    path.write_text(f"{digest} *bin.dat\n\\{digest}  dir\\\\name\\nx\n", encoding="utf-8")
+    m = manifest.read(str(path))
+    assert m.algos == ("sha256",)
+    assert [e.path for e in m.entries] == ["bin.dat", "dir\\name\nx"]
+    out = tmp_path / "again.sha256"
+    manifest.write(Manifest(("sha256",), m.entries), str(out))
+    assert [e.path for e in manifest.read(str(out)).entries] == ["bin.dat", "dir\\name\nx"]
+
+
+def test_read_rejects_a_malformed_line(tmp_path):
+    path = tmp_path / "bad.sha256"
+    path.write_text("garbage\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        manifest.read(str(path))
+
+
+def test_verify_reports_new_missing_and_mismatched_files(tmp_path):
+    root = _tree(tmp_path)
+    m, _errors = manifest.create(str(root), ("sha256", "md5"), workers=2)
+    path = tmp_path / "tree.json"
+    manifest.write(m, str(path))
+    m = manifest.read(str(path))
+    assert _statuses(m, root) == dict.fromkeys(["a.txt", "d.txt", "sub/b.txt", "sub/c.txt"], "ok")
+
+    (root / "a.txt").write_bytes(b"ALPHA")  # same size, other bytes
+    (root / "d.txt").write_bytes(b"delta, longer")  # size differs: no hashing needed
+    (root / "sub" / "b.txt").unlink()
+    (root / "sub" / "e.txt").write_bytes(b"echo")
+    report = manifest.VerifyReport()
+    items = {item.path: item for item in manifest.verify(m, str(root), "md5", workers=2, report=report)}
+    assert {p: item.status for p, item in items.items()} == {
+        "a.txt": "mismatch", "d.txt": "mismatch", "sub/b.txt": "missing",
+        "sub/c.txt": "ok", "sub/e.txt": "new",
+    }
+    assert items["a.txt"].actual == hashlib.md5(b"ALPHA").hexdigest()
+    assert items["d.txt"].actual is None
+    assert report.algo == "md5"
+    assert report.problems == 4
@@ -0,0 +1,30 @@
+# tests/test_nameindex.py
+import fnmatch
+import os
+
+from toolkit.nameindex import NameIndex
+
+NAMES = ["big1.bin", "big2.bin", "big3.bin", "bigger.txt", "file7.txt", "filex.txt", "abc.log"]
+
+
+def _index(tmp_path):
+    for name in NAMES:
+        (tmp_path / name).write_bytes(b"x")
+    return NameIndex.build(str(tmp_path))
+
+
+def _glob(idx, pattern):
+    return sorted(os.path.basename(h.path) for h in idx.query(pattern, mode="glob"))
+
+
+def test_glob_bracket_class_matches_like_fnmatch(tmp_path):
+    idx = _index(tmp_path)
+    for pattern in ("big[0-9]*", "file[0-9].txt", "*[abc]*", "big[!2].bin", "[]b]ig1.bin"):
+        assert _glob(idx, pattern) == sorted(fnmatch.filter(NAMES, pattern)), pattern
+    assert _glob(idx, "big[0-9]*") == ["big1.bin", "big2.bin", "big3.bin"]
+
+
+def test_glob_unclosed_bracket_is_literal(tmp_path):
+    (tmp_path / "a[b.txt").write_bytes(b"x")
+    idx = NameIndex.build(str(tmp_path))
+    assert _glob(idx, "a[b*") == ["a[b.txt"]
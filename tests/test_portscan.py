@@ -0,0 +1,27 @@
+# tests/test_portscan.py
+import pytest
+
+from toolkit.portscan import RttEstimator
+
+
+def test_timeout_before_any_sample():
+    assert RttEstimator(2.0, 0.05).timeout == 2.0
+
+
+def test_timeout_follows_rfc6298():
+    est = RttEstimator(2.0, 0.05)
+    est.add(0.1)  # srtt 0.1, rttvar 0.05
+    assert est.timeout == pytest.approx(0.1 + 4 * 0.05)
+    est.add(0.2)  # rttvar 0.75*0.05 + 0.25*0.1, srtt 0.875*0.1 + 0.125*0.2
+    assert est.srtt == pytest.approx(0.1125)
+    assert est.rttvar == pytest.approx(0.0625)
+    assert est.timeout == pytest.approx(0.1125 + 4 * 0.0625)
+
+
+def test_timeout_kept_between_minimum_and_initial():
+    est = RttEstimator(1.0, 0.05)
+    est.add(0.001)
+    assert est.timeout == 0.05
+    est = RttEstimator(1.0, 0.05)
+    est.add(0.5)
+    assert est.timeout == 1.0
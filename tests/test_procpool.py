@@ -0,0 +1,15 @@
+# tests/test_procpool.py
+import os
+
+from toolkit import procpool
+
+
+def _pids(chunk):
+    return [os.getpid() for _ in chunk]
+
+
+def test_processes_capped(monkeypatch):
+    monkeypatch.setattr(procpool, "MAX_PROCESSES", 2)
+    assert procpool._capped(64) == 2
+    pids = set(procpool.pool_map(_pids, range(200), processes=64, chunk_items=1))
+    assert 1 <= len(pids) <= 2
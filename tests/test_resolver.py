@@ -0,0 +1,57 @@
+# tests/test_resolver.py
+import socket
+
+import pytest
+
+from toolkit.resolver import Resolver
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Names passed to a fake getaddrinfo: "up.test" resolves, "slow.test"
+    fails for now and any other name does not exist."""
+    seen = []
+
+    def getaddrinfo(host, port, type=0):
+        seen.append(host)
+        if host == "slow.test":
+            raise socket.gaierror(socket.EAI_AGAIN, "temporary failure")
+        if host != "up.test":
+            raise socket.gaierror(socket.EAI_NONAME, "no such name")
+        return [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("192.0.2.1", 0))]
+
+    monkeypatch.setattr(socket, "getaddrinfo", getaddrinfo)
+    return seen
+
+
+def test_answers_are_cached(calls):
+    r = Resolver()
+    assert r.addresses("up.test") == ["192.0.2.1"]
+    assert r.addresses("up.test") == ["192.0.2.1"]
+    assert calls == ["up.test"]
+    (hit,) = r.lookup_many(["up.test"])
+    assert hit.cached and hit.answers == ["192.0.2.1"]
+
+
+def test_missing_names_are_cached_but_temporary_failures_are_not(calls):
+    r = Resolver()
+    for _ in range(2):
+        with pytest.raises(OSError):
+            r.lookup("gone.test")
+        with pytest.raises(OSError):
+            r.lookup("slow.test")
+    assert calls == ["gone.test", "slow.test", "slow.test"]
+
+
+def test_cache_entries_expire(calls):
+    r = Resolver(ttl=0.0)
+    r.lookup("up.test")
+    r.lookup("up.test")
+    assert calls == ["up.test", "up.test"]
+
+
+def test_resolve_all_reports_a_malformed_name_per_host():
+    long_label = "a" * 70 + ".com"
+    addrs, failed = Resolver().resolve_all(["127.0.0.1", long_label])
+    assert list(addrs) == ["127.0.0.1"]
+    assert [name for name, _error in failed] == [long_label]
@@ -0,0 +1,45 @@
+# tests/test_table.py
+import random
+
+from toolkit.table import ResultTable
+
+
+def _batches(n, size, seed=1):
+    rnd = random.Random(seed)
+    rows = [((rnd.choice("abcde") * rnd.randint(1, 3), str(v)), [float(v)])
+            for v in (rnd.randint(0, 20) for _ in range(n))]
+    return [rows[i:i + size] for i in range(0, n, size)]
+
+
+def _expected(table, col, reverse, text=None):
+    c = table.columns.index(col)
+    ids = list(range(len(table)))
+    if c == 1:
+        ids.sort(key=table.keys[0].__getitem__, reverse=reverse)
+    else:
+        ids.sort(key=lambda i: str(table.rows[i][c]).lower(), reverse=reverse)
+    view = [i for i in ids if text is None or text in table.rows[i][0]]
+    return ids, view
+
+
+def test_extend_under_sort_matches_full_sort():
+    for col in ("name", "size"):
+        for reverse in (False, True):
+            table = ResultTable(["name", "size"], numeric=["size"])
+            table.sort(col, reverse)
+            for batch in _batches(300, 37):
+                table.extend(batch)
+                order, view = _expected(table, col, reverse)
+                assert table.order == order
+                assert table.view == view
+
+
+def test_extend_under_sort_and_filter():
+    table = ResultTable(["name", "size"], numeric=["size"])
+    table.sort("size", reverse=True)
+    table.set_filter("name", "b")
+    for batch in _batches(300, 25, seed=2):
+        table.extend(batch)
+    order, view = _expected(table, "size", True, "b")
+    assert table.order == order
+    assert table.view == view
@@ -0,0 +1,7 @@
+# toolkit/__init__.py
+"""
+UI-free engines used by the Windows Power Toolkit pages.
+
+Nothing in this package imports tkinter, ttkbootstrap or matplotlib, so the
+modules can be driven from worker threads, other processes or scripts.
+"""
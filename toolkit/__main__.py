@@ -0,0 +1,5 @@
+# toolkit/__main__.py
+"""``python -m toolkit`` – see toolkit.cli."""
+from toolkit.cli import main
+
+raise SystemExit(main())
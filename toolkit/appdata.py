@@ -0,0 +1,15 @@
+# toolkit/appdata.py
+"""Location of the toolkit's on-disk caches and indexes."""
+from __future__ import annotations
+
+import os
+
+APP_DIR_NAME = "WindowsPowerToolkit"
+
+
+def data_dir() -> str:
+    """Per-user cache folder, created on first use."""
+    base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache")
+    path = os.path.join(base, APP_DIR_NAME)
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,330 @@
+# toolkit/bench.py
+"""
+Storage benchmark.
+
+A test file of ``file_size`` bytes is filled with random data (so
+compressing or deduplicating controllers cannot shortcut it) and then
+read or overwritten in place, one block at a time, by ``workers``
+threads. Each thread has its own handle and keeps one request in flight,
+so the worker count is the queue depth the device sees. Sequential tests
+give every worker its own stripe of the file; random tests pick
+block-aligned offsets uniformly.
+
+With ``direct`` the file is opened unbuffered (FILE_FLAG_NO_BUFFERING and
+write-through on Windows, O_DIRECT on Linux, F_NOCACHE on macOS) into
+page-aligned buffers, so reads come from the device rather than the cache
+that just wrote them. Filesystems that refuse unbuffered handles fall
+back to buffered I/O and the result says so. Writes end with an fsync
+that is part of the timed run; ``fsync`` additionally flushes after every
+block.
+
+Reads go into a preallocated buffer by default; ``read_mode`` "mmap"
+copies straight out of a mapping of the file instead and "buffered"
+allocates a new bytes object per block, as plain ``read()`` does. Both of
+those go through the OS cache, so they ignore ``direct``.
+
+Every operation is timed with ``perf_counter_ns`` into a per-thread
+LatencyHistogram; they are merged at the end of the test.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import random
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional, Sequence
+
+from toolkit.fastio import READ_MODES
+from toolkit.histogram import PERCENTILES, LatencyHistogram
+from toolkit.tasks import Progress
+
+KB, MB = 1024, 1024 * 1024
+SWEEP = tuple(4 * KB << i for i in range(12))   # 4K … 8M
+PATTERNS = ("seq", "rand")
+OPS = ("read", "write")
+TEST_FILE = "toolkit-bench.tmp"
+
+
+def size_label(n: int) -> str:
+    return f"{n // MB}M" if n >= MB else f"{n // KB}K"
+
+
+@dataclass
+class BenchSpec:
+    op: str = "read"            # "read" or "write"
+    pattern: str = "seq"        # "seq" or "rand"
+    block_size: int = 1 * MB
+    workers: int = 1            # threads, each with one request in flight
+    fsync: bool = False         # flush after every write
+    max_seconds: float = 5.0
+    read_mode: str = "readinto"   # one of toolkit.fastio.READ_MODES
+
+    @property
+    def name(self) -> str:
+        name = f"{self.pattern} {self.op} {size_label(self.block_size)} QD{self.workers}"
+        if self.op == "read" and self.read_mode != "readinto":
+            name += f" {self.read_mode}"
+        return name
+
+
+@dataclass
+class BenchResult:
+    spec: BenchSpec
+    bytes: int = 0
+    ops: int = 0
+    seconds: float = 0.0
+    direct: bool = False
+    latency: LatencyHistogram = field(default_factory=LatencyHistogram)   # ns per op
+
+    @property
+    def mb_s(self) -> float:
+        return self.bytes / MB / self.seconds if self.seconds else 0.0
+
+    @property
+    def iops(self) -> float:
+        return self.ops / self.seconds if self.seconds else 0.0
+
+    def percentile(self, p: float) -> float:
+        """Latency in ms at percentile ``p`` (0–100)."""
+        return self.latency.percentile(p) / 1e6
+
+    def percentiles(self) -> List[float]:
+        """Latency in ms at each of PERCENTILES, then the maximum."""
+        return [self.percentile(p) for p in PERCENTILES] + [self.latency.max / 1e6]
+
+    @property
+    def mean_ms(self) -> float:
+        return self.latency.mean / 1e6
+
+
+# -------- unbuffered handles
+
+def _open_windows(path: str, write: bool) -> int:
+    import ctypes
+    import msvcrt
+    from ctypes import wintypes
+
+    GENERIC_READ, GENERIC_WRITE = 0x80000000, 0x40000000
+    FILE_SHARE_READ, FILE_SHARE_WRITE = 0x1, 0x2
+    OPEN_EXISTING = 3
+    FILE_FLAG_NO_BUFFERING, FILE_FLAG_WRITE_THROUGH = 0x20000000, 0x80000000
+
+    k32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    k32.CreateFileW.restype = wintypes.HANDLE
+    k32.CreateFileW.argtypes = (
+        wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD, wintypes.LPVOID,
+        wintypes.DWORD, wintypes.DWORD, wintypes.HANDLE,
+    )
+    access = GENERIC_READ | (GENERIC_WRITE if write else 0)
+    flags = FILE_FLAG_NO_BUFFERING | (FILE_FLAG_WRITE_THROUGH if write else 0)
+    h = k32.CreateFileW(path, access, FILE_SHARE_READ | FILE_SHARE_WRITE, None, OPEN_EXISTING, flags, None)
+    if h == wintypes.HANDLE(-1).value:
+        raise ctypes.WinError(ctypes.get_last_error())
+    return msvcrt.open_osfhandle(h, os.O_RDWR if write else os.O_RDONLY)
+
+
+def open_file(path: str, write: bool = False, direct: bool = False):
+    """
+    Unbuffered binary file object; with ``direct``, bypassing the OS cache.
+    Returns ``(file, direct)`` where ``direct`` says whether that worked.
+    """
+    flags = (os.O_RDWR if write else os.O_RDONLY) | getattr(os, "O_BINARY", 0)
+    mode = "r+b" if write else "rb"
+    if direct:
+        try:
+            if os.name == "nt":
+                fd = _open_windows(path, write)
+            else:
+                fd = os.open(path, flags | getattr(os, "O_DIRECT", 0))
+                if sys.platform == "darwin":
+                    import fcntl
+                    fcntl.fcntl(fd, fcntl.F_NOCACHE, 1)
+            return open(fd, mode, buffering=0), True
+        except OSError:
+            pass
+    return open(os.open(path, flags), mode, buffering=0), False
+
+
+def aligned_buffer(size: int) -> mmap.mmap:
+    """Page-aligned writable buffer, as unbuffered I/O requires."""
+    return mmap.mmap(-1, size)
+
+
+# -------- test file
+
+def prepare(path: str, file_size: int, progress: Optional[Progress] = None) -> None:
+    """Write ``file_size`` bytes of random data to ``path`` and flush it."""
+    chunk = 4 * MB
+    if progress is not None:
+        progress.begin("Creating test file …", total_bytes=file_size, unit="chunks")
+    with open(path, "wb", buffering=0) as fp:
+        left = file_size
+        while left > 0:
+            n = min(chunk, left)
+            fp.write(os.urandom(n))
+            left -= n
+            if progress is not None:
+                progress.advance(1, n)
+        os.fsync(fp.fileno())
+
+
+# -------- running
+
+def _offsets(spec: BenchSpec, file_size: int, worker: int) -> Iterator[int]:
+    bs = spec.block_size
+    blocks = file_size // bs
+    if spec.pattern == "seq":
+        stripe = blocks // spec.workers
+        start = worker * stripe
+        return (b * bs for b in range(start, start + stripe))
+    rnd = random.Random(worker)
+    return (rnd.randrange(blocks) * bs for _ in range(blocks // spec.workers))
+
+
+def run_test(
+    path: str,
+    spec: BenchSpec,
+    direct: bool = True,
+    progress: Optional[Progress] = None,
+) -> BenchResult:
+    """Run one test against an existing test file at ``path``."""
+    file_size = os.path.getsize(path)
+    if file_size < spec.block_size * spec.workers:
+        raise ValueError(f"test file too small for {spec.name}")
+    write = spec.op == "write"
+    if not write and spec.read_mode not in READ_MODES:
+        raise ValueError(f"unknown read mode {spec.read_mode!r}")
+    mapped = not write and spec.read_mode == "mmap"
+    direct = direct and (write or spec.read_mode == "readinto")
+    result = BenchResult(spec)
+    done = [0] * spec.workers
+    lats = [LatencyHistogram() for _ in range(spec.workers)]
+    errors: List[BaseException] = []
+    stop = threading.Event()
+    handles = []
+    for _ in range(spec.workers):
+        fp, result.direct = open_file(path, write, direct)
+        handles.append(fp)
+    deadline = time.perf_counter() + spec.max_seconds
+
+    def work(i: int) -> None:
+        fp, record = handles[i], lats[i].record
+        buf = aligned_buffer(spec.block_size)
+        if write:
+            buf.write(os.urandom(spec.block_size))
+        view = memoryview(buf)
+        mm = mview = None
+        clock = time.perf_counter_ns
+        n = 0
+        try:
+            if mapped:
+                mm = mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
+                mview = memoryview(mm)
+            for off in _offsets(spec, file_size, i):
+                if stop.is_set() or time.perf_counter() > deadline:
+                    break
+                if write:
+                    struct.pack_into("<QQ", buf, 0, i, n)   # every block differs
+                t0 = clock()
+                fp.seek(off)
+                if write:
+                    fp.write(view)
+                    if spec.fsync:
+                        os.fsync(fp.fileno())
+                elif mapped:
+                    view[:] = mview[off:off + spec.block_size]
+                elif spec.read_mode == "buffered":
+                    fp.read(spec.block_size)
+                else:
+                    fp.readinto(view)
+                record(clock() - t0)
+                n += 1
+                done[i] = n
+        except BaseException as exc:
+            errors.append(exc)
+            stop.set()
+        finally:
+            if mview is not None:
+                mview.release()
+                mm.close()
+            view.release()
+            buf.close()
+
+    if progress is not None:
+        planned = file_size // spec.block_size // spec.workers * spec.workers * spec.block_size
+        progress.begin(spec.name, total_bytes=planned, unit="ops")
+    threads = [threading.Thread(target=work, args=(i,), daemon=True) for i in range(spec.workers)]
+    start = time.perf_counter()
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            while t.is_alive():
+                t.join(0.2)
+                if progress is not None:
+                    ops = sum(done)
+                    progress.update(items=ops, nbytes=ops * spec.block_size)
+        if write:
+            for fp in handles:
+                os.fsync(fp.fileno())
+        result.seconds = time.perf_counter() - start
+    finally:
+        stop.set()
+        for t in threads:
+            t.join()
+        for fp in handles:
+            fp.close()
+    if errors:
+        raise errors[0]
+    result.ops = sum(done)
+    result.bytes = result.ops * spec.block_size
+    for lat in lats:
+        result.latency.merge(lat)
+    return result
+
+
+def run_suite(
+    folder: str,
+    file_size: int,
+    specs: Sequence[BenchSpec],
+    direct: bool = True,
+    progress: Optional[Progress] = None,
+    result_cb: Optional[Callable[[BenchResult], None]] = None,
+) -> List[BenchResult]:
+    """Create the test file in ``folder``, run every spec, then delete it."""
+    path = os.path.join(folder, TEST_FILE)
+    results = []
+    try:
+        prepare(path, file_size, progress)
+        for spec in specs:
+            res = run_test(path, spec, direct, progress)
+            results.append(res)
+            if result_cb is not None:
+                result_cb(res)
+    finally:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    return results
+
+
+def sweep(
+    block_sizes: Sequence[int] = SWEEP,
+    patterns: Sequence[str] = PATTERNS,
+    ops: Sequence[str] = OPS,
+    workers: int = 1,
+    fsync: bool = False,
+    max_seconds: float = 5.0,
+    read_mode: str = "readinto",
+) -> List[BenchSpec]:
+    return [
+        BenchSpec(op, pattern, bs, workers, fsync, max_seconds, read_mode)
+        for op in ops
+        for pattern in patterns
+        for bs in block_sizes
+    ]
@@ -0,0 +1,82 @@
+# toolkit/cleanup.py
+"""
+Locations the Cleanup tabs offer to clear, and deleting them.
+
+The path functions only report what exists; nothing is removed until
+``delete_paths`` is called with a list the user confirmed.
+"""
+from __future__ import annotations
+
+import glob
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple
+
+from toolkit.tasks import Progress
+
+
+@dataclass
+class DeleteResult:
+    removed: int = 0
+    failed: List[Tuple[str, str]] = field(default_factory=list)  # (path, error)
+
+
+def temp_entries() -> List[str]:
+    """Top-level entries of the user's temp folder."""
+    tempdir = tempfile.gettempdir()
+    return [os.path.join(tempdir, name) for name in os.listdir(tempdir)]
+
+
+def browser_cache_paths() -> List[str]:
+    local = os.environ.get("LOCALAPPDATA", "")
+    appdata = os.environ.get("APPDATA", "")
+    paths = [
+        os.path.join(local, "Google", "Chrome", "User Data", "Default", "Cache"),
+        os.path.join(local, "Microsoft", "Edge", "User Data", "Default", "Cache"),
+    ]
+    paths += [
+        os.path.join(d, "cache2")
+        for d in glob.glob(os.path.join(appdata, "Mozilla", "Firefox", "Profiles", "*"))
+    ]
+    return [p for p in paths if os.path.isdir(p)]
+
+
+def windows_cache_paths() -> List[str]:
+    local = os.environ.get("LOCALAPPDATA", "")
+    windir = os.environ.get("WINDIR", "C:\\Windows")
+    paths = [
+        os.path.join(local, "Microsoft", "Windows", "INetCache"),
+        os.path.join(local, "Microsoft", "Windows", "WebCache"),
+        os.path.join(local, "Microsoft", "Windows", "Explorer", "IconCache"),
+        os.path.join(local, "Microsoft", "Windows", "Explorer", "ThumbCache"),
+        os.path.join(windir, "Temp"),
+        os.path.join(local, "Temp"),
+    ]
+    return [p for p in paths if os.path.exists(p)]
+
+
+def delete_paths(paths: Iterable[str], strict: bool = False, progress: Optional[Progress] = None) -> DeleteResult:
+    """
+    Remove files and folder trees. With ``strict`` a folder counts as failed
+    if anything in it could not be removed; otherwise locked files inside a
+    folder are skipped silently, as cache folders usually contain some.
+    ``progress`` counts the paths done, so a cancel stops between them.
+    """
+    paths = list(paths)
+    if progress is not None:
+        progress.begin(f"Deleting {len(paths)} items …", total_items=len(paths))
+    res = DeleteResult()
+    for path in paths:
+        try:
+            if os.path.isdir(path) and not os.path.islink(path):
+                shutil.rmtree(path, ignore_errors=not strict)
+            else:
+                os.remove(path)
+            res.removed += 1
+        except OSError as exc:
+            res.failed.append((path, str(exc)))
+        if progress is not None:
+            progress.advance()
+    return res
@@ -0,0 +1,569 @@
+# toolkit/cli.py
+"""
+Headless command line for the toolkit engines.
+
+    python -m toolkit scan dupes PATH [--json] [--processes [N]]
+    python -m toolkit scan sizes PATH [--depth N] [--full] [--processes [N]]
+    python -m toolkit scan empty PATH
+    python -m toolkit search ROOT PATTERN [--mode glob] [--kind file]
+    python -m toolkit checksum PATH... [--algo sha256,xxh3_64] [--read-mode mmap] [--processes [N]]
+    python -m toolkit manifest create ROOT FILE [--algo sha256] | verify FILE [ROOT] [--all]
+    python -m toolkit bench FOLDER [--block sweep] [--qd 4]
+    python -m toolkit net ports HOSTS|CIDR 1-65535|web,db [--concurrency 512] [--per-host 32] | sweep CIDR [--ports 445,22] [--no-icmp] [--names]
+                         | ping HOST[:PORT]... [-c 4] [--continuous] | resolve NAME... | rdns IP|CIDR... | hostinfo | publicip
+    python -m toolkit sysinfo
+    python -m toolkit drives
+
+With ``--json`` every result is one JSON object per line with a "type"
+field, written as soon as it is known, so output can be piped into other
+tools while a scan is still running; otherwise results are printed as
+tab-separated text. ``--progress`` reports status on stderr. ``--out FILE``
+streams the result records to a .csv, .jsonl or .parquet file instead,
+leaving errors and summaries on stdout.
+
+Nothing here imports Tk, ttkbootstrap or matplotlib.
+
+Exit codes: 0 success, 1 finished but some items failed (unreadable
+files, failed lookups), 2 bad arguments, 3 the command failed, 130
+interrupted.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import nullcontext
+from dataclasses import asdict
+from typing import Any, List, Optional, Sequence
+
+from toolkit.tasks import Progress
+
+EXIT_OK, EXIT_PARTIAL, EXIT_USAGE, EXIT_FAILED, EXIT_INTERRUPTED = 0, 1, 2, 3, 130
+
+_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+def parse_size(text: str) -> int:
+    """``"64K"``, ``"1.5G"`` or plain bytes."""
+    text = text.strip().upper().rstrip("B")
+    unit = text[-1:] if text[-1:] in _UNITS else ""
+    try:
+        return int(float(text[: len(text) - len(unit)]) * _UNITS[unit])
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"bad size {text!r}") from None
+
+
+def _arg(parse, *values):
+    """``parse(*values)`` for command-line values: its ValueError is a usage error."""
+    try:
+        return parse(*values)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from None
+
+
+# record types that stay on stdout when results go to an --out file
+_CONTROL = ("error", "fatal", "summary")
+
+
+class Output:
+    def __init__(self, as_json: bool, stream=None, sink=None):
+        self.as_json = as_json
+        self.stream = stream or sys.stdout
+        self.sink = sink
+        self.failures = 0
+
+    def emit(self, kind: str, **fields: Any) -> None:
+        if kind == "error":
+            self.failures += 1
+        if self.sink is not None and kind not in _CONTROL:
+            self.sink.write(fields)
+            return
+        if self.as_json:
+            line = json.dumps({"type": kind, **fields}, default=str)
+        else:
+            line = "\t".join([kind] + [
+                json.dumps(v, default=str) if isinstance(v, (dict, list)) else str(v)
+                for v in fields.values()
+            ])
+        self.stream.write(line + "\n")
+        self.stream.flush()
+
+
+class _Reporter:
+    """Prints the progress message and rate to stderr once a second."""
+
+    def __init__(self, progress: Progress):
+        self.progress = progress
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *_exc):
+        self.stop.set()
+        self.thread.join()
+        sys.stderr.write("\n")
+
+    def _run(self) -> None:
+        while not self.stop.wait(1.0):
+            snap = self.progress.snapshot()
+            extra = f" ({snap.describe()})" if snap.items or snap.bytes else ""
+            sys.stderr.write(f"\r{self.progress.message}{extra}"[:200].ljust(80))
+            sys.stderr.flush()
+
+
+# -------- storage
+
+def cmd_dupes(args, out: Output, progress: Progress) -> int:
+    from toolkit.dupes import find_duplicates
+    from toolkit.hashcache import HashCache
+
+    with nullcontext() if args.no_cache else HashCache() as cache:
+        report = find_duplicates(args.path, min_size=args.min_size, cache=cache, progress=progress,
+                                 processes=args.processes)
+    for n, grp in enumerate(report.groups, 1):
+        if out.sink is not None:  # one flat row per file for tabular formats
+            for p in grp.paths:
+                out.emit("dupe", set=n, path=p, size=grp.size, count=len(grp.paths), digest=grp.digest)
+        else:
+            out.emit("dupe", set=n, size=grp.size, digest=grp.digest, wasted=grp.wasted, paths=grp.paths)
+    out.emit("summary", groups=len(report.groups), wasted_bytes=report.wasted_bytes, **asdict(report.stats))
+    return EXIT_PARTIAL if report.stats.errors else EXIT_OK
+
+
+def cmd_sizes(args, out: Output, progress: Progress) -> int:
+    from toolkit.duindex import DiskUsageIndex
+
+    progress.begin(f"Scanning {args.path} …", unit="folders")
+    with DiskUsageIndex() as index:
+        res = index.update(args.path, full=args.full, progress_cb=lambda _t, n: progress.update(items=n),
+                           processes=args.processes)
+    stack = [(res.tree, 0)]
+    while stack:
+        node, depth = stack.pop()
+        out.emit("dir", path=node.path, size=node.total_size, files=node.total_files, depth=depth)
+        if depth < args.depth:
+            stack.extend((c, depth + 1) for c in sorted(node.children.values(), key=lambda c: c.total_size))
+    for path, err in res.errors:
+        out.emit("error", path=path, error=err)
+    out.emit("summary", dirs_scanned=res.dirs_scanned, dirs_reused=res.dirs_reused, errors=len(res.errors))
+    return EXIT_PARTIAL if res.errors else EXIT_OK
+
+
+def cmd_empty(args, out: Output, progress: Progress) -> int:
+    from toolkit.duindex import DiskUsageIndex, empty_dirs
+
+    progress.begin(f"Scanning {args.path} …", unit="folders")
+    with DiskUsageIndex() as index:
+        res = index.update(args.path, progress_cb=lambda _t, n: progress.update(items=n))
+    for node in empty_dirs(res.tree):
+        out.emit("empty", path=node.path)
+    for path, err in res.errors:
+        out.emit("error", path=path, error=err)
+    return EXIT_PARTIAL if res.errors else EXIT_OK
+
+
+def cmd_search(args, out: Output, progress: Progress) -> int:
+    from toolkit.nameindex import NameIndex
+
+    idx = None if args.reindex else NameIndex.load(args.root)
+    if idx is None:
+        idx = NameIndex.build(args.root, status_cb=progress.status)
+        idx.save()
+    hits = idx.query(
+        args.pattern,
+        mode=args.mode,
+        kind=args.kind,
+        min_size=args.min_size,
+        newer_than=time.time() - args.newer_days * 86400 if args.newer_days is not None else None,
+        limit=args.limit,
+    )
+    for hit in hits:
+        out.emit("match", path=hit.path, is_dir=hit.is_dir, size=hit.size, mtime=hit.mtime)
+    return EXIT_OK
+
+
+def _expand(paths: Sequence[str]) -> List[str]:
+    from toolkit.walker import Walker
+
+    files = []
+    for p in paths:
+        if os.path.isdir(p):
+            files.extend(e.path for e in Walker().files(p))
+        else:
+            files.append(p)
+    return files
+
+
+def cmd_checksum(args, out: Output, progress: Progress) -> int:
+    from toolkit.hashcache import HashCache
+    from toolkit.hashing import hash_files, parse_algos
+
+    algos = _arg(parse_algos, args.algo)
+    files = _expand(args.paths)
+    progress.begin(f"Hashing {len(files)} files …", total_items=len(files), unit="files")
+    with nullcontext() if args.no_cache else HashCache() as cache:
+        results = hash_files(files, algos, workers=args.workers, cache=cache, read_mode=args.read_mode,
+                             processes=args.processes)
+        try:
+            for res in results:
+                if res.digest is None:
+                    out.emit("error", path=res.path, error=res.error)
+                else:
+                    out.emit("checksum", path=res.path, algo=algos[0], digest=res.digest,
+                             size=res.size, cached=res.cached,
+                             **({"digests": res.digests} if len(algos) > 1 else {}))
+                progress.advance(1, 0 if res.cached else res.size)
+        finally:
+            results.close()
+    return EXIT_PARTIAL if out.failures else EXIT_OK
+
+
+def cmd_manifest(args, out: Output, progress: Progress) -> int:
+    from toolkit import manifest
+    from toolkit.hashcache import HashCache
+    from toolkit.hashing import parse_algos
+
+    if args.manifest_cmd == "create":
+        algos = _arg(parse_algos, args.algo or "sha256")
+        _arg(manifest.text_algo, args.file, algos)  # fail before hashing, not after
+        with nullcontext() if args.no_cache else HashCache() as cache:
+            m, errors = manifest.create(args.root, algos, workers=args.workers, processes=args.processes,
+                                        cache=cache, read_mode=args.read_mode, progress=progress,
+                                        skip=(args.file,))
+        for path, error in errors:
+            out.emit("error", path=path, error=error)
+        manifest.write(m, args.file)
+        out.emit("summary", manifest=args.file, files=len(m.entries), algos=",".join(m.algos),
+                 bytes=sum(e.size or 0 for e in m.entries))
+        return EXIT_PARTIAL if out.failures else EXIT_OK
+
+    m = manifest.read(args.file)
+    root = args.root or manifest.default_root(m, args.file)
+    report = manifest.VerifyReport()
+    items = manifest.verify(m, root, args.algo, workers=args.workers, processes=args.processes,
+                            read_mode=args.read_mode, progress=progress, report=report, skip=(args.file,))
+    try:
+        for item in items:
+            if args.all or item.status != "ok":
+                out.emit("verify", status=item.status, path=item.path, expected=item.expected,
+                         actual=item.actual, detail=item.detail)
+    finally:
+        items.close()
+    out.emit("summary", root=root, algo=report.algo, bytes_read=report.bytes_read, **report.counts)
+    return EXIT_PARTIAL if report.problems else EXIT_OK
+
+
+def cmd_bench(args, out: Output, progress: Progress) -> int:
+    from toolkit import bench
+
+    specs = bench.sweep(
+        block_sizes=bench.SWEEP if args.block == "sweep" else (parse_size(args.block),),
+        patterns=bench.PATTERNS if args.pattern == "both" else (args.pattern,),
+        ops=bench.OPS if args.op == "both" else (args.op,),
+        workers=args.qd,
+        fsync=args.fsync,
+        max_seconds=args.seconds,
+        read_mode=args.read_mode,
+    )
+
+    def show(r):
+        p50, p90, p99, p999, mx = r.percentiles()
+        out.emit(
+            "bench", test=r.spec.name, mb_s=round(r.mb_s, 2), iops=round(r.iops, 1),
+            mean_ms=round(r.mean_ms, 4), p50_ms=p50, p90_ms=p90, p99_ms=p99, p999_ms=p999,
+            max_ms=mx, ops=r.ops, direct=r.direct,
+        )
+
+    bench.run_suite(args.folder, args.size, specs, direct=not args.no_direct, progress=progress, result_cb=show)
+    return EXIT_OK
+
+
+# -------- network / system
+
+def cmd_net(args, out: Output, progress: Progress) -> int:
+    from toolkit import net
+
+    if args.net_cmd == "ports":
+        from toolkit import portscan
+
+        hosts, ports = _arg(net.parse_hosts, args.hosts), _arg(net.parse_ports, args.ports)
+        progress.begin(f"Scanning {len(hosts)} hosts …", total_items=len(hosts) * len(ports), unit="probes")
+        matrix = portscan.PortMatrix()
+        results = portscan.scan_many(hosts, ports, args.concurrency, args.per_host, args.rate, args.timeout)
+        try:
+            for r in results:
+                matrix.add(r)
+                if r.port == 0:
+                    out.emit("error", host=r.host, error=r.detail)
+                    progress.advance(len(ports))
+                    continue
+                if r.state == "open" or args.all:
+                    out.emit("port", host=r.host, port=r.port, state=r.state,
+                             rtt_ms=round(r.rtt_ms, 2) if r.rtt_ms is not None else None)
+                progress.advance()
+        finally:
+            results.close()
+        if len(hosts) > 1:
+            for host in matrix.hosts():
+                out.emit("host", host=host, open=[p for p, st in sorted(matrix.states[host].items()) if st == "open"])
+        return EXIT_PARTIAL if out.failures else EXIT_OK
+    if args.net_cmd == "sweep":
+        from toolkit import icmp, sweep
+
+        hosts = _arg(net.parse_hosts, args.hosts)
+        ports = _arg(net.parse_ports, args.ports) if args.ports else []
+        pinger = None
+        if not args.no_icmp:
+            try:
+                pinger = icmp.open_pinger()
+            except icmp.IcmpUnavailable as exc:
+                if not ports:
+                    raise
+                print(f"{exc}; TCP probes only", file=sys.stderr)
+        live = []
+        try:
+            for h in sweep.sweep(hosts, ports, pinger, args.concurrency, args.timeout, args.rate, progress):
+                live.append(h.host)
+                out.emit("live", host=h.host, via=h.via, rtt_ms=round(h.rtt_ms, 2) if h.rtt_ms is not None else None)
+        finally:
+            if pinger is not None:
+                pinger.close()
+        if args.names and live:
+            from toolkit.resolver import default_resolver
+
+            progress.begin(f"Looking up {len(live)} names …", total_items=len(live), unit="names")
+            for res in default_resolver().reverse_many(live):
+                # no PTR record is common on a LAN and not a failure here
+                out.emit("rdns", query=res.query, answers=res.answers)
+                progress.advance()
+        out.emit("summary", hosts=len(hosts), live=len(live))
+        return EXIT_OK
+    if args.net_cmd in ("resolve", "rdns"):
+        from toolkit.resolver import default_resolver
+
+        resolver = default_resolver()
+        if args.net_cmd == "resolve":
+            queries = [_arg(net.clean_host, n) for n in args.names]
+            results = resolver.lookup_many(queries)
+        else:
+            queries = [h for spec in args.names for h in _arg(net.parse_hosts, spec)]
+            results = resolver.reverse_many(queries)
+        progress.begin(f"Looking up {len(queries)} names …", total_items=len(queries), unit="names")
+        for res in results:
+            if res.error:
+                out.emit("error", query=res.query, error=res.error)
+            else:
+                out.emit(args.net_cmd, query=res.query, answers=res.answers)
+            progress.advance()
+        return EXIT_PARTIAL if out.failures else EXIT_OK
+    if args.net_cmd == "ping":
+        return _net_ping(args, out, progress)
+    if args.net_cmd == "hostinfo":
+        out.emit("hostinfo", **net.host_info())
+    elif args.net_cmd == "publicip":
+        out.emit("publicip", ip=net.public_ip())
+    return EXIT_OK
+
+
+def _net_ping(args, out: Output, progress: Progress) -> int:
+    from toolkit import latency
+
+    targets, failed = _arg(latency.resolve_targets, args.hosts)
+    for spec, error in failed:
+        out.emit("error", target=spec, error=error)
+    if not targets:
+        return EXIT_FAILED
+    count = 0 if args.continuous else args.count
+    stats = {t.name: latency.PingStats() for t in targets}
+    progress.begin(f"Pinging {len(targets)} targets …", total_items=count * len(targets), unit="probes")
+    interrupted = False
+    rounds = latency.monitor(targets, args.interval, args.timeout, count)
+    try:
+        for samples in rounds:
+            for s in samples:
+                stats[s.target].add(s)
+                out.emit("reply", target=s.target, seq=s.seq,
+                         rtt_ms=round(s.rtt_ms, 3) if s.rtt_ms is not None else None)
+            progress.advance(len(samples))
+    except KeyboardInterrupt:  # the usual way to end --continuous: still print the statistics
+        interrupted = True
+    finally:
+        rounds.close()
+    for name, st in stats.items():
+        out.emit("summary", target=name, **st.summary())
+    if interrupted:
+        return EXIT_INTERRUPTED
+    return EXIT_PARTIAL if out.failures or any(not st.received for st in stats.values()) else EXIT_OK
+
+
+def cmd_sysinfo(args, out: Output, progress: Progress) -> int:
+    from toolkit import sysinfo
+
+    out.emit("sysinfo", **sysinfo.snapshot())
+    return EXIT_OK
+
+
+def cmd_drives(args, out: Output, progress: Progress) -> int:
+    from toolkit.drives import list_drives
+
+    for d in list_drives():
+        out.emit("drive", **asdict(d))
+    return EXIT_OK
+
+
+# -------- parser
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--json", action="store_true", help="write JSON Lines")
+    common.add_argument("--progress", action="store_true", help="report progress on stderr")
+    common.add_argument("--out", metavar="FILE", help="write results to a .csv, .jsonl or .parquet file")
+    pool = argparse.ArgumentParser(add_help=False)
+    pool.add_argument("--processes", type=int, nargs="?", const=os.cpu_count() or 1, default=0, metavar="N",
+                      help="work on N processes instead of threads (default with no N: one per core)")
+
+    p = argparse.ArgumentParser(prog="python -m toolkit", description="Windows Power Toolkit engines, headless.")
+    sub = p.add_subparsers(dest="command", required=True)
+
+    scan = sub.add_parser("scan", help="folder scans").add_subparsers(dest="scan_cmd", required=True)
+    s = scan.add_parser("dupes", parents=[common, pool], help="byte-identical files")
+    s.add_argument("path")
+    s.add_argument("--min-size", type=parse_size, default=1)
+    s.add_argument("--no-cache", action="store_true", help="do not use the hash cache")
+    s.set_defaults(func=cmd_dupes)
+    s = scan.add_parser("sizes", parents=[common, pool], help="folder sizes (updates the disk-usage index)")
+    s.add_argument("path")
+    s.add_argument("--depth", type=int, default=1)
+    s.add_argument("--full", action="store_true", help="rescan every folder")
+    s.set_defaults(func=cmd_sizes)
+    s = scan.add_parser("empty", parents=[common], help="empty folders")
+    s.add_argument("path")
+    s.set_defaults(func=cmd_empty)
+
+    s = sub.add_parser("search", parents=[common], help="find files by name")
+    s.add_argument("root")
+    s.add_argument("pattern")
+    s.add_argument("--mode", choices=("substring", "glob", "regex"), default="substring")
+    s.add_argument("--kind", choices=("file", "dir"))
+    s.add_argument("--min-size", type=parse_size)
+    s.add_argument("--newer-days", type=float)
+    s.add_argument("--limit", type=int)
+    s.add_argument("--reindex", action="store_true")
+    s.set_defaults(func=cmd_search)
+
+    s = sub.add_parser("checksum", parents=[common, pool], help="hash files or folders")
+    s.add_argument("paths", nargs="+")
+    s.add_argument("--algo", default="md5",
+                   help="one or more of md5, sha1, sha256, sha512, sha3_256, blake2b, blake2b-128, "
+                        "xxh64, xxh3_64, xxh3_128 (needs xxhash) or fast, comma-separated")
+    s.add_argument("--workers", type=int)
+    s.add_argument("--read-mode", choices=("readinto", "mmap"), default="readinto")
+    s.add_argument("--no-cache", action="store_true")
+    s.set_defaults(func=cmd_checksum)
+
+    man = sub.add_parser("manifest", help="write or verify a checksum manifest").add_subparsers(
+        dest="manifest_cmd", required=True)
+    s = man.add_parser("create", parents=[common, pool], help="hash a tree into FILE (.json or sha256sum text)")
+    s.add_argument("root")
+    s.add_argument("file")
+    s.add_argument("--no-cache", action="store_true")
+    s = man.add_parser("verify", parents=[common, pool], help="re-hash a tree and compare it with FILE")
+    s.add_argument("file")
+    s.add_argument("root", nargs="?", help="default: the manifest's folder")
+    s.add_argument("--all", action="store_true", help="also report files that match")
+    for s in man.choices.values():
+        s.add_argument("--algo", help="default: sha256 to create, the fastest in the manifest to verify")
+        s.add_argument("--workers", type=int)
+        s.add_argument("--read-mode", choices=("readinto", "mmap"), default="readinto")
+        s.set_defaults(func=cmd_manifest)
+
+    s = sub.add_parser("bench", parents=[common], help="storage benchmark")
+    s.add_argument("folder")
+    s.add_argument("--size", type=parse_size, default=parse_size("1G"))
+    s.add_argument("--block", default="1M", help="block size or 'sweep' for 4K–8M")
+    s.add_argument("--pattern", choices=("seq", "rand", "both"), default="both")
+    s.add_argument("--op", choices=("read", "write", "both"), default="both")
+    s.add_argument("--qd", type=int, default=1, help="queue depth (worker threads)")
+    s.add_argument("--seconds", type=float, default=5.0, help="time cap per test")
+    s.add_argument("--fsync", action="store_true", help="flush after every write")
+    s.add_argument("--no-direct", action="store_true", help="go through the OS cache")
+    s.add_argument("--read-mode", choices=("readinto", "mmap", "buffered"), default="readinto")
+    s.set_defaults(func=cmd_bench)
+
+    netp = sub.add_parser("net", help="network tools").add_subparsers(dest="net_cmd", required=True)
+    s = netp.add_parser("ports", parents=[common], help="TCP connect scan")
+    s.add_argument("hosts", help="names, addresses or CIDR blocks, comma-separated")
+    s.add_argument("ports", help="e.g. 22,80,8000-8080 or groups: web, windows, remote, mail, db, infra, common")
+    s.add_argument("--timeout", type=float, default=1.0, help="longest wait per port; shrinks with the RTT")
+    s.add_argument("--concurrency", type=int, default=512, help="connects in flight overall")
+    s.add_argument("--per-host", type=int, default=32, help="connects in flight to one host")
+    s.add_argument("--rate", type=float, default=0.0, help="new connects per second per host (0: no limit)")
+    s.add_argument("--all", action="store_true", help="also report closed and filtered ports")
+    s = netp.add_parser("sweep", parents=[common], help="find live hosts by ICMP echo and TCP")
+    s.add_argument("hosts", help="names, addresses or CIDR blocks, comma-separated")
+    s.add_argument("--ports", default=",".join(map(str, (445, 135, 3389, 22, 80, 443))),
+                   help="TCP ports whose answer (open or refused) proves a host is up; '' for ICMP only")
+    s.add_argument("--no-icmp", action="store_true", help="TCP probes only")
+    s.add_argument("--names", action="store_true", help="then look up the names of the live hosts")
+    s.add_argument("--timeout", type=float, default=0.5, help="longest wait per probe; shrinks with the RTT")
+    s.add_argument("--concurrency", type=int, default=512, help="connects in flight")
+    s.add_argument("--rate", type=float, default=1000, help="ICMP echoes per second")
+    s = netp.add_parser("resolve", parents=[common], help="names to all their IPv4 and IPv6 addresses")
+    s.add_argument("names", nargs="+")
+    s = netp.add_parser("rdns", parents=[common], help="reverse DNS of addresses or CIDR blocks")
+    s.add_argument("names", nargs="+", metavar="ip")
+    s = netp.add_parser("ping", parents=[common], help="ICMP or TCP (HOST:PORT) ping with RTT statistics")
+    s.add_argument("hosts", nargs="+", help="hosts to echo, or HOST:PORT to time a TCP connect")
+    s.add_argument("-c", "--count", type=int, default=4, help="rounds")
+    s.add_argument("--continuous", action="store_true", help="ping until interrupted (Ctrl+C)")
+    s.add_argument("--interval", type=float, default=1.0, help="seconds between rounds")
+    s.add_argument("--timeout", type=float, default=1.0, help="longest wait for an answer")
+    netp.add_parser("hostinfo", parents=[common])
+    netp.add_parser("publicip", parents=[common])
+    for s in netp.choices.values():
+        s.set_defaults(func=cmd_net)
+
+    s = sub.add_parser("sysinfo", parents=[common], help="system information")
+    s.set_defaults(func=cmd_sysinfo)
+
+    s = sub.add_parser("drives", parents=[common], help="mounted volumes with usage")
+    s.set_defaults(func=cmd_drives)
+    return p
+
+
+def _open_out(path: Optional[str]):
+    if not path:
+        return nullcontext()
+    from toolkit.export import open_sink
+    return open_sink(path)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    out = Output(args.json)
+    progress = Progress()
+    try:
+        with _Reporter(progress) if args.progress else nullcontext(), _open_out(args.out) as out.sink:
+            return args.func(args, out, progress)
+    except KeyboardInterrupt:
+        return EXIT_INTERRUPTED
+    except BrokenPipeError:
+        # the reader (e.g. head) went away; silence the flush at exit
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return EXIT_OK
+    except argparse.ArgumentTypeError as exc:
+        parser.error(str(exc))
+    except (OSError, ValueError) as exc:
+        out.emit("fatal", error=str(exc))
+        return EXIT_FAILED
+    except ImportError as exc:  # optional dependency, e.g. psutil
+        out.emit("fatal", error=f"{exc.name} is required for this command")
+        return EXIT_FAILED
+    return EXIT_FAILED
@@ -0,0 +1,99 @@
+# toolkit/drives.py
+"""
+Mounted volumes with usage, file system and cluster size.
+
+psutil supplies the partition list; SSD/HDD detection uses WMI and the
+file system and cluster size use the Win32 volume API, so off Windows
+those fields fall back to "HDD", "?" and 0. WMI is COM: ``list_drives``
+initialises COM itself so it can run on a worker thread.
+"""
+from __future__ import annotations
+
+import ctypes
+import os
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class DriveInfo:
+    device: str
+    mount: str
+    total: int
+    used: int
+    free: int
+    kind: str  # "SSD" or "HDD"
+    fs: str
+    cluster: int
+
+    @property
+    def letter(self) -> str:
+        return self.device.rstrip("\\")
+
+
+def fs_info(mount: str) -> Tuple[str, int]:
+    """(file system name, cluster size in bytes) of the volume at ``mount``."""
+    if os.name != "nt":
+        return "?", 0
+    k32 = ctypes.windll.kernel32
+    name = ctypes.create_unicode_buffer(256)
+    fs = ctypes.create_unicode_buffer(256)
+    serial, maxlen, flags = ctypes.c_uint(), ctypes.c_uint(), ctypes.c_uint()
+    k32.GetVolumeInformationW(
+        ctypes.c_wchar_p(mount), name, 256,
+        ctypes.byref(serial), ctypes.byref(maxlen), ctypes.byref(flags), fs, 256,
+    )
+    spc, bps = ctypes.c_uint(), ctypes.c_uint()
+    k32.GetDiskFreeSpaceW(
+        ctypes.c_wchar_p(mount), ctypes.byref(spc), ctypes.byref(bps),
+        ctypes.byref(ctypes.c_uint()), ctypes.byref(ctypes.c_uint()),
+    )
+    return fs.value or "?", spc.value * bps.value
+
+
+def drive_kinds() -> Dict[str, str]:
+    """Logical drive ("C:") → "SSD"/"HDD" from the disk model; empty without WMI."""
+    kinds: Dict[str, str] = {}
+    try:
+        import pythoncom
+        import wmi
+    except ImportError:
+        return kinds
+    pythoncom.CoInitialize()
+    try:
+        for d in wmi.WMI().Win32_DiskDrive():
+            model = (d.Model or "").lower()
+            kind = "SSD" if ("ssd" in model or "nvme" in model) else "HDD"
+            for part in d.associators("Win32_DiskDriveToDiskPartition"):
+                for ld in part.associators("Win32_LogicalDiskToPartition"):
+                    kinds[ld.DeviceID] = kind
+    except Exception:
+        pass  # WMI errors are COM errors; the kind is cosmetic
+    finally:
+        pythoncom.CoUninitialize()
+    return kinds
+
+
+def drive_letters() -> List[str]:
+    import psutil
+    return [p.device.rstrip("\\") for p in psutil.disk_partitions(all=False)]
+
+
+def list_drives(check: Optional[Callable[[], None]] = None) -> List[DriveInfo]:
+    """Readable mounted volumes; ``check`` is called between drives (to cancel)."""
+    import psutil
+    kinds = drive_kinds()
+    drives = []
+    for part in psutil.disk_partitions(all=False):
+        if check:
+            check()
+        try:
+            usage = psutil.disk_usage(part.mountpoint)
+        except PermissionError:
+            continue
+        fs, cluster = fs_info(part.mountpoint)
+        drives.append(DriveInfo(
+            part.device, part.mountpoint, usage.total, usage.used, usage.free,
+            kinds.get(part.device.rstrip("\\"), "HDD"), fs, cluster,
+        ))
+    return drives
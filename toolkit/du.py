@@ -0,0 +1,314 @@
+# toolkit/du.py
+"""
+Parallel disk-usage aggregation.
+
+Each directory is one task. Workers keep their own deque of tasks, take
+new work from its tail (depth-first, good locality) and, when they run
+dry, steal from the head of another worker's deque, which holds the
+shallowest and therefore usually largest unscanned subtrees. That keeps
+all workers busy even when one top-level folder dwarfs the others.
+
+The result is a full DirNode tree, so any folder can be drilled into
+without rescanning. While the scan runs, running totals per top-level
+folder are handed to ``progress_cb`` so a chart can fill in as it goes.
+
+Given the tree from an earlier run, a directory whose mtime is unchanged
+is not listed again: its own totals are copied and only its subfolders
+are stat'ed. A directory's mtime changes when entries are added, removed
+or renamed, but not when a file inside is rewritten in place, so growth
+of existing files shows up once their folder changes or on a full scan.
+
+With ``processes`` the top-level folders are handed out to a process
+pool, largest first by the previous tree, and each process scans its
+folders with the threaded walker above. Running totals then arrive per
+finished top-level folder rather than continuously.
+"""
+from __future__ import annotations
+
+import os
+import stat as stat_mod
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from toolkit import procpool
+from toolkit.walker import Walker, is_link
+
+DEFAULT_WORKERS = min(16, (os.cpu_count() or 1) * 2)
+
+
+@dataclass
+class DirNode:
+    path: str
+    name: str
+    size: int = 0           # bytes of the files directly inside
+    files: int = 0
+    entries: int = 0        # everything directly inside, links included
+    mtime_ns: int = 0
+    total_size: int = 0     # including every subfolder
+    total_files: int = 0
+    children: Dict[str, "DirNode"] = field(default_factory=dict)
+
+    def find(self, path: str) -> Optional["DirNode"]:
+        """Node for ``path`` below (or at) this one."""
+        rel = os.path.relpath(path, self.path)
+        node = self
+        if rel == os.curdir:
+            return node
+        for part in rel.split(os.sep):
+            node = node.children.get(part)
+            if node is None:
+                return None
+        return node
+
+    def biggest(self, n: int = 10) -> List["DirNode"]:
+        return sorted(self.children.values(), key=lambda c: c.total_size, reverse=True)[:n]
+
+    def walk(self) -> Iterator["DirNode"]:
+        """This node and every node below it, parents first."""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(node.children.values())
+
+
+@dataclass
+class DuResult:
+    tree: DirNode
+    errors: List[Tuple[str, str]] = field(default_factory=list)
+    dirs_scanned: int = 0
+    dirs_reused: int = 0
+
+
+def aggregate(root: DirNode) -> None:
+    """Fill ``total_size``/``total_files`` bottom-up without recursion."""
+    for node in reversed(list(root.walk())):
+        node.total_size = node.size + sum(c.total_size for c in node.children.values())
+        node.total_files = node.files + sum(c.total_files for c in node.children.values())
+
+
+class _Scheduler:
+    """Per-worker deques with stealing and a shared outstanding-task count."""
+
+    def __init__(self, workers: int):
+        self.queues = [deque() for _ in range(workers)]
+        self.pending = 0
+        self.cond = threading.Condition()
+        self.cancelled = False
+
+    def push(self, worker: int, task) -> None:
+        with self.cond:
+            self.pending += 1
+        self.queues[worker].append(task)
+
+    def take(self, worker: int):
+        try:
+            return self.queues[worker].pop()
+        except IndexError:
+            pass
+        n = len(self.queues)
+        for k in range(1, n):
+            try:
+                return self.queues[(worker + k) % n].popleft()
+            except IndexError:
+                continue
+        return None
+
+    def done(self) -> None:
+        with self.cond:
+            self.pending -= 1
+            if self.pending == 0:
+                self.cond.notify_all()
+
+    def finished(self) -> bool:
+        return self.cancelled or self.pending == 0
+
+
+def scan_sizes(
+    root: str,
+    workers: Optional[int] = None,
+    progress_cb: Optional[Callable[[Dict[str, int], int], None]] = None,
+    interval: float = 0.5,
+    exclude=None,
+    previous: Optional[DirNode] = None,
+    processes: int = 0,
+) -> DuResult:
+    """
+    Build the size tree for ``root`` on ``workers`` threads, or on
+    ``processes`` processes of ``workers`` threads each.
+
+    ``progress_cb(top_level_totals, dirs_done)`` is called from this
+    thread every ``interval`` seconds. Links and junctions are not entered.
+    ``previous`` is an earlier tree of the same root to update from.
+    """
+    if processes:
+        return _scan_pooled(root, processes, workers, progress_cb, exclude, previous)
+    workers = max(1, workers or DEFAULT_WORKERS)
+    sched = _Scheduler(workers)
+    walkers = [Walker(exclude=exclude) for _ in range(workers)]
+    reused = [0] * workers
+    tops: Dict[str, int] = {}
+    tops_lock = threading.Lock()
+    tree = DirNode(root, os.path.basename(root.rstrip("\\/")) or root)
+
+    def add_top(top: Optional[str], size: int) -> None:
+        if top is not None and size:
+            with tops_lock:
+                tops[top] += size
+
+    def new_child(i: int, node: DirNode, top: Optional[str], name: str, path: str, prev, mtime_ns=0):
+        child = DirNode(path, name, mtime_ns=mtime_ns)
+        node.children[name] = child
+        if top is None:
+            top = name
+            with tops_lock:
+                tops[name] = 0
+        sched.push(i, (child, top, prev))
+
+    def process(i: int, node: DirNode, top: Optional[str], prev: Optional[DirNode]) -> None:
+        if not node.mtime_ns:
+            try:
+                node.mtime_ns = os.stat(node.path).st_mtime_ns
+            except OSError as exc:
+                walkers[i].errors.append((node.path, str(exc)))
+                return
+        if prev is not None and prev.mtime_ns == node.mtime_ns:
+            node.size, node.files, node.entries = prev.size, prev.files, prev.entries
+            reused[i] += 1
+            add_top(top, node.size)
+            for name, pc in prev.children.items():
+                new_child(i, node, top, name, pc.path, pc)
+            return
+
+        scan = walkers[i].scan(node.path)
+        if scan is None:
+            return
+        node.entries = scan.total
+        for entry in scan.files:
+            try:
+                st = entry.stat(follow_symlinks=False)
+            except OSError as exc:
+                walkers[i].errors.append((entry.path, str(exc)))
+                continue
+            if stat_mod.S_ISREG(st.st_mode):
+                node.size += st.st_size
+                node.files += 1
+        add_top(top, node.size)
+        for entry in scan.dirs:
+            if is_link(entry):
+                continue
+            try:
+                mtime_ns = entry.stat(follow_symlinks=False).st_mtime_ns
+            except OSError:
+                mtime_ns = 0
+            prev_child = prev.children.get(entry.name) if prev is not None else None
+            new_child(i, node, top, entry.name, entry.path, prev_child, mtime_ns)
+
+    def run(i: int) -> None:
+        while True:
+            task = sched.take(i)
+            if task is None:
+                with sched.cond:
+                    if sched.finished():
+                        return
+                    sched.cond.wait(0.05)
+                continue
+            try:
+                if not sched.cancelled:
+                    process(i, *task)
+            finally:
+                sched.done()
+
+    sched.push(0, (tree, None, previous))
+    threads = [threading.Thread(target=run, args=(i,), daemon=True) for i in range(workers)]
+    for t in threads:
+        t.start()
+    try:
+        for t in threads:
+            while t.is_alive():
+                t.join(interval)
+                if progress_cb is not None:
+                    with tops_lock:
+                        snapshot = dict(tops)
+                    progress_cb(snapshot, sum(w.stats.dirs_scanned for w in walkers) + sum(reused))
+    except BaseException:
+        sched.cancelled = True
+        raise
+
+    aggregate(tree)
+    return DuResult(
+        tree,
+        errors=[e for w in walkers for e in w.errors],
+        dirs_scanned=sum(w.stats.dirs_scanned for w in walkers),
+        dirs_reused=sum(reused),
+    )
+
+
+class _Stop(Exception):
+    pass
+
+
+def _stop_if_cancelled(_tops, _done) -> None:
+    if procpool.cancelled():
+        raise _Stop
+
+
+def _scan_chunk(chunk, workers, exclude) -> List[Tuple[str, DuResult]]:
+    """Process-pool worker: threaded scan of each ``(name, path, previous)``."""
+    out = []
+    for name, path, prev in chunk:
+        try:
+            res = scan_sizes(path, workers, _stop_if_cancelled, 0.2, exclude, prev)
+        except _Stop:
+            break
+        out.append((name, res))
+    return out
+
+
+def _scan_pooled(root, processes, workers, progress_cb, exclude, previous) -> DuResult:
+    walker = Walker(exclude=exclude)
+    tree = DirNode(root, os.path.basename(root.rstrip("\\/")) or root)
+    result = DuResult(tree)
+    try:
+        tree.mtime_ns = os.stat(root).st_mtime_ns
+    except OSError as exc:
+        result.errors.append((root, str(exc)))
+        return result
+    scan = walker.scan(root)
+    if scan is None:
+        result.errors = walker.errors
+        return result
+    tree.entries = scan.total
+    for entry in scan.files:
+        try:
+            st = entry.stat(follow_symlinks=False)
+        except OSError as exc:
+            walker.errors.append((entry.path, str(exc)))
+            continue
+        if stat_mod.S_ISREG(st.st_mode):
+            tree.size += st.st_size
+            tree.files += 1
+    prev_children = previous.children if previous is not None else {}
+    jobs = [(e.name, e.path, prev_children.get(e.name)) for e in scan.dirs if not is_link(e)]
+    jobs.sort(key=lambda j: j[2].total_size if j[2] is not None else 0, reverse=True)
+
+    workers = workers or max(2, DEFAULT_WORKERS // processes)
+    tops: Dict[str, int] = {}
+    result.errors = walker.errors
+    result.dirs_scanned = 1
+    results = procpool.pool_map(_scan_chunk, jobs, processes, (workers, exclude), chunk_items=1)
+    try:
+        for name, res in results:
+            tree.children[name] = res.tree
+            tops[name] = res.tree.total_size
+            result.errors.extend(res.errors)
+            result.dirs_scanned += res.dirs_scanned
+            result.dirs_reused += res.dirs_reused
+            if progress_cb is not None:
+                progress_cb(dict(tops), result.dirs_scanned + result.dirs_reused)
+    finally:
+        results.close()
+    aggregate(tree)
+    return result
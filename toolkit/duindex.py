@@ -0,0 +1,123 @@
+# toolkit/duindex.py
+"""
+Persistent disk-usage index.
+
+Stores the DirNode tree from the last scan of each root (a volume or any
+folder) in SQLite, one row per directory. ``update`` reloads that tree and
+hands it to ``scan_sizes`` as the previous state, so only directories
+whose mtime changed are listed again. The chart, empty-folder and folder
+search tools all read from the same index.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+from typing import Callable, Dict, Iterator, Optional
+
+from toolkit.appdata import data_dir
+from toolkit.du import DirNode, DuResult, aggregate, scan_sizes
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    root     TEXT    NOT NULL,
+    path     TEXT    NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size     INTEGER NOT NULL,
+    files    INTEGER NOT NULL,
+    entries  INTEGER NOT NULL,
+    PRIMARY KEY (root, path)
+);
+"""
+
+
+def default_index_path() -> str:
+    return os.path.join(data_dir(), "duindex.sqlite")
+
+
+def _key(root: str) -> str:
+    return os.path.normcase(os.path.abspath(root))
+
+
+class DiskUsageIndex:
+    """Open in the thread that uses it; SQLite connections are not shared."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or default_index_path()
+        self._db = sqlite3.connect(self.path, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        self.close()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def load(self, root: str) -> Optional[DirNode]:
+        """The stored tree for ``root``, or None if it was never scanned."""
+        rows = self._db.execute(
+            "SELECT path, mtime_ns, size, files, entries FROM dirs WHERE root=? ORDER BY path",
+            (_key(root),),
+        )
+        nodes: Dict[str, DirNode] = {}
+        tree = None
+        # a parent path sorts before its children, so parents are built first
+        for path, mtime_ns, size, files, entries in rows:
+            name = os.path.basename(path.rstrip("\\/")) or path
+            node = DirNode(path, name, size=size, files=files, entries=entries, mtime_ns=mtime_ns)
+            nodes[path] = node
+            if tree is None:
+                tree = node
+                continue
+            parent = nodes.get(os.path.dirname(path))
+            if parent is not None:
+                parent.children[name] = node
+        if tree is not None:
+            aggregate(tree)
+        return tree
+
+    def save(self, root: str, tree: DirNode) -> None:
+        key = _key(root)
+        with self._db:
+            self._db.execute("DELETE FROM dirs WHERE root=?", (key,))
+            self._db.executemany(
+                "INSERT INTO dirs VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (key, n.path, n.mtime_ns, n.size, n.files, n.entries)
+                    for n in tree.walk()
+                ),
+            )
+
+    def update(
+        self,
+        root: str,
+        full: bool = False,
+        workers: Optional[int] = None,
+        progress_cb: Optional[Callable[[Dict[str, int], int], None]] = None,
+        processes: int = 0,
+    ) -> DuResult:
+        """Rescan ``root`` (incrementally unless ``full``) and store the result."""
+        root = os.path.abspath(root)
+        previous = None if full else self.load(root)
+        result = scan_sizes(root, workers=workers, progress_cb=progress_cb, previous=previous,
+                            processes=processes)
+        self.save(root, result.tree)
+        return result
+
+
+def empty_dirs(tree: DirNode) -> Iterator[DirNode]:
+    """Folders below the root with nothing inside them."""
+    for node in tree.walk():
+        if node is not tree and not node.entries:
+            yield node
+
+
+def find_dirs(tree: DirNode, pattern: str) -> Iterator[DirNode]:
+    """Folders whose name contains ``pattern`` (case-insensitive)."""
+    pat = pattern.lower()
+    for node in tree.walk():
+        if pat in node.name.lower():
+            yield node
@@ -0,0 +1,294 @@
+# toolkit/dupes.py
+"""
+Duplicate file detection.
+
+Candidates are narrowed in three stages so that only likely duplicates are
+read in full:
+
+  1. Size        – files with a unique size cannot have a duplicate
+  2. Sample hash – head and tail of each same-size file
+  3. Full hash   – complete contents of the files that survived stage 2
+
+Files small enough for the sample to cover them entirely skip stage 3.
+Both hashing stages can be answered from a HashCache for unchanged files.
+Both stages use ``hashing.FAST_ALGO``, xxHash when it is installed.
+With ``processes`` the two hashing stages run on a process pool; the walk
+and the bucketing stay in the calling thread.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from toolkit import procpool
+from toolkit.fastio import feed
+from toolkit.hashcache import HashCache, Signature, signature
+from toolkit.hashing import FAST_ALGO, new_hasher
+from toolkit.tasks import Progress
+from toolkit.walker import Walker
+
+SAMPLE_SIZE = 64 * 1024
+CHUNK_SIZE = 1024 * 1024
+
+# cache keys; bump if the sampling scheme changes
+SAMPLE_ALGO = f"dupes-sample-{FAST_ALGO}"
+FULL_ALGO = f"dupes-full-{FAST_ALGO}"
+
+
+@dataclass
+class DupeStats:
+    files_seen: int = 0
+    bytes_seen: int = 0
+    hardlinks_skipped: int = 0
+    errors: int = 0
+    # candidates dropped at each stage
+    size_eliminated: int = 0
+    sample_eliminated: int = 0
+    full_eliminated: int = 0
+    # bytes actually read from disk per hashing stage
+    sample_bytes: int = 0
+    full_bytes: int = 0
+
+    @property
+    def bytes_hashed(self) -> int:
+        return self.sample_bytes + self.full_bytes
+
+
+@dataclass
+class DupeGroup:
+    size: int
+    digest: str
+    paths: List[str]
+
+    @property
+    def wasted(self) -> int:
+        return self.size * (len(self.paths) - 1)
+
+
+@dataclass
+class DupeReport:
+    groups: List[DupeGroup] = field(default_factory=list)
+    stats: DupeStats = field(default_factory=DupeStats)
+    cache_summary: str = ""
+
+    @property
+    def wasted_bytes(self) -> int:
+        return sum(g.wasted for g in self.groups)
+
+    def summary(self) -> str:
+        s = self.stats
+        return (
+            f"{len(self.groups)} sets, {self.wasted_bytes / 1024**2:.1f} MB wasted | "
+            f"seen {s.files_seen} files ({s.bytes_seen / 1024**2:.1f} MB), "
+            f"hashed {s.bytes_hashed / 1024**2:.1f} MB | "
+            f"eliminated size/sample/full: "
+            f"{s.size_eliminated}/{s.sample_eliminated}/{s.full_eliminated}"
+            + (f" | {self.cache_summary}" if self.cache_summary else "")
+        )
+
+
+def _sample_digest(path: str, size: int) -> Tuple[str, int]:
+    h = new_hasher(FAST_ALGO)
+    with open(path, "rb") as fp:
+        if size <= 2 * SAMPLE_SIZE:
+            data = fp.read()
+            h.update(data)
+            return h.hexdigest(), len(data)
+        h.update(fp.read(SAMPLE_SIZE))
+        fp.seek(-SAMPLE_SIZE, os.SEEK_END)
+        h.update(fp.read(SAMPLE_SIZE))
+    return h.hexdigest(), 2 * SAMPLE_SIZE
+
+
+def _full_digest(path: str, buf: Optional[bytearray] = None) -> Tuple[str, int]:
+    h = new_hasher(FAST_ALGO)
+    n = feed(path, h.update, "mmap", buf)
+    return h.hexdigest(), n
+
+
+# A digester maps (path, size) jobs to (path, size, digest, bytes_read)
+# results, digest None on error, in any order.
+Job = Tuple[str, int]
+Digested = Tuple[str, int, Optional[str], int]
+
+
+def _serial(digest_fn) -> Callable[[List[Job]], Iterator[Digested]]:
+    def digester(jobs):
+        for p, sz in jobs:
+            try:
+                digest, n = digest_fn(p, sz)
+            except OSError:
+                yield p, sz, None, 0
+                continue
+            yield p, sz, digest, n
+    return digester
+
+
+def _digest_chunk(chunk: List[Job], stage: str) -> List[Digested]:
+    """Process-pool worker: run the "sample" or "full" stage over a chunk of jobs."""
+    buf = bytearray(CHUNK_SIZE) if stage == "full" else None
+    out = []
+    for p, sz in chunk:
+        if procpool.cancelled():
+            break
+        try:
+            digest, n = _full_digest(p, buf) if buf is not None else _sample_digest(p, sz)
+        except OSError:
+            out.append((p, sz, None, 0))
+            continue
+        out.append((p, sz, digest, n))
+    return out
+
+
+def _pooled(stage: str, processes: int) -> Callable[[List[Job]], Iterator[Digested]]:
+    def digester(jobs):
+        weight = (lambda job: job[1]) if stage == "full" else None
+        return procpool.pool_map(_digest_chunk, jobs, processes, (stage,), weight=weight)
+    return digester
+
+
+def _cached(digester, algo, cache, sigs):
+    """Answer unchanged files from ``cache`` and store fresh digests in it."""
+    def cached(jobs):
+        misses = []
+        for p, sz in jobs:
+            hit = cache.get(p, algo, sigs[p])
+            if hit is None:
+                misses.append((p, sz))
+            else:
+                yield p, sz, hit, 0
+        results = digester(misses)
+        try:
+            for p, sz, digest, n in results:
+                if digest is not None:
+                    cache.put(p, algo, sigs[p], digest)
+                yield p, sz, digest, n
+        finally:
+            results.close()
+    return cached
+
+
+def _split(groups, digester, stats, progress=None):
+    """
+    Re-bucket every group by the digests from ``digester``. Returns the
+    buckets that still hold more than one file, plus the bytes read and
+    files eliminated.
+    """
+    buckets: Dict[Tuple[int, str], List[str]] = {}
+    read = 0
+    results = digester([(p, sz) for (sz, _), paths in groups for p in paths])
+    try:
+        for p, sz, digest, n in results:
+            if digest is None:
+                stats.errors += 1
+                continue
+            read += n
+            buckets.setdefault((sz, digest), []).append(p)
+            if progress is not None:
+                progress.advance(1, n)
+    finally:
+        results.close()
+    out = [(key, grp) for key, grp in buckets.items() if len(grp) > 1]
+    return out, read, len(buckets) - len(out)
+
+
+def collect_sizes(
+    root: str,
+    stats: DupeStats,
+    min_size: int = 1,
+    sigs: Optional[Dict[str, Signature]] = None,
+    walker: Optional[Walker] = None,
+    progress: Optional[Progress] = None,
+) -> Dict[int, List[str]]:
+    sizes: Dict[int, List[str]] = {}
+    seen_inodes = set()
+    walker = walker or Walker()
+    for entry in walker.files(root):
+        st = walker.stat(entry)
+        if st is None:
+            stats.errors += 1
+            continue
+        stats.files_seen += 1
+        stats.bytes_seen += st.st_size
+        if progress is not None:
+            progress.advance()
+        if st.st_size < min_size:
+            continue
+        # DirEntry leaves st_ino at 0 on Windows; only Unix gets link detection
+        if st.st_ino:
+            ident = (st.st_dev, st.st_ino)
+            if ident in seen_inodes:
+                stats.hardlinks_skipped += 1
+                continue
+            seen_inodes.add(ident)
+        sizes.setdefault(st.st_size, []).append(entry.path)
+        if sigs is not None:
+            sigs[entry.path] = signature(st)
+    return sizes
+
+
+def find_duplicates(
+    root: str,
+    status_cb: Optional[Callable[[str], None]] = None,
+    min_size: int = 1,
+    cache: Optional[HashCache] = None,
+    walker: Optional[Walker] = None,
+    progress: Optional[Progress] = None,
+    processes: int = 0,
+) -> DupeReport:
+    """
+    Return the sets of byte-identical files under ``root``.
+
+    Empty files are ignored unless ``min_size`` is 0. Hard links to an
+    already-seen inode are skipped since deleting them frees nothing.
+    ``progress`` gets one phase per pass and raises ``Cancelled`` to stop.
+    ``processes`` > 0 hashes on a pool of that many processes.
+    """
+    def status(msg, total_items=0, total_bytes=0):
+        if status_cb is not None:
+            status_cb(msg)
+        if progress is not None:
+            progress.begin(msg, total_items, total_bytes, unit="files")
+    report = DupeReport()
+    stats = report.stats
+    if processes:
+        sample_fn, full_fn = _pooled("sample", processes), _pooled("full", processes)
+    else:
+        buf = bytearray(CHUNK_SIZE)
+        sample_fn, full_fn = _serial(_sample_digest), _serial(lambda p, _sz: _full_digest(p, buf))
+
+    status("Scanning sizes …")
+    sigs = {} if cache is not None else None
+    sizes = collect_sizes(root, stats, min_size, sigs, walker, progress)
+    if cache is not None:
+        sample_fn = _cached(sample_fn, SAMPLE_ALGO, cache, sigs)
+        full_fn = _cached(full_fn, FULL_ALGO, cache, sigs)
+    groups = []
+    for sz, paths in sizes.items():
+        if len(paths) > 1:
+            groups.append(((sz, ""), paths))
+        else:
+            stats.size_eliminated += 1
+
+    count = sum(len(g) for _, g in groups)
+    status(f"Sampling {count} candidates …", total_items=count)
+    groups, stats.sample_bytes, stats.sample_eliminated = _split(groups, sample_fn, stats, progress)
+
+    # the sample already covered small files completely
+    done = [g for g in groups if g[0][0] <= 2 * SAMPLE_SIZE]
+    todo = [g for g in groups if g[0][0] > 2 * SAMPLE_SIZE]
+
+    count = sum(len(g) for _, g in todo)
+    # cache hits read nothing, so only a cold run can be measured in bytes
+    nbytes = sum(sz * len(g) for (sz, _), g in todo) if cache is None else 0
+    status(f"Hashing {count} candidates …", total_items=count, total_bytes=nbytes)
+    full, stats.full_bytes, stats.full_eliminated = _split(todo, full_fn, stats, progress)
+    done += full
+
+    for (sz, digest), paths in done:
+        report.groups.append(DupeGroup(sz, digest, sorted(paths)))
+    report.groups.sort(key=lambda g: g.wasted, reverse=True)
+    if cache is not None:
+        report.cache_summary = cache.summary()
+    return report
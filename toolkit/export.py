@@ -0,0 +1,147 @@
+# toolkit/export.py
+"""
+Streaming export of result records to CSV, JSON Lines or Parquet.
+
+A sink takes one flat dict per result and writes it out as it arrives,
+so a scan of millions of files never has to sit in memory or in a
+Treeview. CSV and JSONL rows are written straight through; Parquet is
+columnar, so rows are buffered and written as one row group per
+``batch_rows``. Parquet needs pyarrow, which is imported only when a
+Parquet sink is opened.
+
+The format is taken from the file extension unless given explicitly.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import os
+from typing import Any, Dict, List, Optional, Sequence
+
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ndjson": "jsonl", ".parquet": "parquet"}
+FILE_TYPES = [("CSV", "*.csv"), ("JSON Lines", "*.jsonl"), ("Parquet", "*.parquet")]
+BATCH_ROWS = 64 * 1024
+
+
+def format_for(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        return FORMATS[ext]
+    except KeyError:
+        raise ValueError(f"unknown export format {ext or path!r}; use .csv, .jsonl or .parquet") from None
+
+
+class Sink:
+    """Base class: ``write(record)`` per result, then ``close()`` (or use ``with``)."""
+
+    def __init__(self, path: str, fields: Optional[Sequence[str]] = None):
+        self.path = path
+        self.fields = list(fields) if fields else None
+        self.count = 0
+
+    def write(self, record: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        self.close()
+
+
+class CsvSink(Sink):
+    """Columns are ``fields``, or the keys of the first record."""
+
+    def __init__(self, path: str, fields: Optional[Sequence[str]] = None):
+        super().__init__(path, fields)
+        self._fp = open(path, "w", newline="", encoding="utf-8")
+        self._writer = None
+
+    def write(self, record: Dict[str, Any]) -> None:
+        if self._writer is None:
+            self.fields = self.fields or list(record)
+            self._writer = csv.DictWriter(self._fp, self.fields, extrasaction="ignore")
+            self._writer.writeheader()
+        self._writer.writerow(record)
+        self.count += 1
+
+    def close(self) -> None:
+        self._fp.close()
+
+
+class JsonlSink(Sink):
+    def __init__(self, path: str, fields: Optional[Sequence[str]] = None):
+        super().__init__(path, fields)
+        self._fp = open(path, "w", encoding="utf-8")
+
+    def write(self, record: Dict[str, Any]) -> None:
+        if self.fields:
+            record = {k: record.get(k) for k in self.fields}
+        self._fp.write(json.dumps(record, default=str) + "\n")
+        self.count += 1
+
+    def close(self) -> None:
+        self._fp.close()
+
+
+class ParquetSink(Sink):
+    """
+    The schema is inferred from the first batch and later batches are cast
+    to it. A column with no values in the first batch is written as
+    strings, so later values of any type still fit.
+    """
+
+    def __init__(self, path: str, fields: Optional[Sequence[str]] = None, batch_rows: int = BATCH_ROWS):
+        super().__init__(path, fields)
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet export needs pyarrow (pip install pyarrow)", name="pyarrow") from None
+        self._pa, self._pq = pa, pq
+        self.batch_rows = batch_rows
+        self._columns: Dict[str, List[Any]] = {k: [] for k in self.fields or ()}
+        self._pending = 0
+        self._writer = None
+
+    def write(self, record: Dict[str, Any]) -> None:
+        if self.fields is None:
+            self.fields = list(record)
+            self._columns = {k: [] for k in self.fields}
+        for k in self.fields:
+            self._columns[k].append(record.get(k))
+        self._pending += 1
+        self.count += 1
+        if self._pending >= self.batch_rows:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        table = self._pa.Table.from_pydict(self._columns)
+        if self._writer is None:
+            pa = self._pa
+            schema = pa.schema([f.with_type(pa.string()) if pa.types.is_null(f.type) else f
+                                for f in table.schema])
+            self._writer = self._pq.ParquetWriter(self.path, schema)
+            table = table.cast(schema)
+        else:
+            table = table.cast(self._writer.schema)
+        self._writer.write_table(table)
+        self._columns = {k: [] for k in self.fields}
+        self._pending = 0
+
+    def close(self) -> None:
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+
+
+_SINKS = {"csv": CsvSink, "jsonl": JsonlSink, "parquet": ParquetSink}
+
+
+def open_sink(path: str, fields: Optional[Sequence[str]] = None, fmt: Optional[str] = None) -> Sink:
+    return _SINKS[fmt or format_for(path)](path, fields)
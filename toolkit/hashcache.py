@@ -0,0 +1,126 @@
+# toolkit/hashcache.py
+"""
+Persistent cache of file digests.
+
+An entry is reused only while the file's size, mtime and inode are all
+unchanged, so a re-scan of an untouched tree costs one stat and one lookup
+per file instead of reading every byte. Entries are stamped with the time
+of the run that last used them; when the cache grows past ``max_entries``
+the least recently used ones are dropped.
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+from typing import Optional, Tuple
+
+from toolkit.appdata import data_dir
+
+DEFAULT_MAX_ENTRIES = 1_000_000
+COMMIT_EVERY = 5000
+
+Signature = Tuple[int, int, int]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    path      TEXT    NOT NULL,
+    algo      TEXT    NOT NULL,
+    size      INTEGER NOT NULL,
+    mtime_ns  INTEGER NOT NULL,
+    inode     INTEGER NOT NULL,
+    digest    TEXT    NOT NULL,
+    last_used REAL    NOT NULL,
+    PRIMARY KEY (path, algo)
+);
+CREATE INDEX IF NOT EXISTS hashes_lru ON hashes (last_used);
+"""
+
+
+def signature(st: os.stat_result) -> Signature:
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+def default_cache_path() -> str:
+    return os.path.join(data_dir(), "hashcache.sqlite")
+
+
+class HashCache:
+    """
+    SQLite-backed digest cache. A connection belongs to the thread that
+    opened it, so open the cache inside the worker that uses it.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path or default_cache_path()
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._stamp = time.time()
+        self._touched = []
+        self._writes = 0
+        self._db = sqlite3.connect(self.path, timeout=30)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        self.close()
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def summary(self) -> str:
+        return f"cache {self.hits} hits / {self.misses} misses ({self.hit_ratio:.0%})"
+
+    def get(self, path: str, algo: str, sig: Signature) -> Optional[str]:
+        row = self._db.execute(
+            "SELECT size, mtime_ns, inode, digest FROM hashes WHERE path=? AND algo=?",
+            (path, algo),
+        ).fetchone()
+        if row is None or tuple(row[:3]) != tuple(sig):
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._touched.append((self._stamp, path, algo))
+        return row[3]
+
+    def put(self, path: str, algo: str, sig: Signature, digest: str) -> None:
+        self._db.execute(
+            "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (path, algo, sig[0], sig[1], sig[2], digest, self._stamp),
+        )
+        self._writes += 1
+        if self._writes % COMMIT_EVERY == 0:
+            self._db.commit()
+
+    def evict(self) -> int:
+        """Drop least recently used entries beyond ``max_entries``."""
+        (count,) = self._db.execute("SELECT COUNT(*) FROM hashes").fetchone()
+        excess = count - self.max_entries
+        if excess <= 0:
+            return 0
+        self._db.execute(
+            "DELETE FROM hashes WHERE rowid IN "
+            "(SELECT rowid FROM hashes ORDER BY last_used LIMIT ?)",
+            (excess,),
+        )
+        return excess
+
+    def close(self) -> None:
+        if self._db is None:
+            return
+        if self._touched:
+            self._db.executemany(
+                "UPDATE hashes SET last_used=? WHERE path=? AND algo=?", self._touched
+            )
+            self._touched = []
+        self.evict()
+        self._db.commit()
+        self._db.close()
+        self._db = None
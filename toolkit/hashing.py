@@ -0,0 +1,272 @@
+# toolkit/hashing.py
+"""
+Parallel file hashing.
+
+hashlib releases the GIL while digesting large buffers, so a handful of
+threads reading with big reusable buffers keeps several cores and a fast
+disk busy at once. Results flow back through a bounded queue, which keeps
+memory flat when the consumer (usually the UI) is slower than the disks.
+Files are read through ``toolkit.fastio``, by default into one reusable
+buffer per worker, or memory-mapped with ``read_mode="mmap"``.
+
+With ``processes`` the files are hashed in chunks on a process pool
+(``toolkit.procpool``) instead, for machines with more cores than the
+threads can keep busy.
+
+Several algorithms can be asked for at once ("sha256,xxh3_64"); each
+buffer read is fed to every hasher, so the file is read only once. The
+xxHash family is used when the ``xxhash`` package is installed; it is not
+cryptographic but runs at memory speed, which is all that spotting
+changed or duplicate files needs. ``FAST_ALGO`` is the fastest available
+choice and falls back to a 128-bit BLAKE2b.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import queue
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from toolkit import procpool
+from toolkit.fastio import BUFFER_SIZE, feed
+from toolkit.hashcache import HashCache, signature
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+QUEUE_SIZE = 256
+CHUNK_FILES = 16  # per process-pool round trip
+
+_DONE = object()
+
+_CONSTRUCTORS: Dict[str, Callable[[], Any]] = {
+    "md5": hashlib.md5,
+    "sha1": hashlib.sha1,
+    "sha256": hashlib.sha256,
+    "sha512": hashlib.sha512,
+    "sha3_256": hashlib.sha3_256,
+    "blake2b": hashlib.blake2b,
+    "blake2b-128": lambda: hashlib.blake2b(digest_size=16),
+}
+if xxhash is not None:
+    _CONSTRUCTORS.update(xxh64=xxhash.xxh64, xxh3_64=xxhash.xxh3_64, xxh3_128=xxhash.xxh3_128)
+
+ALGORITHMS = tuple(_CONSTRUCTORS)
+FAST_ALGO = "xxh3_128" if xxhash is not None else "blake2b-128"
+
+Algos = Union[str, Sequence[str]]
+
+
+@dataclass
+class HashResult:
+    index: int
+    path: str
+    digest: Optional[str]  # of the first algorithm asked for
+    size: int = 0
+    error: Optional[str] = None
+    cached: bool = False
+    digests: Dict[str, str] = field(default_factory=dict)
+
+
+def parse_algos(algos: Algos) -> Tuple[str, ...]:
+    """
+    Validate ``"sha256,xxh3_64"`` or a sequence of names into a tuple
+    without repeats. ``"fast"`` stands for ``FAST_ALGO``.
+    """
+    names = algos.split(",") if isinstance(algos, str) else algos
+    out: List[str] = []
+    for name in names:
+        name = name.strip().lower()
+        if name == "fast":
+            name = FAST_ALGO
+        if name not in _CONSTRUCTORS:
+            hint = " (pip install xxhash)" if name.startswith("xxh") else ""
+            raise ValueError(f"unknown hash algorithm {name!r}{hint}; choose from {', '.join(ALGORITHMS)}")
+        if name not in out:
+            out.append(name)
+    if not out:
+        raise ValueError("no hash algorithm given")
+    return tuple(out)
+
+
+def new_hasher(algo: str):
+    """A fresh hasher with ``update``/``hexdigest`` for one of ``ALGORITHMS``."""
+    return _CONSTRUCTORS[algo]()
+
+
+def hash_file_multi(
+    path: str,
+    algos: Sequence[str],
+    buf: Optional[bytearray] = None,
+    read_mode: str = "readinto",
+) -> Tuple[Dict[str, str], int]:
+    """Return ``({algo: hexdigest}, bytes_read)`` from a single read of ``path``."""
+    hashers = [new_hasher(a) for a in algos]
+    if len(hashers) == 1:
+        update = hashers[0].update
+    else:
+        updates = [h.update for h in hashers]
+
+        def update(data):
+            for u in updates:
+                u(data)
+    total = feed(path, update, read_mode, buf)
+    return {a: h.hexdigest() for a, h in zip(algos, hashers)}, total
+
+
+def hash_file(
+    path: str,
+    algo: str = "md5",
+    buf: Optional[bytearray] = None,
+    read_mode: str = "readinto",
+) -> Tuple[str, int]:
+    """Return ``(hexdigest, bytes_read)``, reading into ``buf`` if given."""
+    digests, total = hash_file_multi(path, (algo,), buf, read_mode)
+    return digests[algo], total
+
+
+def _hash_one(i: int, p: str, algos: Sequence[str], buf: bytearray, read_mode: str) -> HashResult:
+    try:
+        digests, size = hash_file_multi(p, algos, buf, read_mode)
+    except OSError as exc:
+        return HashResult(i, p, None, error=str(exc))
+    return HashResult(i, p, digests[algos[0]], size, digests=digests)
+
+
+def _hash_chunk(chunk: List[Tuple[int, str]], algos: Sequence[str], read_mode: str) -> List[HashResult]:
+    """Process-pool worker: hash one chunk of ``(index, path)`` jobs."""
+    buf = bytearray(BUFFER_SIZE)
+    out = []
+    for i, p in chunk:
+        if procpool.cancelled():
+            break
+        out.append(_hash_one(i, p, algos, buf, read_mode))
+    return out
+
+
+def _threaded(todo, algos, workers, queue_size, read_mode) -> Iterator[HashResult]:
+    workers = max(1, min(workers or DEFAULT_WORKERS, len(todo) or 1))
+    results: "queue.Queue" = queue.Queue(maxsize=queue_size)
+    jobs = iter(todo)
+    jobs_lock = threading.Lock()
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                results.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def work():
+        try:
+            buf = bytearray(BUFFER_SIZE)
+            while not stop.is_set():
+                with jobs_lock:
+                    job = next(jobs, None)
+                if job is None:
+                    break
+                put(_hash_one(job[0], job[1], algos, buf, read_mode))
+        except BaseException as exc:  # not an OSError: a bug, or MemoryError
+            put(exc)  # raised by the consumer
+        finally:
+            put(_DONE)
+
+    threads = [threading.Thread(target=work, daemon=True) for _ in range(workers)]
+    for t in threads:
+        t.start()
+
+    running = workers
+    try:
+        while running:
+            item = results.get()
+            if item is _DONE:
+                running -= 1
+                continue
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+
+
+def hash_files(
+    paths: Iterable[str],
+    algo: Algos = "md5",
+    workers: Optional[int] = None,
+    ordered: bool = False,
+    queue_size: int = QUEUE_SIZE,
+    cache: Optional[HashCache] = None,
+    read_mode: str = "readinto",
+    processes: int = 0,
+) -> Iterator[HashResult]:
+    """
+    Hash ``paths`` on ``workers`` threads and yield a HashResult per file.
+    With ``processes`` > 0 a pool of that many processes does the reading
+    and hashing instead of the threads.
+
+    ``algo`` is one name or several (see ``parse_algos``); with several,
+    ``digests`` holds one per algorithm and ``digest`` the first.
+
+    Results arrive in completion order; ``index`` is the position in
+    ``paths`` so callers can sort. With ``ordered=True`` they are yielded
+    in input order instead. Closing the generator stops the workers.
+
+    With a ``cache``, unchanged files are answered from it without being
+    read and fresh digests are stored back. The cache is only touched from
+    the thread iterating this generator.
+    """
+    algos = parse_algos(algo)
+    paths = list(paths)
+    pending = {}
+    next_index = 0
+
+    def emit(item):
+        nonlocal next_index
+        if not ordered:
+            yield item
+            return
+        pending[item.index] = item
+        while next_index in pending:
+            yield pending.pop(next_index)
+            next_index += 1
+
+    sigs = {}
+    todo = list(enumerate(paths))
+    if cache is not None:
+        todo = []
+        for i, p in enumerate(paths):
+            try:
+                sig = signature(os.stat(p))
+            except OSError:
+                todo.append((i, p))
+                continue
+            digests = {a: cache.get(p, a, sig) for a in algos}
+            if None in digests.values():
+                sigs[i] = sig
+                todo.append((i, p))
+            else:
+                yield from emit(HashResult(i, p, digests[algos[0]], sig[0], cached=True, digests=digests))
+
+    if processes:
+        sizes = {i: sig[0] for i, sig in sigs.items()}
+        stream = procpool.pool_map(
+            _hash_chunk, todo, processes, (algos, read_mode),
+            chunk_items=CHUNK_FILES, weight=lambda job: sizes.get(job[0], 0),
+        )
+    else:
+        stream = _threaded(todo, algos, workers, queue_size, read_mode)
+    try:
+        for item in stream:
+            if item.index in sigs:
+                for a, digest in item.digests.items():
+                    cache.put(item.path, a, sigs[item.index], digest)
+            yield from emit(item)
+    finally:
+        stream.close()
@@ -0,0 +1,351 @@
+# toolkit/icmp.py
+"""
+In-process ICMP echo (ping) for IPv4, without one ping process per host.
+
+``open_pinger`` picks the first backend the OS allows:
+
+* "dgram": an unprivileged ICMP datagram socket (Linux with
+  ``net.ipv4.ping_group_range`` set, macOS);
+* "raw": a raw ICMP socket (administrator or root);
+* "api": on Windows without elevation, ``IcmpSendEcho`` from
+  iphlpapi.dll, the call ping.exe itself uses, one blocking call per
+  echo on a pool of threads.
+
+If none is available it raises ``IcmpUnavailable`` and callers fall back
+to TCP probes.
+
+The socket backends send every echo from one socket and match the
+replies on a receiver thread by address and sequence number, so
+``ping_many`` has thousands of echoes outstanding at once and needs no
+thread per host. RTTs are measured with ``time.perf_counter`` and
+reported in milliseconds; ``None`` means no reply within the timeout.
+"""
+from __future__ import annotations
+
+import ctypes
+import itertools
+import os
+import queue
+import random
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_TIMEOUT = 1.0
+DEFAULT_RATE = 1000  # echoes sent per second by ping_many
+API_WORKERS = 64
+
+_ECHO_REQUEST, _ECHO_REPLY = 8, 0
+_PAYLOAD = b"windows-power-toolkit-ping-32b.."  # 32 bytes, like ping.exe
+
+Reply = Tuple[str, Optional[float]]
+
+
+class IcmpUnavailable(OSError):
+    pass
+
+
+def _checksum(data: bytes) -> int:
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _echo_request(ident: int, seq: int) -> bytes:
+    header = struct.pack("!BBHHH", _ECHO_REQUEST, 0, 0, ident, seq)
+    return struct.pack("!BBHHH", _ECHO_REQUEST, 0, _checksum(header + _PAYLOAD), ident, seq) + _PAYLOAD
+
+
+def _parse_reply(data: bytes) -> Optional[Tuple[int, int]]:
+    """``(ident, seq)`` of an echo reply, with or without its IPv4 header."""
+    if data and data[0] >> 4 == 4:  # raw sockets (and macOS) include the IP header
+        data = data[(data[0] & 0x0F) * 4:]
+    if len(data) < 8 or data[0] != _ECHO_REPLY:
+        return None
+    _type, _code, _sum, ident, seq = struct.unpack("!BBHHH", data[:8])
+    return ident, seq
+
+
+def is_ipv4(host: str) -> bool:
+    try:
+        socket.inet_aton(host)
+    except OSError:
+        return False
+    return host.count(".") == 3
+
+
+class Pinger:
+    """Base class: ``ping`` one address, ``ping_many`` a batch, then ``close``."""
+
+    backend = ""
+
+    def ping(self, ip: str, timeout: float = DEFAULT_TIMEOUT) -> Optional[float]:
+        raise NotImplementedError
+
+    def ping_many(self, ips: Iterable[str], timeout: float = DEFAULT_TIMEOUT,
+                  rate: float = DEFAULT_RATE) -> Iterator[Reply]:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        self.close()
+
+
+class _SocketPinger(Pinger):
+    def __init__(self, sock: socket.socket, backend: str):
+        self.sock = sock
+        self.backend = backend
+        # a datagram socket's replies carry the kernel's ident, not ours
+        self.ident = os.getpid() & 0xFFFF
+        self._seq = itertools.count(random.randrange(0x10000))
+        self._lock = threading.Lock()
+        self._waiting: Dict[Tuple[str, int], Callable[[Tuple[str, int], float], None]] = {}
+        self._closed = False
+        self._thread = threading.Thread(target=self._receive, name="icmp-receive", daemon=True)
+        self._thread.start()
+
+    def _receive(self) -> None:
+        self.sock.settimeout(0.2)
+        while not self._closed:
+            try:
+                data, addr = self.sock.recvfrom(2048)
+            except socket.timeout:
+                continue
+            except OSError:
+                if self._closed:
+                    return
+                continue
+            now = time.perf_counter()
+            reply = _parse_reply(data)
+            if reply is None or (self.backend == "raw" and reply[0] != self.ident):
+                continue
+            with self._lock:
+                callback = self._waiting.pop((addr[0], reply[1]), None)
+            if callback is not None:
+                callback((addr[0], reply[1]), now)
+
+    def _send(self, ip: str, callback: Callable[[Tuple[str, int], float], None]) -> Tuple[str, int]:
+        """Send one echo; ``callback(key, arrival)`` runs on the receiver thread."""
+        key = (ip, next(self._seq) & 0xFFFF)
+        with self._lock:
+            self._waiting[key] = callback
+        try:
+            self.sock.sendto(_echo_request(self.ident, key[1]), (ip, 0))
+        except OSError:
+            self._forget(key)
+            raise
+        return key
+
+    def _forget(self, key: Tuple[str, int]) -> None:
+        with self._lock:
+            self._waiting.pop(key, None)
+
+    def ping(self, ip: str, timeout: float = DEFAULT_TIMEOUT) -> Optional[float]:
+        done = threading.Event()
+        arrival: List[float] = []
+
+        def on_reply(_key, now):
+            arrival.append(now)
+            done.set()
+
+        sent = time.perf_counter()
+        try:
+            key = self._send(ip, on_reply)
+        except OSError:
+            return None
+        if not done.wait(timeout):
+            self._forget(key)
+            return None
+        return (arrival[0] - sent) * 1000
+
+    def ping_many(self, ips: Iterable[str], timeout: float = DEFAULT_TIMEOUT,
+                  rate: float = DEFAULT_RATE) -> Iterator[Reply]:
+        """
+        Echo every address, ``rate`` per second, and yield ``(ip, rtt_ms)``
+        as replies arrive and ``(ip, None)`` once an address times out.
+        """
+        replies: "queue.Queue" = queue.Queue()
+        outstanding: Dict[Tuple[str, int], float] = {}
+        expiry: deque = deque()  # (deadline, key) in send order
+        interval = 1.0 / rate if rate else 0.0
+
+        def collect(until: float, last: bool = False) -> Iterator[Reply]:
+            """Yield replies and timeouts until ``until`` (perf_counter), or
+            once nothing is outstanding if ``last``."""
+            while not (last and not outstanding):
+                now = time.perf_counter()
+                while expiry and expiry[0][0] <= now:
+                    key = expiry.popleft()[1]
+                    if outstanding.pop(key, None) is not None:
+                        self._forget(key)
+                        yield key[0], None
+                try:
+                    key, rtt = replies.get(timeout=max(0.0, until - now) if until > now else 0)
+                except queue.Empty:
+                    return
+                if outstanding.pop(key, None) is not None:
+                    yield key[0], rtt
+
+        try:
+            next_send = time.perf_counter()
+            for ip in ips:
+                yield from collect(next_send)
+                sent = time.perf_counter()
+                try:
+                    key = self._send(ip, lambda key, now, s=sent: replies.put((key, (now - s) * 1000)))
+                except OSError:
+                    yield ip, None
+                    continue
+                outstanding[key] = sent
+                expiry.append((sent + timeout, key))
+                next_send = max(next_send + interval, sent)
+            while outstanding:
+                yield from collect(expiry[0][0] if expiry else time.perf_counter(), last=True)
+        finally:
+            for key in outstanding:
+                self._forget(key)
+
+    def close(self) -> None:
+        self._closed = True
+        self.sock.close()
+        self._thread.join(1.0)
+
+
+class _ICMP_ECHO_REPLY(ctypes.Structure):
+    _fields_ = [
+        ("Address", ctypes.c_ulong),
+        ("Status", ctypes.c_ulong),
+        ("RoundTripTime", ctypes.c_ulong),
+        ("DataSize", ctypes.c_ushort),
+        ("Reserved", ctypes.c_ushort),
+        ("Data", ctypes.c_void_p),
+        # IP_OPTION_INFORMATION
+        ("Ttl", ctypes.c_ubyte),
+        ("Tos", ctypes.c_ubyte),
+        ("Flags", ctypes.c_ubyte),
+        ("OptionsSize", ctypes.c_ubyte),
+        ("OptionsData", ctypes.c_void_p),
+    ]
+
+
+class _ApiPinger(Pinger):
+    """Windows ``IcmpSendEcho``; blocking, so ``ping_many`` runs on threads."""
+
+    backend = "api"
+
+    def __init__(self, workers: int = API_WORKERS):
+        from ctypes import wintypes
+
+        api = ctypes.WinDLL("iphlpapi.dll", use_last_error=True)
+        api.IcmpCreateFile.restype = wintypes.HANDLE
+        api.IcmpCloseHandle.argtypes = [wintypes.HANDLE]
+        api.IcmpSendEcho.argtypes = [
+            wintypes.HANDLE, ctypes.c_ulong, ctypes.c_char_p, ctypes.c_ushort,
+            ctypes.c_void_p, ctypes.c_void_p, wintypes.DWORD, wintypes.DWORD,
+        ]
+        api.IcmpSendEcho.restype = wintypes.DWORD
+        self._api = api
+        self.workers = workers
+        self._local = threading.local()
+        self._handles: List[int] = []
+        self._lock = threading.Lock()
+        self._reply_size = ctypes.sizeof(_ICMP_ECHO_REPLY) + len(_PAYLOAD) + 8
+
+    def _handle(self):
+        handle = getattr(self._local, "handle", None)
+        if handle is None:
+            handle = self._api.IcmpCreateFile()
+            if not handle or handle == ctypes.c_void_p(-1).value:
+                raise ctypes.WinError(ctypes.get_last_error())
+            self._local.handle = handle
+            with self._lock:
+                self._handles.append(handle)
+        return handle
+
+    def ping(self, ip: str, timeout: float = DEFAULT_TIMEOUT) -> Optional[float]:
+        if not is_ipv4(ip):
+            return None
+        addr = struct.unpack("<I", socket.inet_aton(ip))[0]  # IPAddr is in network order
+        reply = ctypes.create_string_buffer(self._reply_size)
+        start = time.perf_counter()
+        n = self._api.IcmpSendEcho(self._handle(), addr, _PAYLOAD, len(_PAYLOAD), None,
+                                   reply, self._reply_size, max(1, int(timeout * 1000)))
+        elapsed = time.perf_counter() - start
+        if not n or _ICMP_ECHO_REPLY.from_buffer(reply).Status != 0:
+            return None
+        return elapsed * 1000
+
+    def ping_many(self, ips: Iterable[str], timeout: float = DEFAULT_TIMEOUT,
+                  rate: float = DEFAULT_RATE) -> Iterator[Reply]:
+        """
+        Echo every address, ``rate`` per second and at most ``workers`` at
+        once, and yield ``(ip, rtt_ms)`` as each echo finishes. ``ips`` is
+        read only as echoes are sent, so it may skip hosts found meanwhile.
+        """
+        pool = ThreadPoolExecutor(self.workers)
+        running: Dict = {}  # future -> ip
+        interval = 1.0 / rate if rate else 0.0
+
+        def reap(wait_for: Optional[float]) -> Iterator[Reply]:
+            done, _ = wait(running, wait_for, FIRST_COMPLETED)
+            for fut in done:
+                yield running.pop(fut), fut.result()
+
+        try:
+            next_send = time.perf_counter()
+            for ip in ips:
+                while True:
+                    left = next_send - time.perf_counter()
+                    if len(running) < self.workers and left <= 0:
+                        break
+                    if len(running) >= self.workers:
+                        yield from reap(None)
+                    elif running:
+                        yield from reap(left)
+                    else:
+                        time.sleep(left)
+                sent = time.perf_counter()
+                running[pool.submit(self.ping, ip, timeout)] = ip
+                next_send = max(next_send + interval, sent)
+            while running:
+                yield from reap(None)
+        finally:
+            for fut in running:
+                fut.cancel()
+            pool.shutdown(wait=True)
+
+    def close(self) -> None:
+        with self._lock:
+            for handle in self._handles:
+                self._api.IcmpCloseHandle(handle)
+            self._handles.clear()
+
+
+def open_pinger() -> Pinger:
+    """The first ICMP backend this process may use; IcmpUnavailable if none."""
+    errors = []
+    for kind, backend in ((socket.SOCK_DGRAM, "dgram"), (socket.SOCK_RAW, "raw")):
+        if kind == socket.SOCK_DGRAM and os.name == "nt":
+            continue  # Windows has no unprivileged ICMP sockets
+        try:
+            return _SocketPinger(socket.socket(socket.AF_INET, kind, socket.IPPROTO_ICMP), backend)
+        except OSError as exc:
+            errors.append(f"{backend}: {exc.strerror or exc}")
+    if os.name == "nt":
+        try:
+            return _ApiPinger()
+        except OSError as exc:
+            errors.append(f"api: {exc}")
+    raise IcmpUnavailable("ICMP is not permitted here (" + "; ".join(errors) + ")")
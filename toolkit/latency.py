@@ -0,0 +1,242 @@
+# toolkit/latency.py
+"""
+Ping engine: structured samples and statistics, one target or many.
+
+A target is a host, pinged with ICMP echo through ``toolkit.icmp``, or
+``host:port`` (``[v6addr]:port``), pinged with a TCP connect. That times
+the handshake, which works where ICMP is filtered or not permitted.
+Prefer an open port: on Windows a refused connect is retried for about a
+second, so a closed port there says nothing about the round trip.
+
+``monitor`` pings every target once per ``interval``. The echoes go out
+together from one ICMP socket and the connects run together on one event
+loop, so watching dozens of gateways costs no process or thread per
+target. Every round yields one Sample per target; ``rtt_ms`` is None for
+a lost probe. ``PingStats`` keeps the running numbers per target:
+
+* loss, min, mean, max and standard deviation (Welford's method);
+* jitter: the mean difference between consecutive replies, as most
+  ping tools report it;
+* percentiles from a ``LatencyHistogram``, so hours of monitoring take
+  constant memory;
+* the last ``window`` samples, for a rolling plot.
+"""
+from __future__ import annotations
+
+import math
+import socket
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from toolkit import icmp, portscan
+from toolkit.histogram import PERCENTILES, LatencyHistogram
+from toolkit.resolver import default_resolver
+
+DEFAULT_INTERVAL = 1.0
+DEFAULT_TIMEOUT = 1.0
+WINDOW = 300
+
+
+@dataclass
+class Target:
+    name: str  # as given, e.g. "gw1" or "gw1:443"
+    host: str
+    port: int  # 0: ICMP echo, else TCP connect
+    family: int
+    sockaddr: tuple
+
+
+@dataclass
+class Sample:
+    target: str
+    seq: int
+    rtt_ms: Optional[float]  # None: no answer within the timeout
+    time: float  # wall clock when the round started
+
+
+class PingStats:
+    """Running statistics of one target's samples."""
+
+    def __init__(self, window: int = WINDOW):
+        self.sent = 0
+        self.received = 0
+        self.min = self.max = 0.0
+        self._mean = self._m2 = 0.0
+        self._jitter_sum = 0.0
+        self._jitter_n = 0
+        self._last: Optional[float] = None
+        self.histogram = LatencyHistogram()
+        self.recent: deque = deque(maxlen=window)  # (time, rtt_ms or None)
+
+    def add(self, sample: Sample) -> None:
+        self.sent += 1
+        self.recent.append((sample.time, sample.rtt_ms))
+        rtt = sample.rtt_ms
+        if rtt is None:
+            return
+        self.received += 1
+        if self.received == 1:
+            self.min = self.max = rtt
+        else:
+            self.min, self.max = min(self.min, rtt), max(self.max, rtt)
+        delta = rtt - self._mean
+        self._mean += delta / self.received
+        self._m2 += delta * (rtt - self._mean)
+        if self._last is not None:
+            self._jitter_sum += abs(rtt - self._last)
+            self._jitter_n += 1
+        self._last = rtt
+        self.histogram.record(int(rtt * 1000))  # microseconds
+
+    @property
+    def loss_pct(self) -> float:
+        return 100.0 * (self.sent - self.received) / self.sent if self.sent else 0.0
+
+    @property
+    def mean(self) -> float:
+        return self._mean
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self._m2 / self.received) if self.received else 0.0
+
+    @property
+    def jitter(self) -> float:
+        return self._jitter_sum / self._jitter_n if self._jitter_n else 0.0
+
+    def percentile(self, p: float) -> float:
+        """RTT in ms at percentile ``p`` (0–100) of the replies."""
+        return self.histogram.percentile(p) / 1000
+
+    def summary(self) -> Dict[str, float]:
+        out = {
+            "sent": self.sent, "received": self.received, "loss_pct": round(self.loss_pct, 1),
+            "min_ms": self.min, "avg_ms": self.mean, "max_ms": self.max,
+            "stddev_ms": self.stddev, "jitter_ms": self.jitter,
+        }
+        for p in PERCENTILES:
+            out[f"p{p:g}_ms"] = self.percentile(p)
+        return {k: round(v, 3) if isinstance(v, float) else v for k, v in out.items()}
+
+
+def parse_target(text: str) -> Tuple[str, int]:
+    """``"host"`` → ``(host, 0)``; ``"host:443"`` or ``"[::1]:443"`` → ``(host, 443)``."""
+    text = text.strip()
+    if text.startswith("["):
+        host, sep, rest = text[1:].partition("]")
+        port = rest[1:] if rest.startswith(":") else ""
+        if not sep or (rest and not port):
+            raise ValueError(f"bad target {text!r}")
+    elif text.count(":") == 1:
+        host, port = text.split(":")
+    else:
+        host, port = text, ""  # a name, an IPv4 address or a bare IPv6 address
+    if not host:
+        raise ValueError(f"bad target {text!r}")
+    if not port:
+        return host, 0
+    if not port.isdigit() or not 0 < int(port) < 65536:
+        raise ValueError(f"bad port in {text!r}")
+    return host, int(port)
+
+
+def resolve_targets(specs: Sequence[str]) -> Tuple[List[Target], List[Tuple[str, str]]]:
+    """``(targets, [(spec, error)])``. ICMP targets resolve to IPv4 only."""
+    parsed = {spec: parse_target(spec) for spec in specs}
+    addrs, failed = default_resolver().resolve_all(dict.fromkeys(host for host, _port in parsed.values()))
+    errors = dict(failed)
+    targets, failed = [], []
+    for spec, (host, port) in parsed.items():
+        if host in errors:
+            failed.append((spec, errors[host]))
+            continue
+        family, sockaddr = addrs[host]
+        if not port:
+            v4 = [a for a in default_resolver().lookup(host) if a[0] == socket.AF_INET]
+            if not v4:
+                failed.append((spec, "no IPv4 address for ICMP; use HOST:PORT"))
+                continue
+            family, sockaddr = v4[0]
+        targets.append(Target(spec, host, port, family, sockaddr))
+    return targets, failed
+
+
+def _tcp_round(targets: Sequence[Target], timeout: float) -> Dict[str, Optional[float]]:
+    addrs = {t.name: (t.family, t.sockaddr) for t in targets}
+    rtts: Dict[str, Optional[float]] = {}
+    # min_timeout = timeout: a fixed wait, not one adapted to earlier answers
+    for r in portscan.run([(t.name, t.port) for t in targets], addrs, len(targets),
+                          timeout=timeout, min_timeout=timeout):
+        rtts[r.host] = r.rtt_ms if r.state in ("open", "closed") else None
+    return rtts
+
+
+def monitor(
+    targets: Sequence[Target],
+    interval: float = DEFAULT_INTERVAL,
+    timeout: float = DEFAULT_TIMEOUT,
+    count: int = 0,
+    pinger: Optional[icmp.Pinger] = None,
+) -> Iterator[List[Sample]]:
+    """
+    Ping every target once per ``interval`` and yield each round's
+    samples, in target order; ``count`` rounds, or until closed if 0. A
+    round waits for its slowest answer, up to ``timeout``, so a timeout
+    longer than the interval stretches the rounds.
+
+    ICMP targets use ``pinger``, or one opened (and closed) here; that
+    raises IcmpUnavailable when this process may not send ICMP.
+    """
+    by_ip: Dict[str, List[str]] = {}
+    tcp = [t for t in targets if t.port]
+    for t in targets:
+        if not t.port:
+            by_ip.setdefault(t.sockaddr[0], []).append(t.name)
+    own_pinger = None
+    if by_ip and pinger is None:
+        try:
+            pinger = own_pinger = icmp.open_pinger()
+        except icmp.IcmpUnavailable as exc:
+            raise icmp.IcmpUnavailable(f"{exc}; use HOST:PORT for a TCP ping") from None
+    pool = ThreadPoolExecutor(1) if tcp and by_ip else None
+    seq = 0
+    try:
+        next_round = time.monotonic()
+        while True:
+            began = time.time()
+            tcp_rtts = pool.submit(_tcp_round, tcp, timeout) if pool else None
+            rtts: Dict[str, Optional[float]] = {}
+            if by_ip:
+                for ip, rtt in pinger.ping_many(list(by_ip), timeout, rate=0):
+                    for name in by_ip[ip]:
+                        rtts[name] = rtt
+            if tcp_rtts is not None:
+                rtts.update(tcp_rtts.result())
+            elif tcp:
+                rtts.update(_tcp_round(tcp, timeout))
+            yield [Sample(t.name, seq, rtts.get(t.name), began) for t in targets]
+            seq += 1
+            if count and seq >= count:
+                break
+            # a fixed schedule, but a round that overran is not made up for
+            next_round = max(next_round + interval, time.monotonic())
+            time.sleep(max(0.0, next_round - time.monotonic()))
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True)
+        if own_pinger is not None:
+            own_pinger.close()
+
+
+def ping(
+    target: Target,
+    count: int = 4,
+    interval: float = DEFAULT_INTERVAL,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> Iterator[Sample]:
+    """One target's samples, like the ping tool; ``count`` 0 pings until closed."""
+    for samples in monitor([target], interval, timeout, count):
+        yield samples[0]
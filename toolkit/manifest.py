@@ -0,0 +1,355 @@
+# toolkit/manifest.py
+"""
+Checksum manifests: write one for a tree, verify a tree against one.
+
+Two formats, chosen by file extension:
+
+* text (anything but ``.json``): the ``sha256sum`` line format,
+  ``<digest>  <path>``, with one algorithm, so ``sha256sum -c`` run in the
+  root folder accepts it;
+* JSON (``.json``): also records each file's size and mtime and can hold
+  several digests per file.
+
+Paths are stored relative to the root with ``/`` separators, so the
+manifest of a source folder can verify its robocopy mirror or a restored
+backup somewhere else.
+
+``verify`` walks the tree once and reports missing and new files without
+reading them. When the manifest has sizes, a size difference is reported
+as a mismatch straight away. Only the remaining files are re-hashed,
+largest first, in parallel through ``hashing.hash_files``. Verification
+never uses the hash cache, because the point is to read the bytes that
+are on disk now.
+"""
+from __future__ import annotations
+
+import json
+import os
+import stat as stat_mod
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from toolkit.hashcache import HashCache
+from toolkit.hashing import Algos, hash_files, parse_algos
+from toolkit.tasks import Progress
+from toolkit.walker import Walker
+
+FILE_TYPES = [("sha256sum", "*.sha256"), ("JSON manifest", "*.json"), ("All files", "*.*")]
+STATUSES = ("ok", "mismatch", "missing", "new", "error")
+
+# text manifests name their algorithm by extension, else by digest length
+_EXT_ALGOS = {".md5": "md5", ".sha1": "sha1", ".sha256": "sha256", ".sha512": "sha512", ".b2": "blake2b"}
+_LEN_ALGOS = {32: "md5", 40: "sha1", 64: "sha256", 128: "sha512"}
+# verify with the fastest algorithm a manifest has
+_PREFERRED = ("xxh3_128", "xxh3_64", "xxh64", "blake2b-128")
+
+
+@dataclass
+class Entry:
+    path: str  # relative to the root, "/"-separated
+    digests: Dict[str, str]
+    size: Optional[int] = None
+    mtime: Optional[float] = None
+
+
+@dataclass
+class Manifest:
+    algos: Tuple[str, ...]
+    entries: List[Entry] = field(default_factory=list)
+    root: str = ""
+    created: float = 0.0
+
+
+@dataclass
+class VerifyItem:
+    status: str  # one of STATUSES
+    path: str
+    expected: Optional[str] = None
+    actual: Optional[str] = None
+    detail: str = ""
+
+
+@dataclass
+class VerifyReport:
+    algo: str = ""
+    counts: Dict[str, int] = field(default_factory=lambda: dict.fromkeys(STATUSES, 0))
+    bytes_read: int = 0
+
+    def add(self, item: VerifyItem) -> None:
+        self.counts[item.status] += 1
+
+    @property
+    def problems(self) -> int:
+        return sum(n for status, n in self.counts.items() if status != "ok")
+
+    def summary(self) -> str:
+        c = self.counts
+        return (
+            f"{c['ok']} ok, {c['mismatch']} mismatched, {c['missing']} missing, "
+            f"{c['new']} new, {c['error']} unreadable | {self.algo}, "
+            f"{self.bytes_read / 1024**2:.1f} MB read"
+        )
+
+
+def _rel(path: str, root: str) -> str:
+    return os.path.relpath(path, root).replace(os.sep, "/")
+
+
+def _key(rel: str) -> str:
+    return os.path.normcase(os.path.normpath(rel.replace("/", os.sep)))
+
+
+def _is_text(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() != ".json"
+
+
+def _regular_files(root: str, skip: Iterable[str], errors: List[Tuple[str, str]]):
+    """``(path, stat)`` of every regular file under ``root`` except ``skip``."""
+    skip = {os.path.normcase(os.path.abspath(p)) for p in skip}
+    walker = Walker()
+    for entry in walker.files(root):
+        if skip and os.path.normcase(os.path.abspath(entry.path)) in skip:
+            continue
+        st = walker.stat(entry)
+        if st is not None and stat_mod.S_ISREG(st.st_mode):
+            yield entry.path, st
+    errors.extend(walker.errors)
+
+
+# -------- writing
+
+def create(
+    root: str,
+    algos: Algos = "sha256",
+    files: Optional[Sequence[str]] = None,
+    workers: Optional[int] = None,
+    processes: int = 0,
+    cache: Optional[HashCache] = None,
+    read_mode: str = "readinto",
+    progress: Optional[Progress] = None,
+    skip: Iterable[str] = (),
+) -> Tuple[Manifest, List[Tuple[str, str]]]:
+    """
+    Hash ``files`` (default: every file under ``root``) and return the
+    manifest plus ``(path, error)`` for the files that could not be read.
+    ``skip`` leaves out paths such as the manifest being written.
+    """
+    algos = parse_algos(algos)
+    errors: List[Tuple[str, str]] = []
+    if files is None:
+        found = list(_regular_files(root, skip, errors))
+    else:
+        found = []
+        for p in files:
+            try:
+                found.append((p, os.stat(p)))
+            except OSError as exc:
+                errors.append((p, str(exc)))
+    stats = dict(found)
+    if progress is not None:
+        progress.begin(f"Hashing {len(found)} files …", total_items=len(found),
+                       total_bytes=sum(st.st_size for _, st in found), unit="files")
+
+    manifest = Manifest(algos, root=os.path.abspath(root), created=time.time())
+    results = hash_files(list(stats), algos, workers=workers, cache=cache, read_mode=read_mode, processes=processes)
+    try:
+        for res in results:
+            if res.digest is None:
+                errors.append((res.path, res.error or "unreadable"))
+            else:
+                st = stats[res.path]
+                manifest.entries.append(Entry(_rel(res.path, root), res.digests, st.st_size, st.st_mtime))
+            if progress is not None:
+                progress.advance(1, 0 if res.cached else res.size)
+    finally:
+        results.close()
+    manifest.entries.sort(key=lambda e: e.path)
+    return manifest, errors
+
+
+def _escape(name: str) -> Tuple[str, str]:
+    """sha256sum's escaping: a leading backslash marks an escaped name."""
+    if "\\" not in name and "\n" not in name and "\r" not in name:
+        return "", name
+    return "\\", name.replace("\\", "\\\\").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def _unescape(name: str) -> str:
+    out, i = [], 0
+    while i < len(name):
+        c = name[i]
+        if c == "\\" and i + 1 < len(name):
+            i += 1
+            c = {"n": "\n", "r": "\r"}.get(name[i], name[i])
+        out.append(c)
+        i += 1
+    return "".join(out)
+
+
+def text_algo(path: str, algos: Sequence[str]) -> Optional[str]:
+    """
+    The algorithm a manifest at ``path`` is written with: None for JSON,
+    else the one its extension names or the first of ``algos``. Raises
+    ValueError when the extension names one that is not in ``algos``.
+    """
+    if not _is_text(path):
+        return None
+    algo = _EXT_ALGOS.get(os.path.splitext(path)[1].lower())
+    if algo is None:
+        return algos[0]
+    if algo not in algos:
+        raise ValueError(f"{os.path.basename(path)} needs {algo} digests, not {', '.join(algos)}")
+    return algo
+
+
+def write(manifest: Manifest, path: str) -> None:
+    algo = text_algo(path, manifest.algos)
+    if algo is not None:
+        with open(path, "w", encoding="utf-8", newline="\n") as fp:
+            for e in manifest.entries:
+                prefix, name = _escape(e.path)
+                fp.write(f"{prefix}{e.digests[algo]}  {name}\n")
+        return
+    doc = {
+        "format": "toolkit-manifest",
+        "version": 1,
+        "root": manifest.root,
+        "created": manifest.created,
+        "algos": list(manifest.algos),
+        "files": [{"path": e.path, "size": e.size, "mtime": e.mtime, "digests": e.digests}
+                  for e in manifest.entries],
+    }
+    with open(path, "w", encoding="utf-8") as fp:
+        json.dump(doc, fp, indent=1)
+
+
+# -------- reading
+
+def _read_text(path: str) -> Manifest:
+    algo = _EXT_ALGOS.get(os.path.splitext(path)[1].lower())
+    entries = []
+    with open(path, encoding="utf-8-sig") as fp:
+        for n, line in enumerate(fp, 1):
+            line = line.rstrip("\r\n")
+            if not line.strip():
+                continue
+            escaped = line.startswith("\\")
+            if escaped:
+                line = line[1:]
+            digest, _, rest = line.partition(" ")
+            if not digest or rest[:1] not in (" ", "*") or len(rest) < 2:
+                raise ValueError(f"{path}:{n}: not a checksum line")
+            name = _unescape(rest[1:]) if escaped else rest[1:]
+            if algo is None:
+                algo = _LEN_ALGOS.get(len(digest))
+                if algo is None:
+                    raise ValueError(f"{path}: cannot tell the algorithm of a {len(digest)}-digit digest")
+            entries.append(Entry(name, {algo: digest.lower()}))
+    return Manifest((algo or "sha256",), entries)
+
+
+def read(path: str) -> Manifest:
+    """Load a text or JSON manifest; ValueError if it is malformed."""
+    if _is_text(path):
+        return _read_text(path)
+    with open(path, encoding="utf-8") as fp:
+        try:
+            doc = json.load(fp)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"{path}: {exc}") from None
+    if not isinstance(doc, dict) or doc.get("format") != "toolkit-manifest":
+        raise ValueError(f"{path}: not a toolkit manifest")
+    entries = [Entry(f["path"], f["digests"], f.get("size"), f.get("mtime")) for f in doc["files"]]
+    return Manifest(tuple(doc["algos"]), entries, doc.get("root", ""), doc.get("created", 0.0))
+
+
+# -------- verifying
+
+def default_root(manifest: Manifest, path: str) -> str:
+    """
+    Like ``sha256sum -c``, the folder the manifest at ``path`` is in,
+    unless a JSON manifest's recorded root still exists.
+    """
+    if manifest.root and os.path.isdir(manifest.root):
+        return manifest.root
+    return os.path.dirname(os.path.abspath(path))
+
+
+def _verify_algo(manifest: Manifest, algo: Optional[str]) -> str:
+    if algo is None:
+        algo = next((a for a in _PREFERRED if a in manifest.algos), None)
+        if algo is None:
+            algo = manifest.algos[0]
+    elif algo not in manifest.algos:
+        raise ValueError(f"the manifest has no {algo} digests, only {', '.join(manifest.algos)}")
+    return parse_algos(algo)[0]
+
+
+def verify(
+    manifest: Manifest,
+    root: str,
+    algo: Optional[str] = None,
+    workers: Optional[int] = None,
+    processes: int = 0,
+    read_mode: str = "readinto",
+    progress: Optional[Progress] = None,
+    report: Optional[VerifyReport] = None,
+    skip: Iterable[str] = (),
+) -> Iterator[VerifyItem]:
+    """
+    Compare the files under ``root`` with ``manifest`` and yield a
+    VerifyItem per file: missing, new and size mismatches first, then the
+    re-hashed files in completion order. ``report`` is updated as items
+    are yielded. Closing the generator stops the hashing.
+    """
+    algo = _verify_algo(manifest, algo)
+    report = report if report is not None else VerifyReport()
+    report.algo = algo
+    if progress is not None:
+        progress.begin("Comparing …", unit="files")
+
+    errors: List[Tuple[str, str]] = []
+    on_disk = {_key(_rel(p, root)): (p, st.st_size) for p, st in _regular_files(root, skip, errors)}
+
+    def emit(item):
+        report.add(item)
+        return item
+
+    for p, err in errors:
+        yield emit(VerifyItem("error", _rel(p, root), detail=err))
+
+    todo: List[Tuple[str, int, Entry]] = []
+    for e in manifest.entries:
+        found = on_disk.pop(_key(e.path), None)
+        if found is None:
+            yield emit(VerifyItem("missing", e.path, expected=e.digests[algo]))
+        elif e.size is not None and e.size != found[1]:
+            yield emit(VerifyItem("mismatch", e.path, expected=e.digests[algo],
+                                  detail=f"size {e.size} != {found[1]}"))
+        else:
+            todo.append((found[0], found[1], e))
+    for p, _size in on_disk.values():
+        yield emit(VerifyItem("new", _rel(p, root)))
+
+    # largest first, so one big file does not run alone at the end
+    todo.sort(key=lambda t: t[1], reverse=True)
+    if progress is not None:
+        progress.begin(f"Verifying {len(todo)} files …", total_items=len(todo),
+                       total_bytes=sum(t[1] for t in todo), unit="files")
+    results = hash_files([t[0] for t in todo], algo, workers=workers, read_mode=read_mode, processes=processes)
+    try:
+        for res in results:
+            e = todo[res.index][2]
+            if res.digest is None:
+                item = VerifyItem("error", e.path, expected=e.digests[algo], detail=res.error or "")
+            elif res.digest.lower() != e.digests[algo].lower():
+                item = VerifyItem("mismatch", e.path, expected=e.digests[algo], actual=res.digest)
+            else:
+                item = VerifyItem("ok", e.path, expected=e.digests[algo], actual=res.digest)
+            report.bytes_read += res.size
+            if progress is not None:
+                progress.advance(1, res.size)
+            yield emit(item)
+    finally:
+        results.close()
@@ -0,0 +1,213 @@
+# toolkit/nameindex.py
+"""
+Prebuilt file-name index for fast repeated searches.
+
+One walk of a root records every entry in parallel arrays (parent folder,
+name, size, mtime, type) plus a trigram table mapping each three-letter
+sequence of a lower-cased name to the sorted ids of the entries containing
+it. A substring query intersects the posting lists of its trigrams and
+only checks the few survivors; glob queries do the same with the literal
+parts of the pattern. Regex queries and terms shorter than three
+characters fall back to a scan of the name column, which is still far
+cheaper than walking the disk.
+
+Indexes are pickled per root under the toolkit data folder.
+"""
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import os
+import pickle
+import re
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional
+
+from toolkit.appdata import data_dir
+from toolkit.walker import Walker
+
+FORMAT_VERSION = 1
+MODES = ("substring", "glob", "regex")
+# what fnmatch treats as wildcards: * ? and whole [...] classes ("]" may
+# come first in a class); an unclosed "[" is a literal
+_GLOB_WILDCARDS = re.compile(r"\[!?\]?[^\]]*\]|[*?]")
+
+
+@dataclass
+class Hit:
+    path: str
+    is_dir: bool
+    size: int
+    mtime: float
+
+
+def _trigrams(text: str):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def index_path(root: str) -> str:
+    key = hashlib.sha1(os.path.normcase(os.path.abspath(root)).encode("utf-8")).hexdigest()
+    folder = os.path.join(data_dir(), "nameindex")
+    os.makedirs(folder, exist_ok=True)
+    return os.path.join(folder, f"{key}.idx")
+
+
+class NameIndex:
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self.built_at = 0.0
+        self.dirs: List[str] = []
+        self.names: List[str] = []
+        self.lower: List[str] = []
+        self.parent = array("I")
+        self.size = array("q")
+        self.mtime = array("d")
+        self.is_dir = bytearray()
+        self.grams: Dict[str, array] = {}
+        self.errors = 0
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    # -------- building / persistence
+
+    @classmethod
+    def build(cls, root: str, status_cb: Optional[Callable[[str], None]] = None,
+              walker: Optional[Walker] = None) -> "NameIndex":
+        idx = cls(root)
+        walker = walker or Walker()
+        dir_ids: Dict[str, int] = {}
+        for scan in walker.walk(idx.root):
+            if status_cb and len(idx.dirs) % 500 == 0:
+                status_cb(f"Indexing {scan.path} …")
+            dir_ids[scan.path] = len(idx.dirs)
+            idx.dirs.append(scan.path)
+            pid = dir_ids[scan.path]
+            for flag, entries in ((1, scan.dirs), (0, scan.files)):
+                for e in entries:
+                    st = walker.stat(e)
+                    idx._add(pid, e.name, flag, st.st_size if st else 0, st.st_mtime if st else 0.0)
+        idx.errors = len(walker.errors)
+        idx.built_at = time.time()
+        return idx
+
+    def _add(self, pid: int, name: str, flag: int, size: int, mtime: float) -> None:
+        i = len(self.names)
+        low = name.lower()
+        self.names.append(name)
+        self.lower.append(low)
+        self.parent.append(pid)
+        self.size.append(size)
+        self.mtime.append(mtime)
+        self.is_dir.append(flag)
+        for g in _trigrams(low):
+            post = self.grams.get(g)
+            if post is None:
+                post = self.grams[g] = array("I")
+            post.append(i)
+
+    def save(self, path: Optional[str] = None) -> str:
+        path = path or index_path(self.root)
+        state = dict(self.__dict__)
+        del state["lower"]  # rebuilt on load
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as fp:
+            pickle.dump((FORMAT_VERSION, state), fp, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, root: str, path: Optional[str] = None) -> Optional["NameIndex"]:
+        path = path or index_path(root)
+        try:
+            with open(path, "rb") as fp:
+                version, state = pickle.load(fp)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return None
+        if version != FORMAT_VERSION:
+            return None
+        idx = cls.__new__(cls)
+        idx.__dict__.update(state)
+        idx.lower = [n.lower() for n in idx.names]
+        return idx
+
+    # -------- queries
+
+    def path(self, i: int) -> str:
+        return os.path.join(self.dirs[self.parent[i]], self.names[i])
+
+    def _candidates(self, literals) -> Optional[List[int]]:
+        """Ids whose names contain every trigram of ``literals``, or None if unconstrained."""
+        grams = set()
+        for lit in literals:
+            grams |= _trigrams(lit)
+        if not grams:
+            return None
+        posts = []
+        for g in grams:
+            post = self.grams.get(g)
+            if post is None:
+                return []
+            posts.append(post)
+        posts.sort(key=len)
+        result = set(posts[0])
+        for post in posts[1:]:
+            result.intersection_update(post)
+            if not result:
+                break
+        return sorted(result)
+
+    def query(
+        self,
+        text: str,
+        mode: str = "substring",
+        kind: Optional[str] = None,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        newer_than: Optional[float] = None,
+        older_than: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Hit]:
+        """
+        Yield entries whose name matches ``text``.
+
+        ``mode`` is "substring" (case-insensitive), "glob" or "regex";
+        ``kind`` is None, "file" or "dir"; the time bounds are epoch seconds.
+        """
+        if mode == "substring":
+            needle = text.lower()
+            ids = self._candidates([needle])
+            match = lambda low: needle in low
+        elif mode == "glob":
+            pattern = text.lower()
+            literals = [p for p in _GLOB_WILDCARDS.split(pattern) if p]
+            ids = self._candidates(literals)
+            match = re.compile(fnmatch.translate(pattern)).match
+        elif mode == "regex":
+            ids = None
+            match = re.compile(text, re.IGNORECASE).search
+        else:
+            raise ValueError(f"unknown mode {mode!r}")
+
+        want_dir = {None: None, "file": 0, "dir": 1}[kind]
+        found = 0
+        for i in range(len(self.names)) if ids is None else ids:
+            if want_dir is not None and self.is_dir[i] != want_dir:
+                continue
+            sz, mt = self.size[i], self.mtime[i]
+            if min_size is not None and sz < min_size:
+                continue
+            if max_size is not None and sz > max_size:
+                continue
+            if newer_than is not None and mt < newer_than:
+                continue
+            if older_than is not None and mt > older_than:
+                continue
+            if not match(self.lower[i]):
+                continue
+            yield Hit(self.path(i), bool(self.is_dir[i]), sz, mt)
+            found += 1
+            if limit is not None and found >= limit:
+                return
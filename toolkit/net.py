@@ -0,0 +1,161 @@
+# toolkit/net.py
+"""
+Network helpers shared by the Network page and the command line.
+
+Functions return plain values and raise ``OSError`` (or ``ValueError``
+for bad input) instead of returning error strings, so callers decide how
+to present failures. Traceroute runs the system tool with an argument
+list, never through a shell; ping is in-process (``toolkit.latency``).
+"""
+from __future__ import annotations
+
+import ipaddress
+import os
+import socket
+import subprocess
+import time
+import urllib.request
+from typing import Callable, Dict, Iterable, List, Optional
+
+from toolkit.resolver import default_resolver
+
+PUBLIC_IP_URL = "https://api.ipify.org"
+MAX_HOSTS = 65536
+
+# named port groups for parse_ports
+SERVICES = {
+    "web": [80, 443, 8000, 8080, 8443],
+    "windows": [135, 139, 445, 3389, 5985, 5986],
+    "remote": [22, 23, 3389, 5900],
+    "mail": [25, 110, 143, 465, 587, 993, 995],
+    "db": [1433, 1521, 3306, 5432, 6379, 9200, 27017],
+    "infra": [53, 88, 389, 636, 3268, 9100, 161, 623],
+}
+SERVICES["common"] = sorted({p for group in SERVICES.values() for p in group} | {21, 111, 2049})
+
+
+def parse_ports(spec: str) -> List[int]:
+    """``"22,80,8000-8080"`` or group names (``"web,db"``) → sorted unique port numbers."""
+    ports = set()
+    for part in spec.replace(" ", "").split(","):
+        if not part:
+            continue
+        if part.lower() in SERVICES:
+            ports.update(SERVICES[part.lower()])
+            continue
+        lo, _, hi = part.partition("-")
+        start, end = int(lo), int(hi or lo)
+        if not 0 < start <= end <= 65535:
+            raise ValueError(f"bad port range {part!r}")
+        ports.update(range(start, end + 1))
+    if not ports:
+        raise ValueError("no ports given")
+    return sorted(ports)
+
+
+def parse_hosts(spec: str, max_hosts: int = MAX_HOSTS) -> List[str]:
+    """
+    Host names, addresses and CIDR blocks separated by commas or spaces →
+    unique hosts in the order given; a block expands to its usable addresses.
+    """
+    hosts: Dict[str, None] = {}
+    for part in spec.replace(",", " ").split():
+        if "/" in part and not part.lower().startswith(("http://", "https://")):
+            try:
+                block = ipaddress.ip_network(part, strict=False)
+            except ValueError:
+                raise ValueError(f"bad network {part!r}") from None
+            if block.num_addresses > max_hosts:
+                raise ValueError(f"{part} has {block.num_addresses} addresses; the limit is {max_hosts}")
+            hosts.update(dict.fromkeys(str(ip) for ip in (list(block.hosts()) or [block.network_address])))
+        else:
+            hosts[clean_host(part)] = None
+        if len(hosts) > max_hosts:
+            raise ValueError(f"more than {max_hosts} hosts")
+    if not hosts:
+        raise ValueError("no hosts given")
+    return list(hosts)
+
+
+def clean_host(text: str) -> str:
+    """Strip a URL scheme, path and whitespace, leaving the host name."""
+    text = text.strip()
+    for scheme in ("http://", "https://"):
+        if text.lower().startswith(scheme):
+            text = text[len(scheme):]
+    host = text.split("/", 1)[0]
+    if not host or host.startswith("-"):
+        raise ValueError(f"bad host name {text!r}")
+    return host
+
+
+def port_scan(host: str, ports: Iterable[int], timeout: float = 1.0) -> List[int]:
+    """Ports on ``host`` that accept a TCP connection, ascending (see ``toolkit.portscan``)."""
+    from toolkit import portscan
+
+    results = portscan.scan(clean_host(host), ports, timeout=timeout)
+    return sorted(r.port for r in results if r.state == "open")
+
+
+def resolve(name: str) -> List[str]:
+    """Every IPv4 and IPv6 address of ``name`` (cached, see ``toolkit.resolver``)."""
+    return default_resolver().addresses(clean_host(name))
+
+
+def reverse_dns(ip: str) -> str:
+    return default_resolver().names(ip)[0]
+
+
+def host_info() -> Dict[str, str]:
+    name = socket.gethostname()
+    try:
+        ip = socket.gethostbyname(name)
+    except OSError:
+        ip = "Unavailable"
+    return {"hostname": name, "ip": ip}
+
+
+def public_ip(timeout: float = 4.0) -> str:
+    with urllib.request.urlopen(PUBLIC_IP_URL, timeout=timeout) as resp:
+        return resp.read().decode("ascii").strip()
+
+
+def flood(host: str, port: int, protocol: str = "UDP", size: int = 1024, duration: float = 5.0,
+          progress_cb: Optional[Callable[[int], None]] = None) -> int:
+    """
+    Send ``size``-byte packets to ``host:port`` for ``duration`` seconds, one
+    connection per packet for TCP. Returns the number sent.
+    """
+    if protocol not in ("TCP", "UDP"):
+        raise ValueError(f"protocol must be TCP or UDP, not {protocol!r}")
+    payload = b"A" * size
+    end = time.time() + duration
+    count = 0
+    while time.time() < end:
+        if protocol == "TCP":
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+                s.connect((host, port))
+                s.send(payload)
+        else:
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+                s.sendto(payload, (host, port))
+        count += 1
+        if progress_cb:
+            progress_cb(count)
+    return count
+
+
+def _run(cmd: List[str], timeout: float) -> str:
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired as exc:
+        raise OSError(f"{cmd[0]} timed out") from exc
+    out = proc.stdout or proc.stderr
+    if proc.returncode not in (0, 1):  # ping exits 1 when nothing answered
+        raise OSError(out.strip() or f"{cmd[0]} exited with {proc.returncode}")
+    return out
+
+
+def traceroute(host: str, timeout: float = 120.0) -> str:
+    host = clean_host(host)
+    return _run(["tracert", host] if os.name == "nt" else ["traceroute", host], timeout)
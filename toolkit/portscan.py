@@ -0,0 +1,341 @@
+# toolkit/portscan.py
+"""
+Concurrent TCP connect scan on asyncio.
+
+Each probe is one non-blocking connect, so the limit is the number of
+connections in flight, not one timeout after another:
+
+* at most ``concurrency`` connects are open at once: that many worker
+  coroutines pull probes from one shared iterator;
+* ``rate`` caps new connects per second to each host, so a scan does
+  not trip rate limiters or flood a small device;
+* the timeout adapts per host. It starts at ``timeout``, and once
+  connects have completed it follows TCP's retransmission estimator
+  (RFC 6298: smoothed RTT plus four times its variance), kept between
+  ``min_timeout`` and ``timeout``. An open or closed port answers within
+  one round trip, so a filtered port is given up on after a few RTTs
+  rather than a fixed wait;
+* results are yielded as each probe finishes, in completion order.
+
+``scan_many`` takes many hosts: probes go out port by port across all
+hosts, so consecutive connects hit different machines, and ``per_host``
+caps the connects in flight to any one of them while ``concurrency``
+stays the global cap. ``PortMatrix`` collects the results as a host ×
+port table.
+
+``scan`` is a plain generator that drives its own event loop in the
+calling thread, so workers and the CLI use it like the other engines:
+check for cancel between results and close the generator to stop.
+"""
+from __future__ import annotations
+
+import asyncio
+import os
+import socket
+import struct
+import time
+import ipaddress
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from toolkit.resolver import default_resolver
+
+DEFAULT_CONCURRENCY = 512
+DEFAULT_PER_HOST = 32
+DEFAULT_TIMEOUT = 1.0
+MIN_TIMEOUT = 0.05
+QUEUE_SIZE = 1024
+
+# Windows retries a SYN that was answered with RST for about a second, so
+# refusals there say nothing about the round trip
+_REFUSAL_IS_RTT = os.name != "nt"
+_LINGER_RESET = struct.pack("ii", 1, 0)  # close with RST, no TIME_WAIT
+
+_DONE = object()
+
+Target = Tuple[str, int]
+
+
+@dataclass
+class PortResult:
+    host: str
+    port: int
+    state: str  # "open", "closed", "filtered" (no answer in time) or "error"
+    rtt_ms: Optional[float] = None
+    detail: str = ""  # port 0 with state "error": the host did not resolve
+
+
+def _host_key(host: str):
+    try:
+        ip = ipaddress.ip_address(host)
+        return (0, ip.version, int(ip), host)
+    except ValueError:
+        return (1, 0, 0, host)
+
+
+@dataclass
+class PortMatrix:
+    """Host × port states, filled by ``add`` as results arrive."""
+
+    states: Dict[str, Dict[int, str]] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    def add(self, result: PortResult) -> None:
+        if result.port == 0:
+            self.errors[result.host] = result.detail
+        else:
+            self.states.setdefault(result.host, {})[result.port] = result.state
+
+    def open_ports(self) -> List[int]:
+        """Ports open on at least one host: the matrix columns."""
+        return sorted({p for ports in self.states.values() for p, st in ports.items() if st == "open"})
+
+    def hosts(self, only_open: bool = True) -> List[str]:
+        """Hosts in address order; by default only those with an open port."""
+        hosts = [h for h, ports in self.states.items() if not only_open or "open" in ports.values()]
+        return sorted(hosts, key=_host_key)
+
+    def row(self, host: str, ports: Sequence[int]) -> List[str]:
+        states = self.states.get(host, {})
+        return [states.get(p, "") for p in ports]
+
+
+class RttEstimator:
+    """Smoothed round trip time and the timeout derived from it (RFC 6298)."""
+
+    def __init__(self, initial: float = DEFAULT_TIMEOUT, minimum: float = MIN_TIMEOUT):
+        self.initial = initial
+        self.minimum = minimum
+        self.srtt: Optional[float] = None
+        self.rttvar = 0.0
+
+    def add(self, rtt: float) -> None:
+        if self.srtt is None:
+            self.srtt, self.rttvar = rtt, rtt / 2
+        else:
+            self.rttvar = 0.75 * self.rttvar + 0.25 * abs(self.srtt - rtt)
+            self.srtt = 0.875 * self.srtt + 0.125 * rtt
+
+    @property
+    def timeout(self) -> float:
+        if self.srtt is None:
+            return self.initial
+        return min(self.initial, max(self.minimum, self.srtt + 4 * self.rttvar))
+
+
+class _Pacer:
+    """Spaces calls to ``wait`` at least ``1 / rate`` seconds apart."""
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next = 0.0
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        now = time.monotonic()
+        at = max(now, self.next)
+        self.next = at + self.interval
+        if at > now:
+            await asyncio.sleep(at - now)
+
+
+def resolve_target(host: str) -> Tuple[int, tuple]:
+    """``(family, sockaddr)`` of the first address of ``host``; OSError if none."""
+    return default_resolver().lookup(host)[0]
+
+
+def resolve_all(hosts: Sequence[str]):
+    """``({host: (family, sockaddr)}, [(host, error)])``, looked up in parallel."""
+    return default_resolver().resolve_all(hosts)
+
+
+def interleave(hosts: Sequence[str], ports: Iterable[int]) -> Iterator[Target]:
+    """Port by port across all hosts, so consecutive probes hit different hosts."""
+    for port in ports:
+        for host in hosts:
+            yield host, port
+
+
+def fd_limit(concurrency: int) -> int:
+    """``concurrency`` capped to the open-file limit where there is one."""
+    try:
+        import resource
+    except ImportError:  # Windows: the proactor loop has no select() limit
+        return concurrency
+    soft, _hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        return concurrency
+    return max(1, min(concurrency, soft - 64))
+
+
+class _Scan:
+    def __init__(self, targets: Iterable[Target], addrs: Dict[str, Tuple[int, tuple]],
+                 concurrency: int, rate: float, timeout: float, min_timeout: float, per_host: int,
+                 shared_rtt: Optional[RttEstimator] = None):
+        self.targets = iter(targets)
+        self.per_host = per_host
+        self.slots: Dict[str, asyncio.Semaphore] = {}
+        self.addrs = addrs
+        self.concurrency = fd_limit(concurrency)
+        if shared_rtt is not None:
+            self.rtt = {h: shared_rtt for h in addrs}
+        else:
+            self.rtt = {h: RttEstimator(timeout, min_timeout) for h in addrs}
+        self.pacers = {h: _Pacer(rate) for h in addrs}
+        self.queue: Optional[asyncio.Queue] = None
+        self.main: Optional[asyncio.Future] = None
+        self.stopped = False
+
+    async def start(self) -> None:
+        # created inside the loop: before 3.10 a Queue binds the current loop
+        self.queue = asyncio.Queue(QUEUE_SIZE)
+        if self.per_host:
+            self.slots = {h: asyncio.Semaphore(self.per_host) for h in self.addrs}
+        self.main = asyncio.ensure_future(self._run())
+
+    async def _run(self) -> None:
+        workers = [asyncio.ensure_future(self._worker()) for _ in range(self.concurrency)]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for w in workers:
+                w.cancel()
+        await self.queue.put(_DONE)
+
+    async def _worker(self) -> None:
+        for host, port in self.targets:  # shared: next() never yields to the loop
+            if self.stopped:
+                # wait_for can swallow a cancel that races a finished connect
+                return
+            await self.pacers[host].wait()
+            if self.slots:
+                async with self.slots[host]:
+                    result = await self._probe(host, port)
+            else:
+                result = await self._probe(host, port)
+            await self.queue.put(result)
+
+    async def _probe(self, host: str, port: int) -> PortResult:
+        loop = asyncio.get_running_loop()
+        family, sockaddr = self.addrs[host]
+        est = self.rtt[host]
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(loop.sock_connect(sock, (sockaddr[0], port) + tuple(sockaddr[2:])), est.timeout)
+        except asyncio.TimeoutError:
+            return PortResult(host, port, "filtered")
+        except ConnectionRefusedError:
+            rtt = time.perf_counter() - start
+            if _REFUSAL_IS_RTT:
+                est.add(rtt)
+            return PortResult(host, port, "closed", rtt * 1000)
+        except OSError as exc:
+            return PortResult(host, port, "error", detail=exc.strerror or str(exc))
+        else:
+            rtt = time.perf_counter() - start
+            est.add(rtt)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, _LINGER_RESET)
+            return PortResult(host, port, "open", rtt * 1000)
+        finally:
+            sock.close()
+
+    async def next_batch(self) -> list:
+        """Everything queued, waiting for at least one item; ends with _DONE."""
+        if self.queue.empty():
+            get = asyncio.ensure_future(self.queue.get())
+            done, _ = await asyncio.wait({get, self.main}, return_when=asyncio.FIRST_COMPLETED)
+            if get not in done:
+                get.cancel()
+                self.main.result()  # a worker failed: raise it here
+                return [_DONE]
+            batch = [get.result()]
+        else:
+            batch = []
+        while not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+    async def stop(self) -> None:
+        self.stopped = True
+        self.main.cancel()
+        await asyncio.gather(self.main, return_exceptions=True)
+
+
+def run(
+    targets: Iterable[Target],
+    addrs: Dict[str, Tuple[int, tuple]],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    rate: float = 0.0,
+    timeout: float = DEFAULT_TIMEOUT,
+    min_timeout: float = MIN_TIMEOUT,
+    per_host: int = 0,
+    shared_rtt: Optional[RttEstimator] = None,
+) -> Iterator[PortResult]:
+    """
+    Probe ``(host, port)`` targets, in the order given, against the
+    resolved ``addrs`` of every host. See ``scan`` and ``scan_many``.
+
+    ``shared_rtt`` times out every host from one estimator instead of one
+    per host, for sweeps where each host gets only a probe or two. The
+    targets are read lazily, so a generator can drop hosts found up by
+    other means while the scan runs.
+    """
+    scan = _Scan(targets, addrs, concurrency, rate, timeout, min_timeout, per_host, shared_rtt)
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(scan.start())
+        while True:
+            # one trip into the loop per batch, not per result
+            for item in loop.run_until_complete(scan.next_batch()):
+                if item is _DONE:
+                    return
+                yield item
+    finally:
+        if scan.main is not None and not scan.main.done():
+            loop.run_until_complete(scan.stop())
+        loop.close()
+
+
+def scan(
+    host: str,
+    ports: Iterable[int],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    rate: float = 0.0,
+    timeout: float = DEFAULT_TIMEOUT,
+    min_timeout: float = MIN_TIMEOUT,
+) -> Iterator[PortResult]:
+    """
+    Yield a PortResult per port of ``host`` as the probes finish.
+
+    ``concurrency`` connects run at once, at most ``rate`` new ones per
+    second when ``rate`` is set; ``timeout`` is the longest wait for an
+    answer. Raises OSError up front if ``host`` does not resolve.
+    Closing the generator cancels the probes in flight.
+    """
+    addrs = {host: resolve_target(host)}
+    return run(((host, p) for p in ports), addrs, concurrency, rate, timeout, min_timeout)
+
+
+def scan_many(
+    hosts: Sequence[str],
+    ports: Sequence[int],
+    concurrency: int = DEFAULT_CONCURRENCY,
+    per_host: int = DEFAULT_PER_HOST,
+    rate: float = 0.0,
+    timeout: float = DEFAULT_TIMEOUT,
+    min_timeout: float = MIN_TIMEOUT,
+) -> Iterator[PortResult]:
+    """
+    Scan every port of every host, interleaved across hosts, with at
+    most ``concurrency`` connects in flight overall, ``per_host`` to one
+    host and ``rate`` new connects per second to one host. Hosts that do
+    not resolve come first, as results with port 0 and state "error".
+    """
+    addrs, failed = resolve_all(hosts)
+    for host, error in failed:
+        yield PortResult(host, 0, "error", detail=error)
+    if addrs:
+        yield from run(interleave(list(addrs), ports), addrs, concurrency, rate, timeout, min_timeout, per_host)
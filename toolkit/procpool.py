@@ -0,0 +1,117 @@
+# toolkit/procpool.py
+"""
+Process-pool backend for CPU-heavy scans.
+
+Hashing and directory walks in threads share one interpreter lock, so a
+big scan keeps one core busy and makes the UI stutter. ``pool_map`` sends
+the same work to worker processes instead:
+
+* items are grouped into chunks (by count and, optionally, by bytes), so
+  each round trip carries enough work to amortise pickling;
+* at most ``window`` chunks are in flight, which bounds memory and means
+  a cancel only has to wait for the chunks already running;
+* results come back per chunk, in completion order, as soon as a chunk
+  finishes, so the caller can stream them into a table or a file;
+* closing the generator (or an exception in the consumer, such as
+  ``Cancelled``) sets a shared event that workers check between items via
+  ``cancelled()``, drops the queued chunks and waits for the pool to exit.
+
+Worker functions must be importable module-level functions taking
+``(chunk, *args)`` and returning a list; on Windows every worker is a
+fresh interpreter that imports them by name.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# ProcessPoolExecutor refuses more workers than this on Windows
+MAX_PROCESSES = 61 if os.name == "nt" else None
+
+
+def _capped(processes: int) -> int:
+    return min(processes, MAX_PROCESSES) if MAX_PROCESSES else processes
+
+
+DEFAULT_PROCESSES = _capped(os.cpu_count() or 1)
+CHUNK_ITEMS = 64
+CHUNK_BYTES = 256 * 1024 * 1024
+
+_cancel_event = None  # set in each worker by _init
+
+
+def _init(event) -> None:
+    global _cancel_event
+    _cancel_event = event
+
+
+def cancelled() -> bool:
+    """True in a worker process once the parent gave up on the results."""
+    return _cancel_event is not None and _cancel_event.is_set()
+
+
+def chunked(
+    items: Iterable[T],
+    max_items: int = CHUNK_ITEMS,
+    max_bytes: int = CHUNK_BYTES,
+    weight: Optional[Callable[[T], int]] = None,
+) -> Iterator[List[T]]:
+    """Split ``items`` into lists of at most ``max_items`` or ``max_bytes`` by ``weight``."""
+    chunk: List[T] = []
+    nbytes = 0
+    for item in items:
+        chunk.append(item)
+        if weight is not None:
+            nbytes += weight(item)
+        if len(chunk) >= max_items or nbytes >= max_bytes:
+            yield chunk
+            chunk, nbytes = [], 0
+    if chunk:
+        yield chunk
+
+
+def pool_map(
+    fn: Callable[..., List[Any]],
+    items: Iterable[T],
+    processes: Optional[int] = None,
+    args: tuple = (),
+    chunk_items: int = CHUNK_ITEMS,
+    chunk_bytes: int = CHUNK_BYTES,
+    weight: Optional[Callable[[T], int]] = None,
+    window: Optional[int] = None,
+) -> Iterator[Any]:
+    """
+    Run ``fn(chunk, *args)`` over chunks of ``items`` on ``processes``
+    worker processes and yield every element of every returned list.
+    ``processes`` is capped at ``MAX_PROCESSES``.
+    """
+    chunks = chunked(items, chunk_items, chunk_bytes, weight)
+    first = next(chunks, None)
+    if first is None:
+        return
+    processes = _capped(max(1, processes or DEFAULT_PROCESSES))
+    window = window or processes * 2
+    ctx = multiprocessing.get_context("spawn" if os.name == "nt" else None)
+    stop = ctx.Event()
+    pool = ProcessPoolExecutor(processes, mp_context=ctx, initializer=_init, initargs=(stop,))
+    running = {pool.submit(fn, first, *args)}
+    try:
+        for chunk in chunks:
+            if len(running) >= window:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield from fut.result()
+            running.add(pool.submit(fn, chunk, *args))
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield from fut.result()
+    finally:
+        stop.set()
+        for fut in running:
+            fut.cancel()  # queued chunks; running ones see the event
+        pool.shutdown(wait=True)
@@ -0,0 +1,239 @@
+# toolkit/resolver.py
+"""
+Name lookups for all the network tools: concurrent, complete and cached.
+
+``socket.gethostbyname`` returns one IPv4 address and blocks for the
+whole lookup, so a list of names took one timeout after another. The
+``Resolver`` here:
+
+* runs ``getaddrinfo`` and ``gethostbyaddr`` on a pool of threads, so
+  ``lookup_many`` and ``reverse_many`` have many queries in flight and
+  yield each answer as it arrives;
+* keeps every address ``getaddrinfo`` returns, IPv4 and IPv6, in the
+  system's preference order;
+* caches answers in a least-recently-used table of ``size`` entries.
+  Concurrent requests for the same query share one lookup.
+
+``getaddrinfo`` does not report the record TTL, so answers are kept for a
+short ``ttl`` and failures ("no such name") for ``negative_ttl``. The
+system resolver has its own TTL-respecting cache (the DNS Client service
+on Windows), so a repeat after expiry is cheap, and an answer is never
+served much longer than DNS allows. Temporary failures are not cached.
+
+``default_resolver`` is the process-wide instance the port scanner,
+sweep, ping engine and Network page share.
+"""
+from __future__ import annotations
+
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+DEFAULT_TTL = 60.0
+NEGATIVE_TTL = 15.0
+CACHE_SIZE = 4096
+WORKERS = 64
+
+Address = Tuple[int, tuple]  # (family, sockaddr), as from getaddrinfo
+
+
+@dataclass
+class Lookup:
+    query: str
+    answers: List[str] = field(default_factory=list)  # addresses, or host name then aliases
+    error: str = ""
+    cached: bool = False
+
+
+def _ips(addrs: List[Address]) -> List[str]:
+    return [sockaddr[0] for _family, sockaddr in addrs]
+
+
+def _error_text(exc: OSError) -> str:
+    return exc.strerror or str(exc)
+
+
+def _is_temporary(exc: OSError) -> bool:
+    """Failures worth retrying soon: timeouts, unreachable servers."""
+    if isinstance(exc, socket.gaierror):
+        return exc.errno == getattr(socket, "EAI_AGAIN", None)
+    if isinstance(exc, socket.herror):
+        return exc.errno == 2  # TRY_AGAIN
+    return True
+
+
+class Resolver:
+    def __init__(self, ttl: float = DEFAULT_TTL, negative_ttl: float = NEGATIVE_TTL,
+                 size: int = CACHE_SIZE, workers: int = WORKERS):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.size = size
+        self.workers = workers
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[float, object]]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    # -------- cache
+
+    def _cached(self, key: Tuple[str, str]):
+        """The cached value (answers or an OSError), or None."""
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return value
+
+    def _store(self, key: Tuple[str, str], value) -> None:
+        if isinstance(value, OSError):
+            if _is_temporary(value):
+                return
+            ttl = self.negative_ttl
+        else:
+            ttl = self.ttl
+        with self._lock:
+            self._cache[key] = (time.monotonic() + ttl, value)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.size:
+                self._cache.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    # -------- lookups
+
+    def _get(self, kind: str, query: str, fn):
+        key = (kind, query)
+        value = self._cached(key)
+        if value is None:
+            with self._lock:
+                fut = self._inflight.get(key)
+                owner = fut is None
+                if owner:
+                    fut = self._inflight[key] = Future()
+            if owner:
+                try:
+                    try:
+                        value = fn(query)
+                    except OSError as exc:
+                        value = exc
+                    self._store(key, value)
+                    fut.set_result(value)
+                except BaseException as exc:  # e.g. UnicodeError for a malformed name
+                    fut.set_exception(exc)
+                    raise
+                finally:
+                    with self._lock:
+                        del self._inflight[key]
+            else:
+                value = fut.result()
+        if isinstance(value, OSError):
+            raise value
+        return value
+
+    def lookup(self, name: str) -> List[Address]:
+        """Every ``(family, sockaddr)`` of ``name``, IPv4 and IPv6; OSError if none."""
+        def query(host):
+            infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+            seen: Dict[str, Address] = {}
+            for family, _type, _proto, _name, sockaddr in infos:
+                seen.setdefault(sockaddr[0], (family, sockaddr))
+            if not seen:
+                raise socket.gaierror(socket.EAI_NONAME, f"no address for {host}")
+            return list(seen.values())
+
+        return self._get("addr", name.strip(), query)
+
+    def addresses(self, name: str) -> List[str]:
+        return _ips(self.lookup(name))
+
+    def names(self, ip: str) -> List[str]:
+        """Host name of ``ip``, then its aliases; OSError if it has no PTR record."""
+        def query(addr):
+            host, aliases, _addrs = socket.gethostbyaddr(addr)
+            return [host] + [a for a in aliases if a != host]
+
+        return self._get("ptr", ip.strip(), query)
+
+    # -------- batches
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="resolver")
+            return self._pool
+
+    def _many(self, kind: str, fn, render, queries: Iterable[str]) -> Iterator[Lookup]:
+        todo = []
+        for q in dict.fromkeys(q.strip() for q in queries):
+            value = self._cached((kind, q))
+            if value is None:
+                todo.append(q)
+            elif isinstance(value, OSError):
+                yield Lookup(q, error=_error_text(value), cached=True)
+            else:
+                yield Lookup(q, render(value), cached=True)
+        if not todo:
+            return
+        pool = self._executor()
+        futures = {pool.submit(fn, q): q for q in todo}
+        try:
+            for fut in as_completed(futures):
+                try:
+                    yield Lookup(futures[fut], render(fut.result()))
+                except OSError as exc:
+                    yield Lookup(futures[fut], error=_error_text(exc))
+                except ValueError as exc:
+                    yield Lookup(futures[fut], error=str(exc))
+        finally:
+            for fut in futures:
+                fut.cancel()
+
+    def lookup_many(self, names: Iterable[str]) -> Iterator[Lookup]:
+        """Addresses of every name, cached ones first, then as lookups finish."""
+        return self._many("addr", self.lookup, _ips, names)
+
+    def reverse_many(self, ips: Iterable[str]) -> Iterator[Lookup]:
+        """Names of every address, cached ones first, then as lookups finish."""
+        return self._many("ptr", self.names, list, ips)
+
+    def resolve_all(self, names: Iterable[str]) -> Tuple[Dict[str, Address], List[Tuple[str, str]]]:
+        """``({name: first (family, sockaddr)}, [(name, error)])``, looked up in parallel."""
+        def one(name):
+            try:
+                return name, self.lookup(name)[0], None
+            except OSError as exc:
+                return name, None, _error_text(exc)
+            except ValueError as exc:  # e.g. UnicodeError for a malformed name
+                return name, None, str(exc)
+
+        addrs, failed = {}, []
+        for name, addr, error in self._executor().map(one, names):
+            if addr is None:
+                failed.append((name, error))
+            else:
+                addrs[name] = addr
+        return addrs, failed
+
+
+_default: Optional[Resolver] = None
+_default_lock = threading.Lock()
+
+
+def default_resolver() -> Resolver:
+    """Process-wide resolver, so every tool shares one cache."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = Resolver()
+        return _default
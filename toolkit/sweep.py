@@ -0,0 +1,188 @@
+# toolkit/sweep.py
+"""
+Find the live hosts in a list or subnet, in-process and in parallel.
+
+Two kinds of probe run at the same time:
+
+* an ICMP echo to every IPv4 address, when the caller has a pinger from
+  ``icmp.open_pinger``, sent at ``rate`` per second from one socket;
+* TCP connects to a few ports Windows machines and servers usually
+  answer on (``SWEEP_PORTS``), through ``portscan.run`` with at most
+  ``concurrency`` in flight. An accepted connect and a refused one (RST)
+  both prove the host is up, so a firewall that drops pings is no
+  obstacle as long as one port answers.
+
+A host is reported once, by whichever probe answers first; once it is up
+its remaining probes are skipped. All hosts share one RTT estimator, fed
+by the echo replies as well, so after the first answers the connects to
+dead addresses time out after a few round trips instead of ``timeout``.
+Names are resolved up front; names that do not resolve are skipped.
+"""
+from __future__ import annotations
+
+import ipaddress
+import queue
+import socket
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from toolkit import icmp, portscan
+from toolkit.tasks import Progress
+
+SWEEP_PORTS = (445, 135, 3389, 22, 80, 443)
+DEFAULT_TIMEOUT = 0.5
+
+_DONE = object()
+
+
+@dataclass
+class LiveHost:
+    host: str
+    via: str  # "icmp" or "tcp/<port>"
+    rtt_ms: Optional[float] = None
+
+
+def _addresses(hosts: Sequence[str]) -> Tuple[Dict[str, Tuple[int, tuple]], List[Tuple[str, str]]]:
+    """``portscan.resolve_all`` that skips the lookup for address literals."""
+    addrs: Dict[str, Tuple[int, tuple]] = {}
+    names = []
+    for host in hosts:
+        try:
+            ip = ipaddress.ip_address(host)
+        except ValueError:
+            names.append(host)
+            continue
+        if ip.version == 4:
+            addrs[host] = (socket.AF_INET, (host, 0))
+        else:
+            addrs[host] = (socket.AF_INET6, (host, 0, 0, 0))
+    failed: List[Tuple[str, str]] = []
+    if names:
+        resolved, failed = portscan.resolve_all(names)
+        addrs.update(resolved)
+    return addrs, failed
+
+
+def sweep(
+    hosts: Sequence[str],
+    ports: Sequence[int] = SWEEP_PORTS,
+    pinger: Optional[icmp.Pinger] = None,
+    concurrency: int = portscan.DEFAULT_CONCURRENCY,
+    timeout: float = DEFAULT_TIMEOUT,
+    rate: float = icmp.DEFAULT_RATE,
+    progress: Optional[Progress] = None,
+) -> Iterator[LiveHost]:
+    """
+    Yield a LiveHost for every host that answers, as the answers arrive.
+
+    ``pinger`` adds ICMP echoes (it is not closed here); ``ports`` may be
+    empty for a ping-only sweep. ``progress`` counts hosts settled: found
+    up, or out of probes.
+    """
+    addrs, failed = _addresses(hosts)
+    if progress is not None:
+        progress.begin(f"Sweeping {len(hosts)} hosts …", total_items=len(hosts), unit="hosts")
+        progress.advance(len(failed))
+    by_ip = {}
+    if pinger is not None:
+        by_ip = {sockaddr[0]: h for h, (family, sockaddr) in addrs.items() if family == socket.AF_INET}
+    pending = {h: len(ports) for h in addrs}
+    for host in by_ip.values():
+        pending[host] += 1
+    live = set()  # up, by either probe; read by the ICMP thread to skip hosts
+    reported = set()
+    inbox: List[Tuple[str, Optional[float]]] = []
+    replies: "queue.Queue" = queue.Queue()
+    est = portscan.RttEstimator(timeout, portscan.MIN_TIMEOUT)
+    stop = threading.Event()
+    icmp_done = pinger is None or not by_ip
+
+    def drain() -> None:
+        nonlocal icmp_done
+        while True:
+            try:
+                item = replies.get_nowait()
+            except queue.Empty:
+                return
+            if item is _DONE:
+                icmp_done = True
+                continue
+            ip, rtt = item
+            if rtt is not None:
+                live.add(by_ip[ip])
+                est.add(rtt / 1000)
+            inbox.append((by_ip[ip], rtt))
+
+    def settle(host: str, found: Optional[LiveHost]) -> Optional[LiveHost]:
+        if host in reported:
+            return None
+        if found is None:
+            pending[host] -= 1
+            if pending[host]:
+                return None
+        else:
+            reported.add(host)
+        if progress is not None:
+            progress.advance()
+        return found
+
+    def flush() -> Iterator[LiveHost]:
+        for host, rtt in inbox:
+            found = settle(host, LiveHost(host, "icmp", rtt) if rtt is not None else None)
+            if found is not None:
+                yield found
+        inbox.clear()
+
+    def ping_all() -> None:
+        ips = (ip for ip, host in by_ip.items() if host not in live and not stop.is_set())
+        results = pinger.ping_many(ips, timeout, rate)
+        try:
+            for item in results:
+                replies.put(item)
+                if stop.is_set():
+                    break
+        finally:
+            results.close()
+            replies.put(_DONE)
+
+    def targets() -> Iterator[portscan.Target]:
+        # read lazily by the scan, so hosts found by ICMP meanwhile are skipped
+        for port in ports:
+            for host in addrs:
+                drain()
+                if host not in live:
+                    yield host, port
+
+    thread = None
+    if not icmp_done:
+        thread = threading.Thread(target=ping_all, name="sweep-icmp", daemon=True)
+        thread.start()
+    try:
+        if ports and addrs:
+            results = portscan.run(targets(), addrs, concurrency, 0.0, timeout, portscan.MIN_TIMEOUT,
+                                   shared_rtt=est)
+            try:
+                for r in results:
+                    drain()
+                    yield from flush()
+                    found = None
+                    if r.state in ("open", "closed"):
+                        live.add(r.host)
+                        found = LiveHost(r.host, f"tcp/{r.port}", r.rtt_ms)
+                    found = settle(r.host, found)
+                    if found is not None:
+                        yield found
+            finally:
+                results.close()
+        while not icmp_done:
+            item = replies.get()
+            replies.put(item)  # let drain() see it, _DONE included
+            drain()
+            yield from flush()
+        drain()
+        yield from flush()
+    finally:
+        stop.set()
+        if thread is not None:
+            thread.join()
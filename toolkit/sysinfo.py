@@ -0,0 +1,99 @@
+# toolkit/sysinfo.py
+"""
+System information snapshot as a flat dict.
+
+The platform fields come from the standard library; CPU, memory, disk,
+network and user fields need psutil and are left out without it.
+"""
+from __future__ import annotations
+
+import datetime
+import platform
+import socket
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class Interface:
+    name: str
+    addresses: List[str] = field(default_factory=list)  # IPv4 "address/netmask"
+    speed_mb: Optional[int] = None
+    mtu: Optional[int] = None
+    bytes_sent: int = 0
+    bytes_recv: int = 0
+
+
+def mac_address() -> str:
+    mac = uuid.getnode()
+    return ":".join(f"{(mac >> ele) & 0xff:02x}" for ele in range(40, -8, -8))
+
+
+def interfaces() -> List[Interface]:
+    """Network interfaces with addresses and counters; needs psutil."""
+    import psutil
+    stats, addrs = psutil.net_if_stats(), psutil.net_if_addrs()
+    io = psutil.net_io_counters(pernic=True)
+    nics = []
+    for name, items in addrs.items():
+        st, cnt = stats.get(name), io.get(name)
+        nics.append(Interface(
+            name,
+            [f"{a.address}/{a.netmask}" for a in items if a.family == socket.AF_INET],
+            st.speed if st else None,
+            st.mtu if st else None,
+            cnt.bytes_sent if cnt else 0,
+            cnt.bytes_recv if cnt else 0,
+        ))
+    return nics
+
+
+def snapshot() -> Dict[str, Any]:
+    uname = platform.uname()
+    info: Dict[str, Any] = {
+        "node": uname.node,
+        "system": uname.system,
+        "release": uname.release,
+        "version": uname.version,
+        "machine": uname.machine,
+        "processor": uname.processor,
+        "architecture": " ".join(platform.architecture()),
+        "python": platform.python_version(),
+        "mac": mac_address(),
+        "uuid": str(uuid.UUID(int=uuid.getnode())),
+    }
+    try:
+        import psutil
+    except ImportError:
+        return info
+
+    boot = psutil.boot_time()
+    info["boot_time"] = datetime.datetime.fromtimestamp(boot).isoformat(timespec="seconds")
+    info["uptime_s"] = int(time.time() - boot)
+    info["cpu_physical"] = psutil.cpu_count(False)
+    info["cpu_logical"] = psutil.cpu_count(True)
+    freq = psutil.cpu_freq()
+    if freq:
+        info["cpu_mhz"] = {"min": freq.min, "max": freq.max, "current": freq.current}
+    info["cpu_percent"] = psutil.cpu_percent(None)
+    ct = psutil.cpu_times()
+    info["cpu_times"] = {"user": ct.user, "system": ct.system, "idle": ct.idle}
+    info["ctx_switches"] = psutil.cpu_stats().ctx_switches
+    vm, sm = psutil.virtual_memory(), psutil.swap_memory()
+    info["ram"] = {"total": vm.total, "percent": vm.percent}
+    info["swap"] = {"total": sm.total, "percent": sm.percent}
+    disks = []
+    for part in psutil.disk_partitions():
+        entry = {"device": part.device, "mount": part.mountpoint, "fs": part.fstype}
+        try:
+            du = psutil.disk_usage(part.mountpoint)
+            entry.update(total=du.total, used=du.used, free=du.free)
+        except OSError:
+            pass
+        disks.append(entry)
+    info["disks"] = disks
+    info["network"] = {nic.name: asdict(nic) for nic in interfaces()}
+    info["users"] = [u.name for u in psutil.users()]
+    return info
@@ -0,0 +1,151 @@
+# toolkit/table.py
+"""
+Columnar result table with typed sort keys.
+
+Rows are stored once as display tuples. Columns declared numeric also
+keep their raw value (bytes, epoch seconds, counts) in an ``array('d')``,
+so sorting never parses strings like "12.3 GB"; string columns sort and
+filter on a lower-cased copy built once per column. Sorting and filtering
+only reorder lists of row ids: ``order`` is every row in sort order and
+``view`` is the filtered subset of it, so typing more characters into a
+filter narrows the current view instead of rescanning every row. Rows
+added under a sort are sorted on their own and merged into ``order`` and
+``view``, so a flush costs little more than the new rows.
+"""
+from __future__ import annotations
+
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+def _merge(base: List[int], run: List[int], key: Callable[[int], object], reverse: bool) -> List[int]:
+    """``base`` and ``run``, both sorted by ``key``, as one sorted list; ties keep ``base`` first."""
+    out: List[int] = []
+    lo = 0
+    for i in run:
+        k = key(i)
+        a, b = lo, len(base)
+        while a < b:  # first item of base[lo:] that sorts after k
+            mid = (a + b) // 2
+            if (key(base[mid]) < k) if reverse else (key(base[mid]) > k):
+                b = mid
+            else:
+                a = mid + 1
+        out.extend(base[lo:a])
+        out.append(i)
+        lo = a
+    out.extend(base[lo:])
+    return out
+
+
+class ResultTable:
+    def __init__(self, columns: Sequence[str], numeric: Sequence[str] = ()):
+        self.columns = tuple(columns)
+        self.numeric = tuple(numeric)
+        self._slot = {self.columns.index(c): k for k, c in enumerate(self.numeric)}
+        self.sort_spec: Optional[Tuple[int, bool]] = None
+        self.filter_spec: Optional[Tuple[int, str]] = None
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop every row; the sort and filter stay in effect for new rows."""
+        self.rows: List[tuple] = []
+        self.keys = [array("d") for _ in self.numeric]
+        self._lower: Dict[int, List[str]] = {}
+        self.order: List[int] = []
+        self.view: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    # -------- columns
+
+    def _lower_col(self, c: int) -> List[str]:
+        col = self._lower.get(c)
+        if col is None:
+            col = self._lower[c] = [str(r[c]).lower() for r in self.rows]
+        return col
+
+    def _key_of(self, c: int):
+        slot = self._slot.get(c)
+        if slot is not None:
+            return self.keys[slot].__getitem__
+        return self._lower_col(c).__getitem__
+
+    # -------- rows
+
+    def extend(self, batch: Iterable[Tuple[tuple, Optional[Sequence[float]]]]) -> None:
+        """Add ``(row, numeric_keys)`` pairs; keys follow the ``numeric`` order."""
+        start = len(self.rows)
+        for row, keys in batch:
+            self.rows.append(row)
+            if keys is None:
+                keys = [self._guess_key(row[c]) for c in self._slot]
+            for arr, k in zip(self.keys, keys):
+                arr.append(k)
+        if start == len(self.rows):
+            return
+        for c, col in self._lower.items():
+            col.extend(str(r[c]).lower() for r in self.rows[start:])
+        new = range(start, len(self.rows))
+        if self.sort_spec is None:
+            self.order.extend(new)
+            self.view.extend(self._matching(new))
+            return
+        c, reverse = self.sort_spec
+        key = self._key_of(c)
+        run = sorted(new, key=key, reverse=reverse)
+        self.order = _merge(self.order, run, key, reverse)
+        self.view = _merge(self.view, self._matching(run), key, reverse)
+
+    @staticmethod
+    def _guess_key(value) -> float:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return 0.0
+
+    def remove(self, ids: Iterable[int]) -> None:
+        drop = set(ids)
+        keep = [i for i in range(len(self.rows)) if i not in drop]
+        rows = [self.rows[i] for i in keep]
+        keys = [array("d", (arr[i] for i in keep)) for arr in self.keys]
+        self.clear()
+        self.rows, self.keys = rows, keys
+        self.order = list(range(len(rows)))
+        self._sort_order()
+        self._refilter()
+
+    # -------- sort / filter
+
+    def _sort_order(self) -> None:
+        if self.sort_spec is not None:
+            c, reverse = self.sort_spec
+            self.order.sort(key=self._key_of(c), reverse=reverse)
+
+    def _matching(self, ids: Iterable[int]) -> List[int]:
+        if self.filter_spec is None:
+            return list(ids)
+        c, text = self.filter_spec
+        low = self._lower_col(c)
+        return [i for i in ids if text in low[i]]
+
+    def _refilter(self) -> None:
+        self.view = self._matching(self.order)
+
+    def sort(self, col: str, reverse: bool = False) -> None:
+        self.sort_spec = (self.columns.index(col), reverse)
+        self._sort_order()
+        self._refilter()
+
+    def set_filter(self, col: str, text: str) -> None:
+        c, text = self.columns.index(col), text.lower()
+        prev = self.filter_spec
+        self.filter_spec = (c, text) if text else None
+        if self.filter_spec is None:
+            self.view = list(self.order)
+        elif prev is not None and prev[0] == c and text.startswith(prev[1]):
+            # the new text is a refinement: only rows already shown can match
+            self.view = self._matching(self.view)
+        else:
+            self._refilter()
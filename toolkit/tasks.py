@@ -0,0 +1,251 @@
+# toolkit/tasks.py
+"""
+Background tasks with cooperative cancellation and progress reporting.
+
+A worker function runs as ``fn(*args, task=task)`` on a small fixed pool
+of threads, so starting several scans queues them instead of putting
+every one on the disk at once. The worker reports through ``task``:
+
+* ``task.status(msg)`` only stores the latest message; a UI polls it at
+  its own pace, so calling it thousands of times a second costs nothing.
+* ``task.progress.begin(...)``/``advance(...)`` count items and bytes
+  against an optional total, from which the fraction, throughput and ETA
+  are derived.
+* both of them raise ``Cancelled`` once ``task.cancel()`` was called, and
+  ``task.check()`` does the same for loops with nothing to report. The
+  exception unwinds the worker (closing files and generators on the way)
+  and the task ends in the CANCELLED state.
+
+Engines in this package take ``status_cb``/``progress`` arguments, so a
+task's methods can be passed straight through.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+QUEUED, RUNNING, DONE, CANCELLED, FAILED = "queued", "running", "done", "cancelled", "failed"
+DEFAULT_WORKERS = 2
+
+
+class Cancelled(Exception):
+    """Raised inside a worker whose task was cancelled."""
+
+
+class CancelToken:
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self) -> None:
+        if self._event.is_set():
+            raise Cancelled()
+
+    def wait(self, timeout: float) -> bool:
+        """Sleep up to ``timeout`` seconds; True if cancelled meanwhile."""
+        return self._event.wait(timeout)
+
+
+@dataclass
+class ProgressSnapshot:
+    phase: str
+    unit: str
+    items: int
+    total_items: int
+    bytes: int
+    total_bytes: int
+    elapsed: float
+
+    @property
+    def fraction(self) -> Optional[float]:
+        """Share done, by bytes if their total is known, else by items."""
+        if self.total_bytes:
+            return min(1.0, self.bytes / self.total_bytes)
+        if self.total_items:
+            return min(1.0, self.items / self.total_items)
+        return None
+
+    @property
+    def eta(self) -> Optional[float]:
+        frac = self.fraction
+        if not frac or self.elapsed < 1.0:
+            return None
+        return self.elapsed * (1 - frac) / frac
+
+    def describe(self) -> str:
+        secs = max(self.elapsed, 1e-3)
+        parts = [f"{self.items:,}" + (f"/{self.total_items:,}" if self.total_items else "") + f" {self.unit}"]
+        if self.bytes:
+            parts.append(f"{self.bytes / 1024**2 / secs:.1f} MB/s")
+        elif self.items:
+            parts.append(f"{self.items / secs:,.0f} {self.unit}/s")
+        eta = self.eta
+        if eta is not None:
+            m, s = divmod(int(eta), 60)
+            parts.append(f"ETA {m // 60}:{m % 60:02d}:{s:02d}" if m >= 60 else f"ETA {m}:{s:02d}")
+        return " · ".join(parts)
+
+
+class Progress:
+    """
+    Counters for the current phase of a task. Written by the worker, read
+    by the UI; plain attribute updates are atomic enough for display.
+    """
+
+    def __init__(self, token: Optional[CancelToken] = None):
+        self.token = token or CancelToken()
+        self.message = ""
+        self.begin()
+
+    def begin(self, phase: str = "", total_items: int = 0, total_bytes: int = 0, unit: str = "items") -> None:
+        """Start a new phase; totals of 0 mean unknown."""
+        self.phase, self.unit = phase, unit
+        self.items = self.bytes = 0
+        self.total_items, self.total_bytes = total_items, total_bytes
+        self.started = time.perf_counter()
+        if phase:
+            self.message = phase
+        self.token.check()
+
+    def advance(self, items: int = 1, nbytes: int = 0) -> None:
+        self.items += items
+        self.bytes += nbytes
+        self.token.check()
+
+    def update(self, items: Optional[int] = None, nbytes: Optional[int] = None) -> None:
+        """Set absolute counts, for engines that report running totals."""
+        if items is not None:
+            self.items = items
+        if nbytes is not None:
+            self.bytes = nbytes
+        self.token.check()
+
+    def status(self, msg: str) -> None:
+        self.message = msg
+        self.token.check()
+
+    def snapshot(self) -> ProgressSnapshot:
+        return ProgressSnapshot(
+            self.phase, self.unit, self.items, self.total_items,
+            self.bytes, self.total_bytes, time.perf_counter() - self.started,
+        )
+
+
+class Task:
+    def __init__(self, fn: Callable[..., Any], args: tuple = (), name: str = ""):
+        self.fn, self.args = fn, args
+        self.name = name or getattr(fn, "__name__", "task")
+        self.token = CancelToken()
+        self.progress = Progress(self.token)
+        self.state = QUEUED
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.started = self.ended = 0.0
+        self._finished = threading.Event()
+
+    # -------- worker side
+
+    def status(self, msg: str) -> None:
+        self.progress.status(msg)
+
+    def check(self) -> None:
+        self.token.check()
+
+    # -------- owner side
+
+    @property
+    def message(self) -> str:
+        return self.progress.message
+
+    @property
+    def finished(self) -> bool:
+        return self._finished.is_set()
+
+    @property
+    def elapsed(self) -> float:
+        if not self.started:
+            return 0.0
+        return (self.ended or time.perf_counter()) - self.started
+
+    def cancel(self) -> None:
+        self.token.cancel()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._finished.wait(timeout)
+
+    def run(self) -> None:
+        if self.token.cancelled:
+            self.state = CANCELLED
+            self._finished.set()
+            return
+        self.state = RUNNING
+        self.started = time.perf_counter()
+        try:
+            self.result = self.fn(*self.args, task=self)
+        except Cancelled:
+            self.state = CANCELLED
+        except Exception as exc:
+            self.error = exc
+            self.state = FAILED
+        else:
+            self.state = DONE
+        finally:
+            self.ended = time.perf_counter()
+            self._finished.set()
+
+
+class TaskExecutor:
+    """Runs tasks on at most ``max_workers`` daemon threads, first come first served."""
+
+    def __init__(self, max_workers: int = DEFAULT_WORKERS):
+        self.max_workers = max(1, max_workers)
+        self._queue: "queue.Queue[Task]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._tasks: List[Task] = []
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., Any], args: tuple = (), name: str = "") -> Task:
+        task = Task(fn, args, name)
+        with self._lock:
+            self._tasks = [t for t in self._tasks if not t.finished]
+            self._tasks.append(task)
+            if len(self._threads) < self.max_workers:
+                t = threading.Thread(target=self._work, name=f"task-{len(self._threads)}", daemon=True)
+                self._threads.append(t)
+                t.start()
+        self._queue.put(task)
+        return task
+
+    def _work(self) -> None:
+        while True:
+            self._queue.get().run()
+
+    def active(self) -> List[Task]:
+        with self._lock:
+            return [t for t in self._tasks if not t.finished]
+
+    def cancel_all(self) -> None:
+        for t in self.active():
+            t.cancel()
+
+
+_default: Optional[TaskExecutor] = None
+_default_lock = threading.Lock()
+
+
+def default_executor() -> TaskExecutor:
+    """Process-wide executor shared by the pages, sized for one disk."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = TaskExecutor()
+        return _default
@@ -0,0 +1,31 @@
+# toolkit/timing.py
+"""Named checkpoints since a start time, for startup and other latency reports."""
+from __future__ import annotations
+
+import time
+from typing import List, Optional, Tuple
+
+
+class Timeline:
+    def __init__(self, start: Optional[float] = None):
+        self.start = time.perf_counter() if start is None else start
+        self.marks: List[Tuple[str, float]] = []
+
+    def mark(self, label: str) -> float:
+        """Record ``label`` now; returns ms since the previous mark."""
+        now = time.perf_counter()
+        prev = self.marks[-1][1] if self.marks else self.start
+        self.marks.append((label, now))
+        return (now - prev) * 1000
+
+    @property
+    def total_ms(self) -> float:
+        return ((self.marks[-1][1] if self.marks else self.start) - self.start) * 1000
+
+    def report(self) -> str:
+        lines = []
+        prev = self.start
+        for label, t in self.marks:
+            lines.append(f"{(t - self.start) * 1000:8.1f} ms  (+{(t - prev) * 1000:7.1f})  {label}")
+            prev = t
+        return "\n".join(lines)